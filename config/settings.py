@@ -72,6 +72,7 @@ TEMPLATES = [
                 'django.contrib.auth.context_processors.auth',
                 'django.contrib.messages.context_processors.messages',
                 'tracker.context_processors.user_profile',
+                'tracker.context_processors.badge_counts',
             ],
         },
     },
@@ -103,6 +104,39 @@ if os.getenv("USE_SQLITE_FOR_TESTS") == "1" and "test" in sys.argv:
     }
 
 
+# Cache
+# Rendered list/board/follow-up fragments and badge counts are cached per
+# user and invalidated by a per-user stamp in the cache. The default
+# local-memory cache is per process, so a write in one worker would not
+# reach the others: outside DEBUG the fragment cache is only on when
+# REDIS_URL points at a shared Redis instance. TRACKER_FRAGMENT_CACHE=1/0
+# overrides this, e.g. for a single-process deployment.
+
+if os.getenv("REDIS_URL"):
+    CACHES = {
+        "default": {
+            "BACKEND": "django.core.cache.backends.redis.RedisCache",
+            "LOCATION": os.getenv("REDIS_URL"),
+        }
+    }
+
+TRACKER_FRAGMENT_CACHE = os.getenv(
+    "TRACKER_FRAGMENT_CACHE", "1" if DEBUG or os.getenv("REDIS_URL") else "0"
+) == "1"
+TRACKER_FRAGMENT_CACHE_TIMEOUT = int(os.getenv("TRACKER_FRAGMENT_CACHE_TIMEOUT", "600"))
+# Where run_export_jobs writes finished exports.
+TRACKER_EXPORT_ROOT = Path(os.getenv("TRACKER_EXPORT_ROOT", BASE_DIR / "exports"))
+# Finished exports are deleted by run_export_jobs after this many days.
+TRACKER_EXPORT_RETENTION_DAYS = int(os.getenv("TRACKER_EXPORT_RETENTION_DAYS", "7"))
+# A running export or restore that has not saved progress for this many
+# seconds is taken to have lost its worker and is marked failed.
+TRACKER_JOB_TIMEOUT = int(os.getenv("TRACKER_JOB_TIMEOUT", "3600"))
+# Account archives larger than this (about a thousand rows) are queued for
+# run_restore_jobs instead of being restored while the request waits.
+TRACKER_RESTORE_INLINE_MAX_BYTES = int(os.getenv("TRACKER_RESTORE_INLINE_MAX_BYTES", str(256 * 1024)))
+# Larger archives are refused outright.
+TRACKER_RESTORE_MAX_BYTES = int(os.getenv("TRACKER_RESTORE_MAX_BYTES", str(64 * 1024 * 1024)))
+
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
 
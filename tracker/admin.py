@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import JobLead, Application, FollowUp, UserProfile
+from .models import JobLead, Application, FeedSubscription, FollowUp, PipelineCounters, UserProfile
 
 
 @admin.register(JobLead)
@@ -27,3 +27,17 @@ class FollowUpAdmin(admin.ModelAdmin):
 class UserProfileAdmin(admin.ModelAdmin):
     list_display = ("user", "full_name", "location_city", "remote_preference", "email_reminders_enabled")
     search_fields = ("user__username", "full_name", "headline", "target_roles")
+
+
+@admin.register(PipelineCounters)
+class PipelineCountersAdmin(admin.ModelAdmin):
+    list_display = ("owner", "total", "due_today", "overdue", "computed_on", "updated_at")
+    search_fields = ("owner__username",)
+
+
+@admin.register(FeedSubscription)
+class FeedSubscriptionAdmin(admin.ModelAdmin):
+    list_display = ("url", "title", "owner", "is_active", "last_status", "last_polled_at")
+    list_filter = ("is_active", "last_status")
+    search_fields = ("url", "title", "owner__username")
+    readonly_fields = ("etag", "last_modified", "last_polled_at", "last_status", "last_error")
@@ -0,0 +1,382 @@
+"""Whole-account backup and restore.
+
+An archive is gzip-compressed NDJSON. The first line is a header naming the
+format and :data:`ARCHIVE_VERSION`; then come the profile, the leads, the
+applications and the follow-ups, each line one row keyed by its original id;
+the last line counts what was written, so a truncated archive is caught
+before anything is committed. Rows are read with ``iterator(chunk_size=...)``
+and written one line at a time, so memory stays flat however big the
+account is.
+
+Restoring streams the archive back through batched ``bulk_create``. New ids
+are recorded per batch so applications and follow-ups can be pointed at the
+rows they belonged to (only the id maps grow with the account). Timestamps
+are restored as written. Search vectors, near-duplicate flags and the
+similar-leads index are rebuilt for the new rows rather than copied, the
+same way ``ingest`` does for new leads.
+
+Large archives are restored by ``run_restore_jobs`` instead: the request
+only spools the upload to a file and records a :class:`RestoreJob`.
+"""
+
+import base64
+import datetime
+import gzip
+import io
+import json
+import uuid
+import zlib
+from pathlib import Path
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import DataError, IntegrityError
+from django.db.models import QuerySet
+from django.utils import timezone
+
+from .counters import pipeline_write
+from .exports import export_root, fail_stale_jobs, gzip_stream
+from .fragments import bulk_written
+from .models import Application, FollowUp, JobLead, LeadTermCount, RestoreJob, UserProfile
+from .near_duplicates import index_leads
+from .similar_leads import index_owner_leads
+
+ARCHIVE_FORMAT = "jobtracker-account"
+ARCHIVE_VERSION = 1
+BATCH_SIZE = 1000
+TIMESTAMP_FIELDS = ("created_at", "updated_at")
+# Largest archive queue_restore spools to disk (TRACKER_RESTORE_MAX_BYTES).
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+COPY_BLOCK_SIZE = 64 * 1024
+
+
+class ArchiveError(ValueError):
+    pass
+
+
+class ArchiveTooLarge(ArchiveError):
+    pass
+
+
+def _archived_fields(model, skip):
+    return [field for field in model._meta.concrete_fields if not field.primary_key and field.name not in skip]
+
+
+# Owner links are implied by the archive, derived columns are rebuilt on
+# restore, and the parent link of each row is written separately as ``parent``.
+RECORDS = {
+    "lead": (JobLead, _archived_fields(JobLead, {"owner", "search_vector", "near_duplicate_of", "near_duplicate_score"})),
+    "application": (Application, _archived_fields(Application, {"owner", "job", "search_vector"})),
+    "followup": (FollowUp, _archived_fields(FollowUp, {"application"})),
+}
+PROFILE_FIELDS = _archived_fields(UserProfile, {"user"})
+
+
+class _ArchiveEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder drops microseconds, which keyset ordering needs.
+        if isinstance(o, (datetime.datetime, datetime.time)):
+            return o.isoformat()
+        if isinstance(o, (bytes, memoryview)):
+            return base64.b64encode(bytes(o)).decode("ascii")
+        return super().default(o)
+
+
+def _fields_dict(fields, values):
+    return {field.name: value for field, value in zip(fields, values)}
+
+
+def archive_lines(user, chunk_size=BATCH_SIZE):
+    """Yield the archive for ``user`` as NDJSON text lines."""
+
+    encoder = _ArchiveEncoder(ensure_ascii=False)
+    yield encoder.encode(
+        {
+            "format": ARCHIVE_FORMAT,
+            "version": ARCHIVE_VERSION,
+            "exported_at": timezone.now(),
+            "username": user.get_username(),
+        }
+    ) + "\n"
+
+    profile = UserProfile.objects.filter(user=user).values_list(*[field.attname for field in PROFILE_FIELDS]).first()
+    if profile is not None:
+        yield encoder.encode({"type": "profile", "fields": _fields_dict(PROFILE_FIELDS, profile)}) + "\n"
+
+    parents = {
+        "lead": (JobLead.objects.filter(owner=user), None),
+        "application": (Application.objects.filter(owner=user), "job_id"),
+        "followup": (FollowUp.objects.filter(application__owner=user), "application_id"),
+    }
+    counts = {}
+    for kind, (queryset, parent) in parents.items():
+        fields = RECORDS[kind][1]
+        columns = ["pk", parent] if parent else ["pk"]
+        rows = queryset.order_by("pk").values_list(*columns, *[field.attname for field in fields])
+        counts[kind] = 0
+        for row in rows.iterator(chunk_size=chunk_size):
+            record = {"type": kind, "id": row[0]}
+            if parent:
+                record["parent"] = row[1]
+            record["fields"] = _fields_dict(fields, row[len(columns):])
+            counts[kind] += 1
+            yield encoder.encode(record) + "\n"
+    yield encoder.encode({"type": "end", "counts": counts}) + "\n"
+
+
+def stream_archive(user, chunk_size=BATCH_SIZE):
+    """Yield the compressed archive for ``user`` in blocks of about ``chunk_size`` lines."""
+
+    def blocks():
+        block = []
+        for line in archive_lines(user, chunk_size):
+            block.append(line)
+            if len(block) >= chunk_size:
+                yield "".join(block)
+                block = []
+        if block:
+            yield "".join(block)
+
+    return gzip_stream(blocks())
+
+
+def _archive_records(stream):
+    text = io.TextIOWrapper(gzip.GzipFile(fileobj=stream, mode="rb"), encoding="utf-8")
+    line_number = 0
+    try:
+        for line_number, line in enumerate(text, start=1):
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except json.JSONDecodeError as exc:
+                raise ArchiveError(f"Line {line_number}: invalid JSON: {exc.msg}.") from exc
+            if not isinstance(record, dict):
+                raise ArchiveError(f"Line {line_number}: expected a JSON object.")
+            yield line_number, record
+    except (OSError, EOFError, zlib.error, UnicodeDecodeError) as exc:
+        raise ArchiveError(f"Line {line_number + 1}: not a readable gzip archive ({exc}).") from exc
+
+
+def _check_header(records):
+    first = next(records, None)
+    if first is None:
+        raise ArchiveError("The archive is empty.")
+    _, header = first
+    if header.get("format") != ARCHIVE_FORMAT:
+        raise ArchiveError("Not an account archive.")
+    if header.get("version") != ARCHIVE_VERSION:
+        raise ArchiveError(f"Unsupported archive version {header.get('version')!r}; expected {ARCHIVE_VERSION}.")
+    return header
+
+
+def _field_values(fields, data, line_number):
+    values = {}
+    for field in fields:
+        if field.name in data:
+            try:
+                values[field.attname] = field.to_python(data[field.name])
+            except ValidationError as exc:
+                raise ArchiveError(f"Line {line_number}: {field.name}: {' '.join(exc.messages)}") from exc
+    return values
+
+
+def _check_choices(instance, line_number):
+    # to_python does not check choices, so an unknown status would be stored
+    # as is; validate just the fields that have them.
+    exclude = [field.name for field in instance._meta.fields if not field.choices]
+    try:
+        instance.clean_fields(exclude=exclude)
+    except ValidationError as exc:
+        name, errors = next(iter(exc.message_dict.items()))
+        raise ArchiveError(f"Line {line_number}: {name}: {' '.join(errors)}") from exc
+
+
+def clear_account(owner):
+    """Delete ``owner``'s leads, applications and follow-ups (and their indexes)."""
+
+    Application.objects.filter(owner=owner).only("pk", "owner_id").delete()
+    JobLead.objects.filter(owner=owner).only("pk", "owner_id").delete()
+    LeadTermCount.objects.filter(owner=owner).delete()
+
+
+class _AsWrittenQuerySet(QuerySet):
+    """``bulk_create`` that inserts field values as given.
+
+    A raw insert skips ``pre_save``, so ``auto_now``/``auto_now_add`` keep the
+    archived timestamps instead of stamping the current time (the same path
+    ``loaddata`` uses), without touching the shared field definitions.
+    """
+
+    def _insert(self, *args, **kwargs):
+        return super()._insert(*args, **{**kwargs, "raw": True})
+
+
+class _Restore:
+    def __init__(self, owner, batch_size):
+        self.owner = owner
+        self.batch_size = batch_size
+        self.ids = {kind: {} for kind in RECORDS}
+        self.batch = []
+        self.kind = None
+        self.counts = {kind: 0 for kind in RECORDS}
+
+    def add(self, line_number, kind, record):
+        if kind != self.kind:
+            self.flush()
+            if self.kind is not None and list(RECORDS).index(kind) < list(RECORDS).index(self.kind):
+                raise ArchiveError(f"Line {line_number}: {kind} rows must come before {self.kind} rows.")
+            self.kind = kind
+        model, fields = RECORDS[kind]
+        instance = model(**_field_values(fields, record.get("fields") or {}, line_number))
+        _check_choices(instance, line_number)
+        try:
+            if kind == "lead":
+                instance.owner = self.owner
+            elif kind == "application":
+                instance.owner = self.owner
+                instance.job_id = self.ids["lead"][record.get("parent")]
+            else:
+                instance.application_id = self.ids["application"][record.get("parent")]
+        except (KeyError, TypeError) as exc:
+            raise ArchiveError(f"Line {line_number}: {kind} {record.get('id')} refers to a missing row.") from exc
+        self.batch.append((record.get("id"), instance))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        model = RECORDS[self.kind][0]
+        instances = [instance for _, instance in self.batch]
+        now = timezone.now()
+        for instance in instances:
+            for name in TIMESTAMP_FIELDS:
+                if hasattr(instance, name) and getattr(instance, name) is None:
+                    setattr(instance, name, now)
+        _AsWrittenQuerySet(model).bulk_create(instances)
+        for (old_id, _), instance in zip(self.batch, instances):
+            self.ids[self.kind][old_id] = instance.pk
+        if self.kind == "lead":
+            index_leads(instances, new=True, touch=False)
+        self.counts[self.kind] += len(instances)
+        self.batch = []
+
+
+def restore_archive(stream, owner, replace=False, batch_size=BATCH_SIZE):
+    """Restore an archive from a binary ``stream`` into ``owner``'s account.
+
+    Everything happens in one transaction: an invalid or truncated archive
+    leaves the account untouched. An account that already has leads or
+    applications is only overwritten with ``replace``. Returns the number
+    of rows created per kind.
+    """
+
+    try:
+        counts = _restore(stream, owner, replace, batch_size)
+    except (IntegrityError, DataError) as exc:
+        # Rows that parse but break a constraint, e.g. two applications for
+        # one lead, or a value too long for its column.
+        reason = str(exc).splitlines()[0] if str(exc) else exc.__class__.__name__
+        raise ArchiveError(f"The archive does not fit the database: {reason}") from exc
+    bulk_written(owner.pk)
+    return counts
+
+
+def _restore(stream, owner, replace, batch_size):
+    records = _archive_records(stream)
+    _check_header(records)
+    restore = _Restore(owner, batch_size)
+    with pipeline_write(owner.pk):
+        if JobLead.objects.filter(owner=owner).exists() or Application.objects.filter(owner=owner).exists():
+            if not replace:
+                raise ArchiveError("This account already has leads or applications; restore with replace to overwrite them.")
+            clear_account(owner)
+
+        expected = None
+        for line_number, record in records:
+            kind = record.get("type")
+            if kind == "end":
+                expected = record.get("counts") or {}
+                break
+            if kind == "profile":
+                values = _field_values(PROFILE_FIELDS, record.get("fields") or {}, line_number)
+                _check_choices(UserProfile(**values), line_number)
+                UserProfile.objects.update_or_create(user=owner, defaults=values)
+            elif kind in RECORDS:
+                restore.add(line_number, kind, record)
+            else:
+                raise ArchiveError(f"Line {line_number}: unknown row type {kind!r}.")
+        restore.flush()
+        # One pass over the restored leads is far cheaper than updating the
+        # term frequencies batch by batch.
+        index_owner_leads(owner.pk, JobLead.objects.filter(owner=owner))
+
+        if expected is None:
+            raise ArchiveError("The archive is truncated: it has no end marker.")
+        if any(expected.get(kind, 0) != count for kind, count in restore.counts.items()):
+            raise ArchiveError("The archive is truncated: row counts do not match its end marker.")
+    return restore.counts
+
+
+def restore_max_bytes():
+    return getattr(settings, "TRACKER_RESTORE_MAX_BYTES", DEFAULT_MAX_BYTES)
+
+
+def queue_restore(stream, owner, replace=False):
+    """Spool the archive in ``stream`` to disk and queue a :class:`RestoreJob` for it.
+
+    Raises :class:`ArchiveTooLarge` (and keeps nothing) once more than
+    ``TRACKER_RESTORE_MAX_BYTES`` have been read.
+    """
+
+    limit = restore_max_bytes()
+    directory = export_root() / str(owner.pk)
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"restore-{uuid.uuid4().hex}.ndjson.gz"
+    try:
+        with open(path, "wb") as handle:
+            while block := stream.read(COPY_BLOCK_SIZE):
+                handle.write(block)
+                if handle.tell() > limit:
+                    raise ArchiveTooLarge(f"The archive is larger than {limit} bytes.")
+            size = handle.tell()
+    except BaseException:
+        path.unlink(missing_ok=True)
+        raise
+    return RestoreJob.objects.create(owner=owner, replace=replace, file_path=str(path), size_bytes=size)
+
+
+def run_restore_job(job):
+    """Restore ``job``'s spooled archive and remove the file.
+
+    Failures are recorded on the job rather than raised; like an inline
+    restore, a failed one leaves the account untouched.
+    """
+
+    path = Path(job.file_path)
+    try:
+        with open(path, "rb") as handle:
+            job.restored = restore_archive(handle, job.owner, replace=job.replace)
+    except Exception as exc:
+        job.status = RestoreJob.Status.FAILED
+        job.error = str(exc) or exc.__class__.__name__
+    else:
+        job.status = RestoreJob.Status.DONE
+    path.unlink(missing_ok=True)
+    job.file_path = ""
+    job.finished_at = timezone.now()
+    job.save(update_fields=["status", "error", "restored", "file_path", "finished_at", "updated_at"])
+    return job
+
+
+def fail_stale_restore_jobs(timeout=None):
+    """Fail restores whose worker died (see ``fail_stale_jobs``) and remove their archives."""
+
+    jobs = fail_stale_jobs(RestoreJob, timeout)
+    for job in jobs:
+        if job.file_path:
+            Path(job.file_path).unlink(missing_ok=True)
+    RestoreJob.objects.filter(pk__in=[job.pk for job in jobs], status=RestoreJob.Status.FAILED).update(file_path="")
+    return jobs
@@ -0,0 +1,14 @@
+"""Splitting large id and key sets for ``IN (...)`` lookups."""
+
+from itertools import islice
+
+# Keeps each IN (...) list well below SQLite's bound-parameter limit.
+LOOKUP_CHUNK = 2000
+
+
+def chunked(values, size=LOOKUP_CHUNK):
+    """Yield lists of at most ``size`` items from ``values``."""
+
+    iterator = iter(values)
+    while chunk := list(islice(iterator, size)):
+        yield chunk
@@ -0,0 +1,48 @@
+"""Single-pass kanban board assembly.
+
+The board used to issue one query per status column, each repeating the
+search filter. Here the filtered applications are fetched once, ranked per
+status with a window function so oversized columns are capped in SQL, and
+bucketed into columns in Python.
+"""
+
+from django.db.models import Count, F, Window
+from django.db.models.functions import RowNumber
+
+from .models import Application
+from .pagination import KeysetOrdering
+
+BOARD_ORDERING = KeysetOrdering(Application, [("updated_at", True), ("id", True)])
+
+
+def build_status_columns(queryset, per_column=None):
+    """Return one column dict per ``Application.Status`` choice.
+
+    Each column carries at most ``per_column`` applications, the column's
+    full ``total`` and a ``next_cursor`` for loading the rest of it.
+    """
+
+    ordering = BOARD_ORDERING.order_by()
+    queryset = queryset.annotate(
+        column_total=Window(Count("pk"), partition_by=[F("status")]),
+    )
+    if per_column is not None:
+        queryset = queryset.annotate(
+            column_rank=Window(RowNumber(), partition_by=[F("status")], order_by=ordering),
+        ).filter(column_rank__lte=per_column)
+
+    columns = {
+        code: {"code": code, "label": label, "applications": [], "total": 0, "next_cursor": ""}
+        for code, label in Application.Status.choices
+    }
+    for application in queryset.order_by("status", *ordering):
+        column = columns.get(application.status)
+        if column is None:
+            continue
+        column["applications"].append(application)
+        column["total"] = application.column_total
+
+    for column in columns.values():
+        if column["total"] > len(column["applications"]):
+            column["next_cursor"] = BOARD_ORDERING.encode(column["applications"][-1])
+    return list(columns.values())
@@ -0,0 +1,112 @@
+"""Conditional GET (ETag / Last-Modified) for the list pages.
+
+A page is fresh as long as none of the rows it could show changed. That is
+summarised by one small query returning ``MAX(updated_at)`` and ``COUNT(*)``
+for the user's applications, leads and follow-ups (plus their profile, which
+the header renders). Counts catch deletes, which leave the maxima untouched.
+The ETag hashes those figures with the request's filters, so revalidating an
+unchanged page costs that query and an empty 304.
+
+``Last-Modified`` is only the newest ``updated_at`` and cannot see deletes;
+clients that were given an ETag send ``If-None-Match``, which takes
+precedence over ``If-Modified-Since``.
+"""
+
+import hashlib
+
+from django.contrib import messages
+from django.contrib.auth import get_user_model
+from django.db.models import Count, IntegerField, Max, OuterRef, Subquery, Value
+from django.utils import timezone
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+
+from .models import Application, FollowUp, JobLead, UserProfile
+
+
+def _aggregate(queryset, function):
+    grouped = queryset.order_by().annotate(_group=Value(1, output_field=IntegerField())).values("_group")
+    return Subquery(grouped.annotate(_result=function).values("_result")[:1])
+
+
+def collection_state(user):
+    """Summarise every row the list pages can show for ``user``, in one query.
+
+    Returns ``last_modified`` (newest ``updated_at`` or ``None``), ``counts``
+    (applications, leads, follow-ups) and the per-table ``stamps`` as text.
+    """
+
+    applications = Application.objects.all()
+    leads = JobLead.objects.all()
+    followups = FollowUp.objects.all()
+    if not user.is_superuser:
+        applications = applications.filter(owner=OuterRef("pk"))
+        leads = leads.filter(owner=OuterRef("pk"))
+        followups = followups.filter(application__owner=OuterRef("pk"))
+    profiles = UserProfile.objects.filter(user=OuterRef("pk"))
+
+    sources = {"app": applications, "lead": leads, "followup": followups}
+    annotations = {"profile_max": Subquery(profiles.values("updated_at")[:1])}
+    for name, queryset in sources.items():
+        annotations[f"{name}_max"] = _aggregate(queryset, Max("updated_at"))
+        annotations[f"{name}_count"] = _aggregate(queryset, Count("pk"))
+
+    row = get_user_model().objects.filter(pk=user.pk).annotate(**annotations).values(*annotations).first() or {}
+    stamps = [row.get(f"{name}_max") for name in (*sources, "profile")]
+    stamps = [stamp for stamp in stamps if stamp is not None]
+    return {
+        "last_modified": max(stamps) if stamps else None,
+        "counts": tuple(row.get(f"{name}_count") or 0 for name in sources),
+        "stamps": tuple(stamp.isoformat() for stamp in stamps),
+    }
+
+
+class ConditionalListMixin:
+    """Answer unchanged list GETs with 304 before any rendering happens."""
+
+    conditional_get = True
+
+    def get_conditional_state(self):
+        if not hasattr(self, "_conditional_state"):
+            self._conditional_state = collection_state(self.request.user)
+        return self._conditional_state
+
+    def get_etag(self):
+        state = self.get_conditional_state()
+        request = self.request
+        parts = [
+            str(request.user.pk),
+            request.get_full_path(),
+            request.headers.get("accept", ""),
+            # Due/overdue highlighting changes at midnight without any write.
+            timezone.localdate().isoformat(),
+            *state["stamps"],
+            *map(str, state["counts"]),
+        ]
+        return quote_etag(hashlib.sha1("|".join(parts).encode("utf-8")).hexdigest())
+
+    def get_last_modified(self):
+        last_modified = self.get_conditional_state()["last_modified"]
+        return int(last_modified.timestamp()) if last_modified else None
+
+    def dispatch(self, request, *args, **kwargs):
+        # A pending flash message has to be rendered, so always send a body.
+        if (
+            not self.conditional_get
+            or request.method not in ("GET", "HEAD")
+            or len(messages.get_messages(request))
+        ):
+            return super().dispatch(request, *args, **kwargs)
+
+        etag = self.get_etag()
+        last_modified = self.get_last_modified()
+        response = get_conditional_response(request, etag=etag, last_modified=last_modified)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+        if response.status_code in (200, 304):
+            response.headers.setdefault("ETag", etag)
+            if last_modified is not None:
+                response.headers.setdefault("Last-Modified", http_date(last_modified))
+            patch_cache_control(response, private=True, no_cache=True)
+            patch_vary_headers(response, ("Cookie", "Accept"))
+        return response
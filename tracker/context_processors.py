@@ -1,3 +1,6 @@
+from django.utils.functional import SimpleLazyObject
+
+from .counters import cached_counters_for_user
 from .models import UserProfile
 
 
@@ -14,3 +17,11 @@ def user_profile(request):
             username = request.user.get_username() or ""
             initials = username[:2].upper()
     return {"user_profile": profile, "user_initials": initials}
+
+
+def badge_counts(request):
+    """Sidebar badges, only queried if a template actually reads them."""
+
+    if not request.user.is_authenticated:
+        return {}
+    return {"badge_counts": SimpleLazyObject(lambda: cached_counters_for_user(request.user))}
@@ -0,0 +1,160 @@
+"""Dashboard badge counters.
+
+Every badge the app shows (due today, overdue, per-status totals, follow-up
+section sizes) is derived from one aggregate query using conditional
+``Count(filter=...)`` instead of one ``COUNT(*)`` per badge. The list view,
+the sidebar and the counters API all read from here.
+
+For regular users the result is stored in a ``PipelineCounters`` row that
+the write paths refresh inside their transaction (see
+:func:`pipeline_write`), so rendering a badge is a primary-key lookup. The
+``reconcile_pipeline_counters`` command repairs rows nightly after writes
+that bypass the views (admin, shell, imports).
+"""
+
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, Q
+from django.utils import timezone
+
+from .followups import HORIZON_DAYS, SECTIONS
+from .fragments import fragment_cache_key, fragment_cache_timeout
+from .models import Application, PipelineCounters
+
+TERMINAL_STATUSES = (Application.Status.ACCEPTED, Application.Status.REJECTED)
+
+# Application fields whose changes can move a badge count.
+PIPELINE_FIELDS = frozenset({"status", "follow_up_on"})
+
+
+def owned_applications(user):
+    """Applications visible to ``user``; superusers see everyone's."""
+
+    queryset = Application.objects.all()
+    if user.is_superuser:
+        return queryset
+    return queryset.filter(owner=user)
+
+
+def _section_filters(prefix, field, today, week_end):
+    return {
+        "today": Q(**{f"{prefix}{field}": today}),
+        "overdue": Q(**{f"{prefix}{field}__lt": today}),
+        "week": Q(**{f"{prefix}{field}__gt": today, f"{prefix}{field}__lte": week_end}),
+    }
+
+
+def application_counters(applications, today=None):
+    """Return every badge count for ``applications`` in a single query.
+
+    The result looks like::
+
+        {
+            "total": 12,
+            "by_status": {"APPLIED": 5, ...},
+            "due_today": 1,
+            "overdue": 2,
+            "followups": {"today": 2, "overdue": 3, "week": 1},
+        }
+
+    ``due_today``/``overdue`` count open applications by ``follow_up_on``;
+    ``followups`` counts the follow-up inbox sections, i.e. open applications
+    plus incomplete ``FollowUp`` rows whatever their application's status,
+    exactly as the inbox lists them.
+    """
+
+    today = today or timezone.localdate()
+    week_end = today + timedelta(days=HORIZON_DAYS)
+    is_open = ~Q(status__in=TERMINAL_STATUSES)
+
+    aggregates = {"total": Count("pk", distinct=True)}
+    for code in Application.Status.values:
+        aggregates[f"status_{code}"] = Count("pk", distinct=True, filter=Q(status=code))
+
+    application_sections = _section_filters("", "follow_up_on", today, week_end)
+    followup_sections = _section_filters("followups__", "due_on", today, week_end)
+    open_followup = Q(followups__is_completed=False)
+    for section in SECTIONS:
+        aggregates[f"app_{section}"] = Count(
+            "pk", distinct=True, filter=is_open & application_sections[section]
+        )
+        aggregates[f"followup_{section}"] = Count(
+            "followups", distinct=True, filter=open_followup & followup_sections[section]
+        )
+
+    row = applications.order_by().aggregate(**aggregates)
+    return {
+        "total": row["total"],
+        "by_status": {code: row[f"status_{code}"] for code in Application.Status.values},
+        "due_today": row["app_today"],
+        "overdue": row["app_overdue"],
+        "followups": {
+            section: row[f"app_{section}"] + row[f"followup_{section}"] for section in SECTIONS
+        },
+    }
+
+
+def refresh_pipeline_counters(owner_id, today=None, counters=None):
+    """Recompute and store ``owner_id``'s counters; returns the row."""
+
+    today = today or timezone.localdate()
+    if counters is None:
+        counters, _ = PipelineCounters.objects.get_or_create(owner_id=owner_id)
+    counters.apply(
+        application_counters(Application.objects.filter(owner_id=owner_id), today=today),
+        computed_on=today,
+    )
+    counters.save()
+    return counters
+
+
+@contextmanager
+def pipeline_write(owner_id, refresh=True):
+    """Run a write to ``owner_id``'s applications and refresh their counters.
+
+    The counters row is locked before the write so concurrent writers for the
+    same user serialize, and is recomputed in the same transaction, so it
+    never reflects a write that was rolled back. ``refresh=False`` keeps the
+    transaction but skips the work for writes that cannot change a badge.
+    """
+
+    with transaction.atomic():
+        counters = None
+        if refresh and owner_id is not None:
+            counters, _ = PipelineCounters.objects.select_for_update().get_or_create(owner_id=owner_id)
+        yield
+        if counters is not None:
+            refresh_pipeline_counters(owner_id, counters=counters)
+
+
+def counters_for_user(user, today=None):
+    """Badge counts for ``user``, read from their ``PipelineCounters`` row."""
+
+    today = today or timezone.localdate()
+    if user.is_superuser:
+        return application_counters(owned_applications(user), today=today)
+    counters = PipelineCounters.objects.filter(pk=user.pk).first()
+    if counters is None or counters.computed_on != today:
+        # Take the lock pipeline_write holds, so a writer's fresh row is never
+        # overwritten with counts read before it committed, and look again:
+        # the writer (or another reader) may have refreshed it meanwhile.
+        with transaction.atomic():
+            counters, _ = PipelineCounters.objects.select_for_update().get_or_create(owner_id=user.pk)
+            if counters.computed_on != today:
+                refresh_pipeline_counters(user.pk, today=today, counters=counters)
+    return counters.as_counters()
+
+
+def cached_counters_for_user(user):
+    """:func:`counters_for_user`, cached until the user's data version changes."""
+
+    if user.is_superuser:
+        return counters_for_user(user)
+    today = timezone.localdate()
+    key = fragment_cache_key(user.pk, "badge-counts", today=today)
+    if key is None:
+        return counters_for_user(user, today=today)
+    return cache.get_or_set(key, lambda: counters_for_user(user, today=today), fragment_cache_timeout())
@@ -0,0 +1,351 @@
+"""Job-alert email ingestion from mbox files and Maildir directories.
+
+Messages are read one at a time: an mbox is split on its ``From `` lines as
+the file streams past, and a Maildir message is opened only after its
+headers show it has not been processed yet. Each message's ``Message-ID``
+(or a hash of its headers when missing) goes into a per-user ledger in the
+same transaction as the leads it produced, so re-running over a large
+mailbox only parses new mail.
+
+Turning a message into leads is the job of extractors. The built-in ones
+handle LinkedIn, Indeed and generic applicant-tracking links; add more by
+subclassing :class:`AlertExtractor` and listing the dotted path in the
+``TRACKER_EMAIL_EXTRACTORS`` setting. The first extractor that matches a
+message wins.
+"""
+
+import hashlib
+import os
+import re
+from email import policy
+from email.parser import BytesParser
+from email.utils import parseaddr
+from html.parser import HTMLParser
+
+from django.conf import settings
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from .fingerprints import strip_tracking
+from .ingest import ingest_leads
+from .models import JobLead, ProcessedEmail
+
+DEFAULT_BATCH_SIZE = 200
+TITLE_SEPARATORS = (" at ", " @ ", " - ", " – ", " · ", " | ")
+
+
+class _AnchorCollector(HTMLParser):
+    """Collect ``(href, text, following_text)`` for every link in an HTML body."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.links = []
+        self._href = None
+        self._text = []
+        self._awaiting_context = None
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "a":
+            self._href = dict(attrs).get("href")
+            self._text = []
+
+    def handle_endtag(self, tag):
+        if tag == "a" and self._href is not None:
+            link = [self._href, " ".join("".join(self._text).split()), ""]
+            self.links.append(link)
+            self._awaiting_context = link
+            self._href = None
+
+    def handle_data(self, data):
+        if self._href is not None:
+            self._text.append(data)
+            return
+        text = " ".join(data.split())
+        if text and self._awaiting_context is not None:
+            self._awaiting_context[2] = text
+            self._awaiting_context = None
+
+
+PLAIN_LINK = re.compile(r"https?://\S+")
+
+
+def _plain_links(text):
+    """Links in a text body, titled by the nearest non-empty line above them."""
+
+    links = []
+    previous = ""
+    for line in text.splitlines():
+        stripped = line.strip()
+        match = PLAIN_LINK.search(stripped)
+        if match:
+            links.append([match.group(0).rstrip(").,>"), previous, ""])
+        elif stripped:
+            if links and not links[-1][2] and links[-1][1] != previous:
+                links[-1][2] = stripped
+            previous = stripped
+    return links
+
+
+def split_role_company(title, context=""):
+    """Best-effort ``(role, company, location)`` from a link title and the text after it."""
+
+    for separator in TITLE_SEPARATORS:
+        if separator in title:
+            role, rest = title.split(separator, 1)
+            company, _, location = rest.partition(separator)
+            return role.strip(), company.strip(), location.strip()
+    company, location = context, ""
+    for separator in (" · ", " - ", " | "):
+        if separator in context:
+            company, _, location = context.partition(separator)
+            break
+    return title.strip(), company.strip(), location.strip()
+
+
+def _body_text(part):
+    """Decoded text of ``part``; an unknown charset is read as UTF-8 with replacement characters."""
+
+    try:
+        return part.get_content()
+    except (LookupError, UnicodeDecodeError):
+        return (part.get_payload(decode=True) or b"").decode("utf-8", errors="replace")
+
+
+class AlertExtractor:
+    """Turn one alert email into lead records.
+
+    ``sender_domains`` limits which senders the extractor claims (empty
+    matches everyone) and ``link_pattern`` selects the job links in the body.
+    Override :meth:`canonical_url` to drop per-recipient tracking from links.
+    """
+
+    sender_domains = ()
+    link_pattern = None
+
+    def matches(self, message):
+        if not self.sender_domains:
+            return True
+        address = parseaddr(str(message.get("From", "")))[1].lower()
+        domain = address.rpartition("@")[2]
+        return any(domain == item or domain.endswith("." + item) for item in self.sender_domains)
+
+    def canonical_url(self, url, match):
+        return strip_tracking(url)
+
+    def _links(self, message):
+        body = message.get_body(preferencelist=("html", "plain"))
+        if body is None:
+            return []
+        content = _body_text(body)
+        if body.get_content_type() == "text/html":
+            collector = _AnchorCollector()
+            collector.feed(content)
+            return collector.links
+        return _plain_links(content)
+
+    def extract(self, message):
+        sender_name = parseaddr(str(message.get("From", "")))[0]
+        subject = str(message.get("Subject", "")).strip()
+        seen = set()
+        for href, text, context in self._links(message):
+            match = self.link_pattern.search(href or "") if self.link_pattern else None
+            if match is None or not text:
+                continue
+            job_url = self.canonical_url(href, match)
+            if job_url in seen:
+                continue
+            seen.add(job_url)
+            role, company, location = split_role_company(text, context)
+            yield {
+                "title": role[:200],
+                "company": (company or sender_name)[:200],
+                "location": location[:200],
+                "job_url": job_url,
+                "notes": f"From email alert: {subject}" if subject else "",
+            }
+
+
+class LinkedInExtractor(AlertExtractor):
+    sender_domains = ("linkedin.com",)
+    link_pattern = re.compile(r"linkedin\.com/(?:comm/)?jobs/view/(\d+)")
+
+    def canonical_url(self, url, match):
+        return f"https://www.linkedin.com/jobs/view/{match.group(1)}/"
+
+
+class IndeedExtractor(AlertExtractor):
+    sender_domains = ("indeed.com",)
+    link_pattern = re.compile(r"indeed\.[a-z.]+/(?:viewjob|rc/clk|pagead/clk)\?\S*?\bjk=([0-9a-f]+)")
+
+    def canonical_url(self, url, match):
+        return f"https://www.indeed.com/viewjob?jk={match.group(1)}"
+
+
+class GenericExtractor(AlertExtractor):
+    link_pattern = re.compile(
+        r"(greenhouse\.io|lever\.co|ashbyhq\.com|workable\.com|smartrecruiters\.com|"
+        r"/jobs?/|/careers?/|/positions?/|/vacanc)",
+        re.IGNORECASE,
+    )
+
+
+DEFAULT_EXTRACTORS = (
+    "tracker.email_alerts.LinkedInExtractor",
+    "tracker.email_alerts.IndeedExtractor",
+    "tracker.email_alerts.GenericExtractor",
+)
+
+
+def load_extractors():
+    paths = getattr(settings, "TRACKER_EMAIL_EXTRACTORS", DEFAULT_EXTRACTORS)
+    return [import_string(path)() for path in paths]
+
+
+def _read_headers(stream):
+    lines = []
+    for line in stream:
+        if line in (b"\n", b"\r\n"):
+            break
+        lines.append(line)
+    return b"".join(lines)
+
+
+def _iter_mbox(path):
+    """Yield ``(header_bytes, load_message)`` per message without indexing the file."""
+
+    with open(path, "rb") as stream:
+        lines = []
+        started = False
+        for line in stream:
+            if line.startswith(b"From "):
+                if started and lines:
+                    raw = b"".join(lines)
+                    yield _split_header(raw), (lambda raw=raw: raw)
+                lines = []
+                started = True
+                continue
+            if started:
+                # mboxrd: one level of ">From " quoting is removed.
+                lines.append(line[1:] if re.match(rb"^>+From ", line) else line)
+        if started and lines:
+            raw = b"".join(lines)
+            yield _split_header(raw), (lambda raw=raw: raw)
+
+
+def _split_header(raw):
+    match = re.search(rb"\r?\n\r?\n", raw)
+    return raw[: match.start()] if match else raw
+
+
+def _read_file(path):
+    with open(path, "rb") as stream:
+        return stream.read()
+
+
+def _iter_maildir(path):
+    """Yield ``(header_bytes, load_message)``; bodies are read only on demand."""
+
+    for folder in ("new", "cur"):
+        directory = os.path.join(path, folder)
+        if not os.path.isdir(directory):
+            continue
+        for entry in sorted(os.scandir(directory), key=lambda item: item.name):
+            if not entry.is_file() or entry.name.startswith("."):
+                continue
+            with open(entry.path, "rb") as stream:
+                headers = _read_headers(stream)
+            yield headers, (lambda path=entry.path: _read_file(path))
+
+
+def iter_mailbox(path):
+    if os.path.isdir(path):
+        return _iter_maildir(path)
+    return _iter_mbox(path)
+
+
+_header_parser = BytesParser(policy=policy.default)
+
+
+def message_key(headers):
+    """Ledger key: a hash of the Message-ID, or of identifying headers without one."""
+
+    parsed = _header_parser.parsebytes(headers, headersonly=True)
+    message_id = str(parsed.get("Message-ID", "")).strip()
+    if not message_id:
+        message_id = "|".join(str(parsed.get(name, "")) for name in ("Date", "From", "To", "Subject"))
+    return hashlib.sha256(message_id.encode("utf-8", "replace")).hexdigest()
+
+
+class AlertIngestSummary:
+    def __init__(self):
+        self.messages = 0
+        self.skipped = 0
+        self.processed = 0
+        self.unmatched = 0
+        self.unreadable = 0
+        self.created = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors = []
+
+
+def _flush(pending, owner, summary):
+    if not pending:
+        return
+    records = []
+    for key, message_records in pending:
+        records.extend((f"{key[:12]}#{index}", record) for index, record in enumerate(message_records, 1))
+    with transaction.atomic():
+        result = ingest_leads(records, owner, default_source=JobLead.Source.EMAIL, batch_size=len(records) or 1)
+        ProcessedEmail.objects.bulk_create(
+            [ProcessedEmail(owner=owner, message_hash=key) for key, _ in pending],
+            ignore_conflicts=True,
+        )
+    summary.processed += len(pending)
+    summary.created += result.created
+    summary.duplicates += result.duplicates
+    summary.rejected += result.failed
+    summary.errors.extend(result.errors)
+    pending.clear()
+
+
+def _process_chunk(chunk, owner, extractors, summary):
+    keys = [key for key, _ in chunk]
+    done = set(
+        ProcessedEmail.objects.filter(owner=owner, message_hash__in=keys).values_list("message_hash", flat=True)
+    )
+    pending = []
+    for key, load in chunk:
+        if key in done:
+            summary.skipped += 1
+            continue
+        done.add(key)
+        try:
+            message = _header_parser.parsebytes(load())
+            extractor = next((item for item in extractors if item.matches(message)), None)
+            records = list(extractor.extract(message)) if extractor else []
+        except (LookupError, UnicodeError, ValueError):
+            # Skipped without a ledger entry, so a later run retries it.
+            summary.skipped += 1
+            summary.unreadable += 1
+            continue
+        if not records:
+            summary.unmatched += 1
+        pending.append((key, records))
+    _flush(pending, owner, summary)
+
+
+def ingest_mailbox(path, owner, batch_size=DEFAULT_BATCH_SIZE, extractors=None):
+    """Create leads for ``owner`` from every unprocessed alert in ``path``."""
+
+    extractors = extractors if extractors is not None else load_extractors()
+    summary = AlertIngestSummary()
+    chunk = []
+    for headers, load in iter_mailbox(path):
+        summary.messages += 1
+        chunk.append((message_key(headers), load))
+        if len(chunk) >= batch_size:
+            _process_chunk(chunk, owner, extractors, summary)
+            chunk = []
+    _process_chunk(chunk, owner, extractors, summary)
+    return summary
@@ -0,0 +1,353 @@
+"""Streaming application exports.
+
+Rows are read with ``QuerySet.iterator(chunk_size=...)`` over a narrow
+``values_list`` projection (a server-side cursor on Postgres), formatted
+and handed to a ``StreamingHttpResponse`` one chunk at a time. Only one
+chunk of rows is ever in memory, the first bytes go out as soon as the
+first chunk is read, and columns that were not asked for are never loaded.
+
+Callers pass an already filtered and ordered queryset, so an export shows
+exactly what the list view shows. Output is CSV (choice labels, blank for
+empty) or NDJSON (raw values, ``null`` for empty), optionally gzipped as it
+streams.
+
+Large exports go through :class:`ExportJob` instead: the request only
+records the filters, ``run_export_jobs`` streams the same output into a
+file under ``TRACKER_EXPORT_ROOT`` while recording progress, and the
+finished file is served with byte-range support so downloads can resume.
+Files are kept for ``TRACKER_EXPORT_RETENTION_DAYS``.
+"""
+
+import csv
+import re
+import zlib
+from datetime import timedelta
+from pathlib import Path
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, IntegerField, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+from django.utils import timezone
+
+from .models import Application, ExportJob, FollowUp, JobLead
+
+CHUNK_SIZE = 2000
+# Block size used when serving a finished export file.
+FILE_BLOCK_SIZE = 64 * 1024
+# A RUNNING job that has not saved progress for this long lost its worker.
+DEFAULT_JOB_TIMEOUT = timedelta(hours=1)
+DEFAULT_RETENTION = timedelta(days=7)
+STALE_JOB_ERROR = "The worker running this job stopped before it finished; start it again."
+EXPIRED_ERROR = "The export file is no longer available; start a new export."
+FORMATS = ("csv", "ndjson")
+CONTENT_TYPES = {"csv": "text/csv", "ndjson": "application/x-ndjson"}
+
+# key -> (CSV header, field path or annotation name).
+COLUMNS = {
+    "company": ("Company", "job__company"),
+    "title": ("Title", "job__title"),
+    "status": ("Status", "status"),
+    "follow_up_on": ("Follow up on", "follow_up_on"),
+    "next_action": ("Next action", "next_action"),
+    "updated_at": ("Updated at", "updated_at"),
+    "created_at": ("Created at", "created_at"),
+    "notes": ("Notes", "notes"),
+    "job_url": ("Job URL", "job_url"),
+    "source": ("Source", "source"),
+    "compensation": ("Compensation", "compensation_text"),
+    "location": ("Location", "location_text"),
+    "lead_location": ("Lead location", "job__location"),
+    "work_mode": ("Work mode", "job__work_mode"),
+    "lead_source": ("Lead source", "job__source"),
+    "lead_url": ("Lead URL", "job__job_url"),
+    "discovered_at": ("Discovered at", "job__discovered_at"),
+    "next_follow_up": ("Next follow-up", "export_next_follow_up"),
+    "open_follow_ups": ("Open follow-ups", "export_open_follow_ups"),
+}
+DEFAULT_COLUMNS = ("company", "title", "status", "follow_up_on", "next_action", "updated_at")
+
+CHOICE_LABELS = {
+    "status": dict(Application.Status.choices),
+    "job__work_mode": dict(JobLead.WorkMode.choices),
+    "job__source": dict(JobLead.Source.choices),
+}
+
+
+def _annotation(name):
+    """Follow-up columns are correlated subqueries, only added when selected."""
+
+    followups = FollowUp.objects.filter(application=OuterRef("pk"), is_completed=False)
+    if name == "export_next_follow_up":
+        return Subquery(followups.order_by("due_on").values("due_on")[:1])
+    totals = followups.order_by().values("application").annotate(total=Count("pk")).values("total")
+    return Coalesce(Subquery(totals, output_field=IntegerField()), 0)
+
+
+def parse_columns(values):
+    """Column keys from ``?columns=`` values, comma-separated or repeated.
+
+    Raises ``ValueError`` naming the first unknown column.
+    """
+
+    keys = [key.strip() for value in values for key in value.split(",") if key.strip()]
+    for key in keys:
+        if key not in COLUMNS:
+            raise ValueError(f"Unknown export column: {key}.")
+    return list(dict.fromkeys(keys)) or list(DEFAULT_COLUMNS)
+
+
+class _LineBuffer:
+    """File-like target for ``csv.writer`` that hands back each formatted line."""
+
+    def write(self, value):
+        return value
+
+
+def _csv_cell(field, value):
+    if value is None:
+        return ""
+    if field in CHOICE_LABELS:
+        return CHOICE_LABELS[field].get(value, value)
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return value
+
+
+def export_rows(applications, columns=DEFAULT_COLUMNS, chunk_size=None):
+    """Yield raw value tuples for ``columns`` in the queryset's own order."""
+
+    fields = [COLUMNS[key][1] for key in columns]
+    annotations = {field: _annotation(field) for field in fields if field.startswith("export_")}
+    if annotations:
+        applications = applications.annotate(**annotations)
+    return applications.values_list(*fields).iterator(chunk_size=chunk_size or CHUNK_SIZE)
+
+
+def _batched(lines, chunk_size, progress=None):
+    batch = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= chunk_size:
+            if progress:
+                progress(len(batch))
+            yield "".join(batch)
+            batch = []
+    if batch:
+        if progress:
+            progress(len(batch))
+        yield "".join(batch)
+
+
+def stream_csv(applications, columns=DEFAULT_COLUMNS, chunk_size=None, progress=None):
+    """Yield the CSV export of ``applications``: the header, then ``chunk_size`` rows at a time.
+
+    ``progress`` is called with the number of rows in each chunk before it is yielded.
+    """
+
+    chunk_size = chunk_size or CHUNK_SIZE
+    fields = [COLUMNS[key][1] for key in columns]
+    writer = csv.writer(_LineBuffer())
+    yield writer.writerow([COLUMNS[key][0] for key in columns])
+    lines = (
+        writer.writerow([_csv_cell(field, value) for field, value in zip(fields, row)])
+        for row in export_rows(applications, columns, chunk_size)
+    )
+    yield from _batched(lines, chunk_size, progress)
+
+
+def stream_ndjson(applications, columns=DEFAULT_COLUMNS, chunk_size=None, progress=None):
+    """Yield one JSON object per application, keyed by column, ``chunk_size`` lines at a time."""
+
+    chunk_size = chunk_size or CHUNK_SIZE
+    encoder = DjangoJSONEncoder(ensure_ascii=False)
+    lines = (encoder.encode(dict(zip(columns, row))) + "\n" for row in export_rows(applications, columns, chunk_size))
+    yield from _batched(lines, chunk_size, progress)
+
+
+STREAMS = {"csv": stream_csv, "ndjson": stream_ndjson}
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip text ``chunks`` as they arrive, yielding compressed bytes."""
+
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+    for chunk in chunks:
+        compressed = compressor.compress(chunk.encode("utf-8"))
+        if compressed:
+            yield compressed
+    yield compressor.flush()
+
+
+def export_root():
+    return Path(getattr(settings, "TRACKER_EXPORT_ROOT", Path(settings.BASE_DIR) / "exports"))
+
+
+def claim_job(model):
+    """Mark the oldest pending ``model`` job as running and return it, or ``None``.
+
+    Rows locked by another worker are skipped, so several workers can drain
+    the queue without running a job twice.
+    """
+
+    with transaction.atomic():
+        job = (
+            model.objects.select_for_update(skip_locked=True)
+            .filter(status=model.Status.PENDING)
+            .order_by("created_at", "pk")
+            .first()
+        )
+        if job is not None:
+            job.status = model.Status.RUNNING
+            job.started_at = timezone.now()
+            job.save(update_fields=["status", "started_at", "updated_at"])
+    return job
+
+
+def claim_export_job():
+    return claim_job(ExportJob)
+
+
+def job_timeout():
+    seconds = getattr(settings, "TRACKER_JOB_TIMEOUT", None)
+    return DEFAULT_JOB_TIMEOUT if seconds is None else timedelta(seconds=seconds)
+
+
+def fail_stale_jobs(model, timeout=None):
+    """Mark ``model`` jobs left RUNNING by a dead worker as failed and return them.
+
+    ``claim_job`` only picks PENDING jobs, so a job whose worker crashed or
+    was killed would otherwise stay RUNNING forever. A job counts as stale
+    once its ``updated_at`` is older than ``timeout`` (``TRACKER_JOB_TIMEOUT``
+    seconds, an hour by default).
+    """
+
+    now = timezone.now()
+    stale = model.objects.filter(status=model.Status.RUNNING, updated_at__lt=now - (timeout or job_timeout()))
+    jobs = list(stale)
+    # Filtered again so a job that saved progress meanwhile is left alone.
+    stale.filter(pk__in=[job.pk for job in jobs]).update(
+        status=model.Status.FAILED, error=STALE_JOB_ERROR, finished_at=now, updated_at=now
+    )
+    return jobs
+
+
+def fail_stale_export_jobs(timeout=None):
+    jobs = fail_stale_jobs(ExportJob, timeout)
+    for job in jobs:
+        (export_root() / str(job.owner_id) / f"{job.filename}.part").unlink(missing_ok=True)
+    return jobs
+
+
+def prune_export_files(retention=None):
+    """Delete finished export files older than ``TRACKER_EXPORT_RETENTION_DAYS``; returns how many.
+
+    Their jobs are marked FAILED, so the status stops offering a download.
+    """
+
+    if retention is None:
+        days = getattr(settings, "TRACKER_EXPORT_RETENTION_DAYS", None)
+        retention = DEFAULT_RETENTION if days is None else timedelta(days=days)
+    now = timezone.now()
+    expired = ExportJob.objects.filter(status=ExportJob.Status.DONE, finished_at__lt=now - retention)
+    jobs = list(expired.only("pk", "file_path"))
+    for job in jobs:
+        Path(job.file_path).unlink(missing_ok=True)
+    expired.filter(pk__in=[job.pk for job in jobs]).update(
+        status=ExportJob.Status.FAILED, error=EXPIRED_ERROR, file_path="", updated_at=now
+    )
+    return len(jobs)
+
+
+def run_export_job(job, applications, chunk_size=None):
+    """Write ``job``'s export of ``applications`` to disk, saving progress after every chunk.
+
+    The file is written under a ``.part`` name and renamed once complete, so
+    a download never sees a half-written export. Failures are recorded on
+    the job rather than raised.
+    """
+
+    columns = job.columns or list(DEFAULT_COLUMNS)
+    directory = export_root() / str(job.owner_id)
+    path = directory / job.filename
+    partial = path.with_name(path.name + ".part")
+    jobs = ExportJob.objects.filter(pk=job.pk)
+    rows_written = 0
+
+    def count_rows(rows):
+        nonlocal rows_written
+        rows_written += rows
+
+    try:
+        job.rows_total = applications.count()
+        jobs.update(rows_total=job.rows_total, updated_at=timezone.now())
+        directory.mkdir(parents=True, exist_ok=True)
+        chunks = STREAMS[job.export_format](applications, columns, chunk_size, progress=count_rows)
+        if job.compress:
+            chunks = gzip_stream(chunks)
+        with open(partial, "wb") as handle:
+            for chunk in chunks:
+                handle.write(chunk if isinstance(chunk, bytes) else chunk.encode("utf-8"))
+                jobs.update(rows_written=rows_written, size_bytes=handle.tell(), updated_at=timezone.now())
+        partial.replace(path)
+    except Exception as exc:
+        partial.unlink(missing_ok=True)
+        job.status = ExportJob.Status.FAILED
+        job.error = str(exc) or exc.__class__.__name__
+    else:
+        job.status = ExportJob.Status.DONE
+        job.file_path = str(path)
+        job.size_bytes = path.stat().st_size
+    job.rows_written = rows_written
+    job.finished_at = timezone.now()
+    job.save(
+        update_fields=[
+            "status", "error", "file_path", "rows_total", "rows_written", "size_bytes", "finished_at", "updated_at",
+        ]
+    )
+    return job
+
+
+_RANGE_RE = re.compile(r"^bytes=(\d*)-(\d*)$")
+
+
+def parse_byte_range(header, size):
+    """``(start, end)`` (inclusive) for a single-range ``Range`` header.
+
+    Returns ``None`` when the header is absent, malformed (including a last
+    byte before the first) or asks for several ranges, so the whole file is
+    sent as RFC 9110 requires, and raises ``ValueError`` when the range cannot
+    be satisfied.
+    """
+
+    match = _RANGE_RE.match(header.strip()) if header else None
+    if not match or match.groups() == ("", ""):
+        return None
+    first, last = match.groups()
+    if first:
+        start = int(first)
+        if last and int(last) < start:
+            return None
+        end = min(int(last), size - 1) if last else size - 1
+        if start >= size:
+            raise ValueError("Range not satisfiable.")
+    else:
+        suffix = int(last)
+        if not suffix or not size:
+            raise ValueError("Range not satisfiable.")
+        start, end = max(size - suffix, 0), size - 1
+    return start, end
+
+
+def file_range(path, start, length, block_size=FILE_BLOCK_SIZE):
+    """Yield ``length`` bytes of ``path`` from ``start``, one block at a time."""
+
+    with open(path, "rb") as handle:
+        handle.seek(start)
+        while length > 0:
+            block = handle.read(min(block_size, length))
+            if not block:
+                break
+            length -= len(block)
+            yield block
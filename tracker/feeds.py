@@ -0,0 +1,310 @@
+"""RSS/Atom feed polling into the lead inbox.
+
+Feeds are fetched concurrently on a bounded thread pool. Each request replays
+the feed's stored ``ETag``/``Last-Modified``, so an unchanged feed costs a
+304 and no parsing. Bodies are parsed as they stream in with ``iterparse``,
+clearing each item once read. Only the main thread touches the database: it
+drops items whose GUID/link hash was already recorded for the subscription
+and pushes the rest through the bulk lead ingestion pipeline.
+"""
+
+import gzip
+import hashlib
+import html
+import http.client
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from xml.etree import ElementTree
+
+from django.db import transaction
+from django.utils import timezone
+from django.utils.html import strip_tags
+
+from .ingest import ingest_leads
+from .models import FeedEntry, JobLead
+
+USER_AGENT = "JobTracker feed poller"
+DEFAULT_WORKERS = 16
+DEFAULT_TIMEOUT = 10
+MAX_FEED_BYTES = 5 * 1024 * 1024
+MAX_ENTRIES = 500
+
+ITEM_TAGS = {"item", "entry"}
+CONTAINER_TAGS = {"channel", "feed", "rdf"}
+
+
+class FeedTooLarge(Exception):
+    pass
+
+
+class _LimitedReader:
+    def __init__(self, stream, limit):
+        self.stream = stream
+        self.remaining = limit
+
+    def read(self, size=-1):
+        if size is None or size < 0:
+            size = self.remaining + 1
+        data = self.stream.read(min(size, self.remaining + 1))
+        self.remaining -= len(data)
+        if self.remaining < 0:
+            raise FeedTooLarge(f"Feed is larger than {MAX_FEED_BYTES} bytes.")
+        return data
+
+
+def _local(tag):
+    return tag.rsplit("}", 1)[-1].lower() if isinstance(tag, str) else ""
+
+
+def _text(element):
+    return "".join(element.itertext()).strip()
+
+
+def _entry_from_element(element):
+    entry = {}
+    for child in element:
+        name = _local(child.tag)
+        if name == "link":
+            href = child.get("href")
+            if href is not None:
+                # Atom: prefer the alternate link over enclosures and self links.
+                if child.get("rel", "alternate") == "alternate" or "link" not in entry:
+                    entry["link"] = href.strip()
+            elif _text(child):
+                entry["link"] = _text(child)
+        elif name in ("guid", "id"):
+            entry["guid"] = _text(child)
+        elif name == "title":
+            entry["title"] = _text(child)
+        elif name in ("description", "summary"):
+            entry.setdefault("summary", _text(child))
+        elif name in ("encoded", "content"):
+            entry["summary"] = _text(child)
+        elif name in ("company", "location"):
+            entry[name] = _text(child)
+        elif name == "author":
+            entry.setdefault("author", _text(child))
+    return entry
+
+
+def parse_feed(stream, max_entries=MAX_ENTRIES):
+    """Return ``(feed_title, entries)`` from an RSS 1.0/2.0 or Atom stream."""
+
+    feed_title = ""
+    entries = []
+    path = []
+    for event, element in ElementTree.iterparse(stream, events=("start", "end")):
+        name = _local(element.tag)
+        if event == "start":
+            path.append(name)
+            continue
+        path.pop()
+        if name in ITEM_TAGS:
+            entries.append(_entry_from_element(element))
+            element.clear()
+            if len(entries) >= max_entries:
+                break
+        elif name == "title" and path and path[-1] in CONTAINER_TAGS and not feed_title:
+            feed_title = _text(element)
+    return feed_title, entries
+
+
+class FetchResult:
+    def __init__(self, subscription_id, status=None, etag="", last_modified="", error=""):
+        self.subscription_id = subscription_id
+        self.status = status
+        self.etag = etag
+        self.last_modified = last_modified
+        self.error = error
+        self.feed_title = ""
+        self.entries = []
+
+
+def fetch_feed(subscription_id, url, etag="", last_modified="", timeout=DEFAULT_TIMEOUT):
+    """Fetch and parse one feed; safe to run off the main thread (no ORM)."""
+
+    headers = {"User-Agent": USER_AGENT, "Accept-Encoding": "gzip"}
+    if etag:
+        headers["If-None-Match"] = etag
+    if last_modified:
+        headers["If-Modified-Since"] = last_modified
+    request = urllib.request.Request(url, headers=headers)
+    try:
+        with urllib.request.urlopen(request, timeout=timeout) as response:
+            result = FetchResult(
+                subscription_id,
+                status=response.status,
+                etag=response.headers.get("ETag", ""),
+                last_modified=response.headers.get("Last-Modified", ""),
+            )
+            stream = _LimitedReader(response, MAX_FEED_BYTES)
+            if response.headers.get("Content-Encoding", "").lower() == "gzip":
+                stream = _LimitedReader(gzip.GzipFile(fileobj=stream), MAX_FEED_BYTES)
+            result.feed_title, result.entries = parse_feed(stream)
+            return result
+    except urllib.error.HTTPError as exc:
+        result = FetchResult(subscription_id, status=exc.code, etag=etag, last_modified=last_modified)
+        if exc.code != 304:
+            result.error = f"HTTP {exc.code}"
+        return result
+    except (
+        urllib.error.URLError,
+        http.client.HTTPException,
+        OSError,
+        EOFError,
+        ElementTree.ParseError,
+        FeedTooLarge,
+        ValueError,
+    ) as exc:
+        return FetchResult(
+            subscription_id,
+            etag=etag,
+            last_modified=last_modified,
+            error=str(exc) or exc.__class__.__name__,
+        )
+
+
+def entry_hash(entry):
+    key = entry.get("guid") or entry.get("link") or f"{entry.get('title', '')}|{entry.get('summary', '')}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def split_title(title, fallback_company=""):
+    """Split "Role at Company" / "Company: Role" titles into ``(role, company)``."""
+
+    for separator in (" at ", " @ "):
+        if separator in title:
+            role, company = title.rsplit(separator, 1)
+            return role.strip(), company.strip()
+    if ": " in title:
+        company, role = title.split(": ", 1)
+        return role.strip(), company.strip()
+    return title.strip(), fallback_company
+
+
+def entry_record(entry, fallback_company=""):
+    role, company = split_title(entry.get("title", ""), fallback_company)
+    summary = html.unescape(strip_tags(entry.get("summary", ""))).strip()
+    return {
+        "title": role[:200],
+        "company": (entry.get("company") or company or entry.get("author", ""))[:200],
+        "location": entry.get("location", "")[:200],
+        "job_url": entry.get("link", ""),
+        "jd_text": summary,
+        "source": JobLead.Source.RSS,
+    }
+
+
+class PollSummary:
+    def __init__(self):
+        self.feeds = 0
+        self.updated = 0
+        self.not_modified = 0
+        self.failed = 0
+        self.created = 0
+        self.duplicates = 0
+        self.rejected = 0
+        self.errors = []
+
+
+def _record_failure(subscription, error, summary):
+    summary.failed += 1
+    summary.errors.append((subscription, error))
+    subscription.last_error = error
+    subscription.save(update_fields=["last_polled_at", "last_status", "last_error", "updated_at"])
+
+
+def store_result(subscription, result, summary):
+    """Apply one :class:`FetchResult` to its subscription (main thread).
+
+    A failure while storing is recorded on the subscription like a fetch
+    error; its entries are not marked as seen, so the next poll retries them.
+    """
+
+    subscription.last_polled_at = timezone.now()
+    subscription.last_status = result.status
+    subscription.last_error = result.error
+    summary.feeds += 1
+
+    if result.error or result.status not in (200, 304):
+        _record_failure(subscription, result.error or f"HTTP {result.status}", summary)
+        return
+    if result.status == 304:
+        summary.not_modified += 1
+        subscription.save(update_fields=["last_polled_at", "last_status", "last_error", "updated_at"])
+        return
+
+    try:
+        with transaction.atomic():
+            ingested = _store_entries(subscription, result)
+    except Exception as exc:
+        _record_failure(subscription, str(exc) or exc.__class__.__name__, summary)
+        return
+    summary.updated += 1
+    summary.created += ingested.created
+    summary.duplicates += ingested.duplicates
+    summary.rejected += ingested.failed
+
+
+def _store_entries(subscription, result):
+    entries = {}
+    for entry in result.entries:
+        entries.setdefault(entry_hash(entry), entry)
+    seen = set(
+        FeedEntry.objects.filter(subscription=subscription, guid_hash__in=list(entries)).values_list(
+            "guid_hash", flat=True
+        )
+    )
+    fresh = [(digest, entry) for digest, entry in entries.items() if digest not in seen]
+    fallback_company = subscription.title or result.feed_title
+    records = ((row, entry_record(entry, fallback_company)) for row, (_, entry) in enumerate(fresh, 1))
+
+    ingested = ingest_leads(records, subscription.owner, default_source=JobLead.Source.RSS)
+    # Rejected items are recorded too, so a malformed entry is not retried forever.
+    FeedEntry.objects.bulk_create(
+        [FeedEntry(subscription=subscription, guid_hash=digest) for digest, _ in fresh],
+        ignore_conflicts=True,
+    )
+    subscription.etag = result.etag[:255]
+    subscription.last_modified = result.last_modified[:64]
+    if not subscription.title and result.feed_title:
+        subscription.title = result.feed_title[:200]
+    subscription.save()
+    return ingested
+
+
+def poll_feeds(subscriptions, workers=DEFAULT_WORKERS, timeout=DEFAULT_TIMEOUT):
+    """Fetch ``subscriptions`` concurrently and ingest their new entries."""
+
+    summary = PollSummary()
+    by_id = {subscription.pk: subscription for subscription in subscriptions}
+    if not by_id:
+        return summary
+    with ThreadPoolExecutor(max_workers=max(1, min(workers, len(by_id)))) as pool:
+        futures = {
+            pool.submit(
+                fetch_feed,
+                subscription.pk,
+                subscription.url,
+                subscription.etag,
+                subscription.last_modified,
+                timeout,
+            ): subscription
+            for subscription in by_id.values()
+        }
+        for future in as_completed(futures):
+            subscription = futures[future]
+            try:
+                result = future.result()
+            except Exception as exc:
+                # fetch_feed handles network and parse errors; anything else
+                # still only fails this feed.
+                result = FetchResult(
+                    subscription.pk,
+                    etag=subscription.etag,
+                    last_modified=subscription.last_modified,
+                    error=str(exc) or exc.__class__.__name__,
+                )
+            store_result(subscription, result, summary)
+    return summary
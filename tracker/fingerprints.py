@@ -0,0 +1,77 @@
+"""Duplicate detection for job leads.
+
+A lead's fingerprint is a SHA-256 of its canonical ``job_url`` when it has
+one, otherwise of its normalised company, title and location. Canonical URLs
+ignore scheme, ``www.``, trailing slashes, fragments, parameter order and
+known tracking parameters, so the same posting reached through an RSS feed,
+an email alert and a pasted link fingerprints the same. The column is
+indexed per owner, so checking a new lead is one index lookup.
+"""
+
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+TRACKING_PARAMS = re.compile(
+    r"^(utm_|trk|ref$|refid$|trackingid$|lipi$|midtoken$|midsig$|eid$|from$|gclid$|fbclid$|"
+    r"mc_[ce]id$|gh_src$|lever-source|src$)",
+    re.IGNORECASE,
+)
+COMPANY_SUFFIXES = re.compile(
+    r"(\s+(inc|llc|ltd|limited|gmbh|plc|corp|corporation|co|pvt|private|sa|ag|bv))+$"
+)
+FINGERPRINT_FIELDS = frozenset({"job_url", "company", "title", "location"})
+
+
+def strip_tracking(url):
+    """``url`` without fragment or tracking query parameters."""
+
+    try:
+        parts = urlsplit(url)
+    except ValueError:
+        return url
+    query = [
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    ]
+    return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query), ""))
+
+
+def canonical_url(url):
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        # A malformed or out-of-range port (or bracketed host): fingerprint
+        # the URL as given rather than failing the save.
+        return url
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def normalize_text(value):
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", value).split())
+
+
+def lead_fingerprint(job_url="", company="", title="", location=""):
+    url = canonical_url(job_url)
+    if url:
+        key = f"url:{url}"
+    else:
+        company = COMPANY_SUFFIXES.sub("", normalize_text(company))
+        key = f"lead:{company}|{normalize_text(title)}|{normalize_text(location)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
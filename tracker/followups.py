@@ -0,0 +1,91 @@
+"""Follow-up inbox assembly.
+
+The inbox shows open follow-ups from two sources: ``Application.follow_up_on``
+and incomplete ``FollowUp`` rows. Each source is fetched once, already ordered
+by due date and tagged with its section by a CASE expression, then the two
+sorted streams are merged lazily into the today/overdue/week sections.
+"""
+
+import heapq
+from datetime import timedelta
+
+from django.db.models import Case, CharField, Q, Value, When
+from django.utils import timezone
+
+SECTIONS = ("today", "overdue", "week")
+HORIZON_DAYS = 7
+
+
+def _section_bounds(field, today, week_end):
+    return {
+        "overdue": Q(**{f"{field}__lt": today}),
+        "today": Q(**{field: today}),
+        "week": Q(**{f"{field}__gt": today, f"{field}__lte": week_end}),
+    }
+
+
+def _bucketed(queryset, field, today, week_end, sections):
+    bounds = _section_bounds(field, today, week_end)
+    predicate = Q()
+    for section in sections:
+        predicate |= bounds[section]
+    return (
+        queryset.filter(predicate)
+        .annotate(
+            inbox_section=Case(
+                When(bounds["overdue"], then=Value("overdue")),
+                When(bounds["today"], then=Value("today")),
+                default=Value("week"),
+                output_field=CharField(),
+            )
+        )
+        .order_by(field, "pk")
+    )
+
+
+def _application_items(applications):
+    for application in applications:
+        yield {
+            "type": "application",
+            "due_on": application.follow_up_on,
+            "section": application.inbox_section,
+            "application": application,
+        }
+
+
+def _followup_items(followups):
+    for followup in followups:
+        yield {
+            "type": "followup",
+            "due_on": followup.due_on,
+            "section": followup.inbox_section,
+            "application": followup.application,
+            "followup": followup,
+        }
+
+
+def build_followup_inbox(applications, followups, today=None, sections=SECTIONS):
+    """Return ``(today, week_end, {section: items})`` for the inbox.
+
+    ``applications`` and ``followups`` are pre-filtered querysets (owner,
+    status, search, open items only). ``sections`` limits which buckets are
+    fetched at all; sections left out come back as empty lists.
+    """
+
+    today = today or timezone.localdate()
+    week_end = today + timedelta(days=HORIZON_DAYS)
+    result = {section: [] for section in SECTIONS}
+    if not sections:
+        return today, week_end, result
+
+    application_stream = _application_items(
+        _bucketed(applications, "follow_up_on", today, week_end, sections).iterator()
+    )
+    followup_stream = _followup_items(
+        _bucketed(followups, "due_on", today, week_end, sections).iterator()
+    )
+    # Both streams are already in due-date order; on ties applications come
+    # first, as they did before.
+    for item in heapq.merge(application_stream, followup_stream, key=lambda item: item["due_on"]):
+        result[item["section"]].append(item)
+    return today, week_end, result
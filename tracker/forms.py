@@ -1,7 +1,12 @@
 from django import forms
 from django.db import transaction
+from django.utils import timezone
 
+from .fingerprints import lead_fingerprint
 from .models import Application, JobLead, UserProfile
+from .near_duplicates import index_leads, signature_for_text
+from .scam import SCORED_FIELDS, score_leads
+from .similar_leads import index_terms
 
 
 class NewApplicationForm(forms.Form):
@@ -41,23 +46,65 @@ class NewApplicationForm(forms.Form):
         required=False,
     )
 
+    def clean(self):
+        cleaned_data = super().clean()
+        self.duplicate_lead = None
+        if self.user is None or not {"company", "title"}.issubset(cleaned_data):
+            return cleaned_data
+
+        fingerprint = lead_fingerprint(
+            cleaned_data.get("job_url", ""),
+            cleaned_data["company"],
+            cleaned_data["title"],
+            cleaned_data.get("location", ""),
+        )
+        self.duplicate_lead = JobLead.find_duplicate(self.user, fingerprint)
+        if self.duplicate_lead is not None and self.duplicate_lead.owner_application_id:
+            raise forms.ValidationError(
+                "You are already tracking this job (%(lead)s).",
+                code="duplicate",
+                params={"lead": self.duplicate_lead},
+            )
+        return cleaned_data
+
     def save(self) -> Application:
         """
         Persist JobLead and Application from validated form data.
         Assumes form.is_valid() has already been called.
+
+        A lead with the same fingerprint is reused rather than duplicated;
+        its empty fields are filled in from the form.
         """
 
         with transaction.atomic():
-            job = JobLead.objects.create(
-                company=self.cleaned_data["company"],
-                title=self.cleaned_data["title"],
-                location=self.cleaned_data.get("location", ""),
-                work_mode=self.cleaned_data["work_mode"],
-                source=self.cleaned_data["source"],
-                job_url=self.cleaned_data.get("job_url", ""),
-                jd_text=self.cleaned_data.get("jd_text", ""),
-                owner=self.user,
-            )
+            details = {
+                "location": self.cleaned_data.get("location", ""),
+                "job_url": self.cleaned_data.get("job_url", ""),
+                "jd_text": self.cleaned_data.get("jd_text", ""),
+            }
+            job = getattr(self, "duplicate_lead", None)
+            if job is not None:
+                filled = job.fill_blanks(**details)
+                if filled and score_leads([job]):
+                    job.save(update_fields=[*SCORED_FIELDS, "updated_at"])
+                if "jd_text" in filled:
+                    index_leads([job])
+                    # fill_blanks only writes empty fields, so the old text had no description.
+                    index_terms([job], previous={job.pk: (job.title, "")})
+            else:
+                job = JobLead(
+                    company=self.cleaned_data["company"],
+                    title=self.cleaned_data["title"],
+                    work_mode=self.cleaned_data["work_mode"],
+                    source=self.cleaned_data["source"],
+                    jd_signature=signature_for_text(details["jd_text"]),
+                    owner=self.user,
+                    **details,
+                )
+                score_leads([job])
+                job.save()
+                index_leads([job], new=True)
+                index_terms([job])
 
             application = Application.objects.create(
                 job=job,
@@ -191,3 +238,58 @@ class UserProfileSettingsForm(forms.ModelForm):
         widgets = {
             "daily_reminder_time": forms.TimeInput(attrs={"type": "time"}),
         }
+
+
+class LeadIngestForm(forms.ModelForm):
+    """Validate one lead record from a bulk ingestion payload."""
+
+    class Meta:
+        model = JobLead
+        fields = [
+            "title",
+            "company",
+            "location",
+            "work_mode",
+            "source",
+            "job_url",
+            "jd_text",
+            "notes",
+            "discovered_at",
+        ]
+
+    def __init__(self, *args, default_source=JobLead.Source.MANUAL, **kwargs):
+        self.default_source = default_source
+        super().__init__(*args, **kwargs)
+        for name in ("work_mode", "source", "discovered_at"):
+            self.fields[name].required = False
+
+    def clean_work_mode(self):
+        return self.cleaned_data.get("work_mode") or JobLead.WorkMode.UNKNOWN
+
+    def clean_source(self):
+        return self.cleaned_data.get("source") or self.default_source
+
+    def clean_discovered_at(self):
+        return self.cleaned_data.get("discovered_at") or timezone.now()
+
+
+class ApplicationImportForm(forms.ModelForm):
+    """Validate the application half of one CSV import row."""
+
+    class Meta:
+        model = Application
+        fields = [
+            "status",
+            "next_action",
+            "follow_up_on",
+            "notes",
+            "source",
+            "compensation_text",
+        ]
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.fields["status"].required = False
+
+    def clean_status(self):
+        return self.cleaned_data.get("status") or Application.Status.WISHLIST
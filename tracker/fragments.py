@@ -0,0 +1,94 @@
+"""Per-user, version-stamped fragment cache.
+
+Each user has a "data version" stamp in the cache. Saving or deleting any of
+their applications, leads or follow-ups replaces the stamp (see the signal
+receivers in ``models.py``), and every cached fragment key embeds it, so an
+edit orphans all of that user's fragments at once without having to find and
+delete them. Orphans simply age out.
+
+Writes that skip model signals (``QuerySet.update``, ``bulk_create``,
+``bulk_update``) must call :func:`bulk_written` themselves.
+
+The stamp only invalidates what shares its cache, so ``TRACKER_FRAGMENT_CACHE``
+turns caching off (:func:`fragment_cache_key` returns ``None``) wherever the
+cache is not shared between workers.
+"""
+
+import hashlib
+import uuid
+from urllib.parse import urlencode
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+DEFAULT_TIMEOUT = 60 * 10
+
+
+def _version_key(user_id):
+    return f"tracker:data-version:{user_id}"
+
+
+def _new_version(user_id):
+    version = uuid.uuid4().hex
+    cache.set(_version_key(user_id), version, None)
+    return version
+
+
+def data_version(user_id):
+    """Return ``user_id``'s current data version, creating one if needed."""
+
+    key = _version_key(user_id)
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, uuid.uuid4().hex, None)
+        version = cache.get(key)
+    return version
+
+
+def bump_data_version(user_id):
+    """Invalidate every cached fragment for ``user_id``."""
+
+    if user_id is None:
+        return
+    _new_version(user_id)
+    # Until this transaction commits, other requests still read the old rows
+    # and could cache them under the stamp set above; stamp again afterwards.
+    transaction.on_commit(lambda: _new_version(user_id))
+
+
+def bulk_written(owner_id):
+    """Invalidate ``owner_id``'s fragments after a write that sent no signals.
+
+    ``bulk_create``, ``bulk_update`` and ``QuerySet.update`` skip ``post_save``,
+    so the receivers in ``models.py`` never hear about those rows; call this
+    once the batch is written.
+    """
+
+    bump_data_version(owner_id)
+
+
+def fragment_cache_enabled():
+    return getattr(settings, "TRACKER_FRAGMENT_CACHE", True)
+
+
+def fragment_cache_timeout():
+    return getattr(settings, "TRACKER_FRAGMENT_CACHE_TIMEOUT", DEFAULT_TIMEOUT)
+
+
+def fragment_cache_key(user_id, name, params=None, today=None):
+    """Cache key for fragment ``name`` rendered for ``user_id``, or ``None`` when caching is off.
+
+    ``params`` is the request's query dict (order-insensitive); ``today`` is
+    included for fragments that highlight due or overdue dates.
+    """
+
+    if not fragment_cache_enabled():
+        return None
+    parts = []
+    if params is not None:
+        parts.append(urlencode(sorted((key, value) for key in params for value in params.getlist(key))))
+    if today is not None:
+        parts.append(today.isoformat())
+    digest = hashlib.md5("|".join(parts).encode("utf-8"), usedforsecurity=False).hexdigest()
+    return f"tracker:fragment:{user_id}:{data_version(user_id)}:{name}:{digest}"
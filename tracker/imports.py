@@ -0,0 +1,340 @@
+"""CSV import for applications and leads.
+
+The upload is decoded and parsed incrementally (see ``ingest.text_chunks``),
+so only the current batch of rows is ever in memory. The delimiter is
+sniffed from the first chunk and the header row is matched against known
+column names, including every header the CSV export writes, so an export
+imports back as-is; ``mapping`` overrides or adds header names.
+
+Each row is validated with the same forms as the other write paths
+(``LeadIngestForm`` and ``ApplicationImportForm``); choice columns accept
+either the stored value or its label. Valid rows are written in batches
+with ``bulk_create``. Duplicate detection is the lead fingerprint used by
+``ingest``: a row whose lead already exists is skipped, or, when importing
+applications, attached to that lead if it has no application yet, so
+importing the same file twice changes nothing. ``dry_run`` runs every check
+and reports the same counts without writing.
+"""
+
+import csv
+import re
+
+from django.db import transaction
+
+from .counters import pipeline_write
+from .forms import ApplicationImportForm, LeadIngestForm
+from .fragments import bulk_written
+from .ingest import IngestResult, create_leads, prepare_lead, text_chunks
+from .models import Application, JobLead
+from .relevance import Targeting
+
+KINDS = ("applications", "leads")
+DEFAULT_BATCH_SIZE = 500
+SNIFF_DELIMITERS = ",;\t|"
+
+# Normalized header -> field. Lead fields first; ``APPLICATION_COLUMNS``
+# adds the application's own and takes over the names both models share.
+LEAD_COLUMNS = {
+    "company": "company",
+    "employer": "company",
+    "organization": "company",
+    "organisation": "company",
+    "title": "title",
+    "job_title": "title",
+    "role": "title",
+    "position": "title",
+    "location": "location",
+    "lead_location": "location",
+    "city": "location",
+    "work_mode": "work_mode",
+    "remote": "work_mode",
+    "workplace": "work_mode",
+    "source": "source",
+    "lead_source": "source",
+    "job_url": "job_url",
+    "lead_url": "job_url",
+    "url": "job_url",
+    "link": "job_url",
+    "jd_text": "jd_text",
+    "description": "jd_text",
+    "job_description": "jd_text",
+    "notes": "notes",
+    "discovered_at": "discovered_at",
+}
+APPLICATION_COLUMNS = {
+    **LEAD_COLUMNS,
+    "status": "status",
+    "stage": "status",
+    "next_action": "next_action",
+    "follow_up_on": "follow_up_on",
+    "follow_up": "follow_up_on",
+    "follow_up_date": "follow_up_on",
+    "notes": "application_notes",
+    "source": "application_source",
+    "compensation": "compensation_text",
+    "compensation_text": "compensation_text",
+    "salary": "compensation_text",
+}
+APPLICATION_FIELDS = {
+    "status": "status",
+    "next_action": "next_action",
+    "follow_up_on": "follow_up_on",
+    "application_notes": "notes",
+    "application_source": "source",
+    "compensation_text": "compensation_text",
+}
+CHOICES = {
+    "work_mode": JobLead.WorkMode.choices,
+    "source": JobLead.Source.choices,
+    "status": Application.Status.choices,
+}
+REQUIRED = ("company", "title")
+
+
+class CSVImportError(ValueError):
+    """The file cannot be imported at all (as opposed to a bad row)."""
+
+
+class ImportResult(IngestResult):
+    def __init__(self, kind, dry_run):
+        super().__init__()
+        self.kind = kind
+        self.dry_run = dry_run
+        self.applications = 0
+        self.columns = {}
+        self.ignored_columns = []
+
+    def as_dict(self):
+        return {
+            **super().as_dict(),
+            "kind": self.kind,
+            "dry_run": self.dry_run,
+            "applications": self.applications,
+            "columns": self.columns,
+            "ignored_columns": self.ignored_columns,
+        }
+
+
+def normalize_header(header):
+    return re.sub(r"[^a-z0-9]+", "_", header.strip().lower()).strip("_")
+
+
+def map_columns(headers, kind, mapping=None):
+    """``{index: field}`` for a header row; raises :class:`CSVImportError` without company and title.
+
+    ``mapping`` maps header names (matched after normalizing) to column names
+    such as ``company`` or ``salary``.
+    """
+
+    columns = APPLICATION_COLUMNS if kind == "applications" else LEAD_COLUMNS
+    overrides = {}
+    for header, column in (mapping or {}).items():
+        if normalize_header(column) not in columns:
+            raise CSVImportError(f"Unknown import column: {column}.")
+        overrides[normalize_header(header)] = columns[normalize_header(column)]
+
+    fields, ignored = {}, []
+    for index, header in enumerate(headers):
+        key = normalize_header(header)
+        field = overrides.get(key) or columns.get(key)
+        if field is None or field in fields.values():
+            if header.strip():
+                ignored.append(header)
+            continue
+        fields[index] = field
+    missing = [field for field in REQUIRED if field not in fields.values()]
+    if missing:
+        raise CSVImportError(f"No column found for: {', '.join(missing)}.")
+    return fields, ignored
+
+
+def parse_mapping(values):
+    """``{header: column}`` from ``header=column`` strings."""
+
+    mapping = {}
+    for value in values:
+        header, separator, column = value.rpartition("=")
+        if not separator or not header.strip() or not column.strip():
+            raise CSVImportError(f"Column mappings look like 'Header=column', not {value!r}.")
+        mapping[header.strip()] = column.strip()
+    return mapping
+
+
+def _choice_value(value, choices):
+    """The stored value for ``value`` given as a value or a label, in any case."""
+
+    folded = value.strip().casefold()
+    for stored, label in choices:
+        if folded in (stored.casefold(), str(label).casefold()):
+            return stored
+    return value.strip()
+
+
+def _lines(chunks):
+    pending = ""
+    for chunk in chunks:
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            yield line + "\n"
+    if pending:
+        yield pending
+
+
+def iter_csv_rows(stream):
+    """Yield ``(line_number, cells)`` from a CSV stream; the first row is the header.
+
+    The dialect is sniffed from the first chunk; a sample that cannot be
+    sniffed is read as plain comma-separated values.
+    """
+
+    chunks = text_chunks(stream)
+    first = next(chunks, "")
+    try:
+        dialect = csv.Sniffer().sniff(first[:8192], delimiters=SNIFF_DELIMITERS)
+    except csv.Error:
+        dialect = csv.excel
+    reader = csv.reader(_lines(_prepend(first, chunks)), dialect)
+    for cells in reader:
+        if any(cell.strip() for cell in cells):
+            yield reader.line_num, cells
+
+
+def _prepend(first, chunks):
+    yield first
+    yield from chunks
+
+
+class _Importer:
+    def __init__(self, owner, kind, dry_run, batch_size):
+        self.owner = owner
+        self.kind = kind
+        self.dry_run = dry_run
+        self.batch_size = batch_size
+        self.result = ImportResult(kind, dry_run)
+        self.targeting = None
+        self.batch = []
+        # A dry run writes nothing, so rows are also checked against the
+        # earlier batches it has already counted.
+        self.planned_fingerprints = set()
+        self.planned_job_ids = set()
+
+    def add(self, row, values):
+        lead_data, application_data = {}, {}
+        for field, value in values.items():
+            if field in CHOICES and value:
+                value = _choice_value(value, CHOICES[field])
+            if field in APPLICATION_FIELDS:
+                application_data[APPLICATION_FIELDS[field]] = value
+            else:
+                lead_data[field] = value
+
+        errors = {}
+        lead_form = LeadIngestForm({key: value for key, value in lead_data.items() if value})
+        if not lead_form.is_valid():
+            errors.update(lead_form.errors)
+        application_form = None
+        if self.kind == "applications":
+            application_form = ApplicationImportForm({key: value for key, value in application_data.items() if value})
+            if not application_form.is_valid():
+                errors.update(application_form.errors)
+        if errors:
+            self.result.add_error(row, {field: list(messages) for field, messages in errors.items()})
+            return
+
+        if self.targeting is None:
+            self.targeting = Targeting(getattr(self.owner, "profile", None))
+        lead = prepare_lead(lead_form.save(commit=False), self.owner, self.targeting)
+        application = application_form.save(commit=False) if application_form else None
+        self.batch.append((lead, application))
+        if len(self.batch) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self.batch:
+            return
+        if self.kind == "applications" and not self.dry_run:
+            write = pipeline_write(self.owner.pk)
+        else:
+            write = transaction.atomic()
+        with write:
+            written = self._flush()
+        if written:
+            # Applications attached to existing leads never go through
+            # ``create_leads``.
+            bulk_written(self.owner.pk)
+        self.batch = []
+
+    def _flush(self):
+        existing = dict(
+            JobLead.objects.filter(
+                owner=self.owner, fingerprint__in={lead.fingerprint for lead, _ in self.batch}
+            ).values_list("fingerprint", "pk")
+        )
+        applied = set()
+        if self.kind == "applications" and existing:
+            applied = set(
+                Application.objects.filter(owner=self.owner, job_id__in=existing.values()).values_list(
+                    "job_id", flat=True
+                )
+            )
+
+        seen = self.planned_fingerprints if self.dry_run else set()
+        planned_job_ids = self.planned_job_ids if self.dry_run else set()
+        new_leads, applications = [], []
+        for lead, application in self.batch:
+            job_id = existing.get(lead.fingerprint)
+            if application is None or job_id is None:
+                if job_id is not None or lead.fingerprint in seen:
+                    self.result.duplicates += 1
+                    continue
+                seen.add(lead.fingerprint)
+                new_leads.append(lead)
+                if application is not None:
+                    applications.append((application, lead))
+            elif job_id in applied or job_id in planned_job_ids:
+                self.result.duplicates += 1
+            else:
+                # The lead was imported or added before without an application.
+                applied.add(job_id)
+                planned_job_ids.add(job_id)
+                application.job_id = job_id
+                applications.append((application, None))
+
+        self.result.created += len(new_leads)
+        self.result.applications += len(applications)
+        if self.dry_run:
+            return False
+        if new_leads:
+            create_leads(new_leads, self.owner)
+        for application, lead in applications:
+            application.owner = self.owner
+            if lead is not None:
+                application.job_id = lead.pk
+        Application.objects.bulk_create([application for application, _ in applications])
+        return bool(new_leads or applications)
+
+
+def import_csv(stream, owner, kind="applications", mapping=None, dry_run=False, batch_size=DEFAULT_BATCH_SIZE):
+    """Import a CSV stream of applications (each with its lead) or leads for ``owner``.
+
+    Raises :class:`CSVImportError` when the header has no company or title
+    column; bad rows are reported in the returned :class:`ImportResult`.
+    Each batch commits on its own, like ``ingest``.
+    """
+
+    if kind not in KINDS:
+        raise CSVImportError(f"Select a valid import kind: {', '.join(KINDS)}.")
+    importer = _Importer(owner, kind, dry_run, batch_size)
+    rows = iter_csv_rows(stream)
+    header = next(rows, None)
+    if header is None:
+        raise CSVImportError("The file is empty.")
+    fields, importer.result.ignored_columns = map_columns(header[1], kind, mapping)
+    importer.result.columns = {header[1][index]: field for index, field in fields.items()}
+
+    for row, cells in rows:
+        values = {field: cells[index].strip() for index, field in fields.items() if index < len(cells)}
+        importer.add(row, values)
+    importer.flush()
+    return importer.result
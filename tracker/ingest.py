@@ -0,0 +1,239 @@
+"""Bulk lead ingestion.
+
+Scrapers push leads as NDJSON (one object per line) or as a JSON array. The
+payload is parsed incrementally from a file-like object, so a request body
+or file of any size is never held in memory at once; valid rows are written
+with ``bulk_create`` in batches, one transaction per batch, and invalid rows
+are reported by position without stopping the run. Rows whose fingerprint
+matches one of the owner's leads (or an earlier row) are counted as
+duplicates and skipped, with one indexed lookup per batch; the rest are
+scam-scored (see ``scam``), checked for near-duplicate descriptions
+(see ``near_duplicates``) and added to the similar-leads index (see
+``similar_leads``).
+"""
+
+import codecs
+import itertools
+import json
+
+from django.db import transaction
+
+from .forms import LeadIngestForm
+from .fragments import bulk_written
+from .models import JobLead
+from .near_duplicates import index_leads, signature_for_text
+from .relevance import Targeting
+from .scam import score_leads
+from .similar_leads import index_terms
+
+DEFAULT_BATCH_SIZE = 500
+MAX_REPORTED_ERRORS = 1000
+CHUNK_SIZE = 64 * 1024
+# A single lead larger than this is treated as malformed rather than read on.
+MAX_RECORD_SIZE = 1024 * 1024
+
+
+class RecordError(ValueError):
+    pass
+
+
+def text_chunks(stream, chunk_size=CHUNK_SIZE):
+    """Decode a binary (or text) stream into text chunks, dropping a UTF-8 BOM."""
+
+    decoder = codecs.getincrementaldecoder("utf-8-sig")(errors="replace")
+    while True:
+        data = stream.read(chunk_size)
+        if not data:
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+            return
+        if isinstance(data, str):
+            yield data
+        else:
+            yield decoder.decode(data)
+
+
+def _parse_line(line_number, line):
+    try:
+        return line_number, json.loads(line)
+    except json.JSONDecodeError as exc:
+        return line_number, RecordError(f"Invalid JSON: {exc.msg}.")
+
+
+def _iter_ndjson(buffer, chunks):
+    line_number = 0
+    pending = buffer
+    for chunk in itertools.chain([""], chunks):
+        lines = (pending + chunk).split("\n")
+        pending = lines.pop()
+        for line in lines:
+            line_number += 1
+            if line.strip():
+                yield _parse_line(line_number, line)
+    if pending.strip():
+        yield _parse_line(line_number + 1, pending)
+
+
+def _iter_array(buffer, chunks):
+    decoder = json.JSONDecoder()
+    position = buffer.index("[") + 1
+    index = 0
+    expect_value = True
+    while True:
+        while position < len(buffer) and buffer[position] in " \t\r\n":
+            position += 1
+        if position >= len(buffer):
+            more = next(chunks, None)
+            if more is None:
+                yield index + 1, RecordError("Unexpected end of JSON array.")
+                return
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+
+        char = buffer[position]
+        if char == "]" and (not expect_value or index == 0):
+            return
+        if not expect_value:
+            if char != ",":
+                yield index + 1, RecordError("Expected ',' or ']' between array items.")
+                return
+            position += 1
+            expect_value = True
+            continue
+
+        try:
+            value, end = decoder.raw_decode(buffer, position)
+        except json.JSONDecodeError as exc:
+            more = None if len(buffer) - position > MAX_RECORD_SIZE else next(chunks, None)
+            if more is None:
+                yield index + 1, RecordError(f"Invalid JSON: {exc.msg}.")
+                return
+            buffer = buffer[position:] + more
+            position = 0
+            continue
+        index += 1
+        yield index, value
+        # Consumed text is only dropped when refilling, which keeps the
+        # buffer around one chunk long without copying it per item.
+        position = end
+        expect_value = False
+
+
+def iter_lead_records(stream):
+    """Yield ``(row, record)`` pairs from an NDJSON or JSON-array stream.
+
+    ``row`` is the line number for NDJSON and the 1-based item position for
+    arrays. Unparseable rows yield a :class:`RecordError` instead of a dict.
+    A malformed array cannot be resynchronised, so parsing stops there;
+    NDJSON carries on with the next line.
+    """
+
+    chunks = text_chunks(stream)
+    buffer = ""
+    for chunk in chunks:
+        buffer += chunk
+        if buffer.strip():
+            break
+    if buffer.lstrip().startswith("["):
+        yield from _iter_array(buffer, chunks)
+    else:
+        yield from _iter_ndjson(buffer, chunks)
+
+
+class IngestResult:
+    def __init__(self):
+        self.created = 0
+        self.duplicates = 0
+        self.failed = 0
+        self.errors = []
+
+    def add_error(self, row, errors):
+        self.failed += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append({"row": row, "errors": errors})
+
+    def as_dict(self):
+        return {
+            "created": self.created,
+            "duplicates": self.duplicates,
+            "failed": self.failed,
+            "errors": self.errors,
+            "errors_truncated": self.failed > len(self.errors),
+        }
+
+
+def create_leads(leads, owner):
+    """Scam-score, insert and index new leads for ``owner``; call inside a transaction."""
+
+    score_leads(leads)
+    JobLead.objects.bulk_create(leads)
+    index_leads(leads, new=True)
+    index_terms(leads)
+    bulk_written(owner.pk)
+
+
+def _flush(batch, owner, result):
+    if not batch:
+        return
+    with transaction.atomic():
+        existing = set(
+            JobLead.objects.filter(owner=owner, fingerprint__in={lead.fingerprint for lead in batch}).values_list(
+                "fingerprint", flat=True
+            )
+        )
+        fresh = []
+        for lead in batch:
+            if lead.fingerprint in existing:
+                result.duplicates += 1
+                continue
+            existing.add(lead.fingerprint)
+            fresh.append(lead)
+        if fresh:
+            create_leads(fresh, owner)
+    result.created += len(fresh)
+    batch.clear()
+
+
+def prepare_lead(lead, owner, targeting):
+    """Fill in the owner and derived fields of a validated, unsaved lead."""
+
+    lead.owner = owner
+    lead.refresh_fingerprint()
+    lead.refresh_relevance(targeting)
+    lead.jd_signature = signature_for_text(lead.jd_text)
+    return lead
+
+
+def ingest_leads(records, owner, default_source=JobLead.Source.MANUAL, batch_size=DEFAULT_BATCH_SIZE):
+    """Validate ``(row, record)`` pairs and bulk-insert the valid ones for ``owner``.
+
+    Returns an :class:`IngestResult`. Each batch commits on its own, so a
+    failure part-way leaves earlier batches in place.
+    """
+
+    result = IngestResult()
+    targeting = None
+    batch = []
+    for row, record in records:
+        if isinstance(record, RecordError):
+            result.add_error(row, {"__all__": [str(record)]})
+            continue
+        if not isinstance(record, dict):
+            result.add_error(row, {"__all__": ["Expected a JSON object."]})
+            continue
+
+        data = {key: value for key, value in record.items() if value is not None}
+        form = LeadIngestForm(data, default_source=default_source)
+        if not form.is_valid():
+            result.add_error(row, {field: list(messages) for field, messages in form.errors.items()})
+            continue
+
+        if targeting is None:
+            targeting = Targeting(getattr(owner, "profile", None))
+        batch.append(prepare_lead(form.save(commit=False), owner, targeting))
+        if len(batch) >= batch_size:
+            _flush(batch, owner, result)
+    _flush(batch, owner, result)
+    return result
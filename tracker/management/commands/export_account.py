@@ -0,0 +1,37 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.backups import stream_archive
+
+
+class Command(BaseCommand):
+    help = "Write a user's leads, applications, follow-ups and profile to a compressed archive ('-' for stdout)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to write, or '-' for stdout.")
+        parser.add_argument("--user", required=True, help="Username to export.")
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"Unknown user '{options['user']}'.") from exc
+
+        if options["path"] == "-":
+            self._write(sys.stdout.buffer, user)
+            return
+        try:
+            with open(options["path"], "wb") as stream:
+                size = self._write(stream, user)
+        except OSError as exc:
+            raise CommandError(str(exc)) from exc
+        self.stdout.write(f"Wrote {size} bytes to {options['path']}.")
+
+    def _write(self, stream, user):
+        size = 0
+        for block in stream_archive(user):
+            stream.write(block)
+            size += len(block)
+        return size
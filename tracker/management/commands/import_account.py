@@ -0,0 +1,49 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.backups import BATCH_SIZE, ArchiveError, restore_archive
+
+
+class Command(BaseCommand):
+    help = "Restore an archive written by export_account into a user's account ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or '-' for stdin.")
+        parser.add_argument("--user", required=True, help="Username to restore into.")
+        parser.add_argument("--create-user", action="store_true", help="Create the user if it does not exist.")
+        parser.add_argument(
+            "--replace",
+            action="store_true",
+            help="Delete the user's existing leads and applications first.",
+        )
+        parser.add_argument("--batch-size", type=int, default=BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        User = get_user_model()
+        try:
+            owner = User.objects.get(username=options["user"])
+        except User.DoesNotExist as exc:
+            if not options["create_user"]:
+                raise CommandError(f"Unknown user '{options['user']}'.") from exc
+            owner = User.objects.create_user(username=options["user"])
+
+        try:
+            if options["path"] == "-":
+                counts = self._restore(sys.stdin.buffer, owner, options)
+            else:
+                with open(options["path"], "rb") as stream:
+                    counts = self._restore(stream, owner, options)
+        except (OSError, ArchiveError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        self.stdout.write(
+            f"Restored {counts['lead']} leads, {counts['application']} applications "
+            f"and {counts['followup']} follow-ups for {owner.get_username()}."
+        )
+
+    def _restore(self, stream, owner, options):
+        return restore_archive(stream, owner, replace=options["replace"], batch_size=options["batch_size"])
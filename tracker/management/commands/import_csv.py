@@ -0,0 +1,65 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.imports import DEFAULT_BATCH_SIZE, KINDS, CSVImportError, import_csv, parse_mapping
+
+
+class Command(BaseCommand):
+    help = "Import applications or leads from a CSV file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or '-' for stdin.")
+        parser.add_argument("--user", required=True, help="Username that will own the rows.")
+        parser.add_argument("--kind", default="applications", choices=KINDS)
+        parser.add_argument(
+            "--map",
+            action="append",
+            default=[],
+            metavar="HEADER=COLUMN",
+            help="Read a header as one of the known columns, e.g. 'Employer=company'.",
+        )
+        parser.add_argument("--dry-run", action="store_true", help="Validate and count without writing.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            owner = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"Unknown user '{options['user']}'.") from exc
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        try:
+            mapping = parse_mapping(options["map"])
+            if options["path"] == "-":
+                result = self._import(sys.stdin.buffer, owner, mapping, options)
+            else:
+                with open(options["path"], "rb") as stream:
+                    result = self._import(stream, owner, mapping, options)
+        except (OSError, CSVImportError) as exc:
+            raise CommandError(str(exc)) from exc
+
+        if result.ignored_columns:
+            self.stderr.write(f"Ignored columns: {', '.join(result.ignored_columns)}.")
+        for error in result.errors:
+            details = "; ".join(f"{field}: {' '.join(messages)}" for field, messages in error["errors"].items())
+            self.stderr.write(f"Line {error['row']}: {details}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... {result.failed - len(result.errors)} more rows failed.")
+        prefix = "Dry run: would create" if result.dry_run else "Created"
+        self.stdout.write(
+            f"{prefix} {result.created} leads and {result.applications} applications; "
+            f"{result.failed} rows failed. Skipped {result.duplicates} duplicates."
+        )
+
+    def _import(self, stream, owner, mapping, options):
+        return import_csv(
+            stream,
+            owner,
+            kind=options["kind"],
+            mapping=mapping,
+            dry_run=options["dry_run"],
+            batch_size=options["batch_size"],
+        )
@@ -0,0 +1,85 @@
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import JobLead, LeadSignatureBand
+from tracker.near_duplicates import compute_signatures, index_signatures
+
+
+class _InlineExecutor:
+    """Stand-in for a process pool when running single-process."""
+
+    class _Done:
+        def __init__(self, value):
+            self._value = value
+
+        def result(self):
+            return self._value
+
+    def submit(self, function, *args):
+        return self._Done(function(*args))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+class Command(BaseCommand):
+    help = "Compute MinHash signatures for leads and flag near-duplicate job descriptions."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only index this username's leads.")
+        parser.add_argument("--rebuild", action="store_true", help="Recompute every lead, not just unindexed ones.")
+        parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="Signature worker processes.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1 or options["batch_size"] < 1:
+            raise CommandError("--workers and --batch-size must be at least 1.")
+
+        leads = JobLead.objects.filter(owner__isnull=False)
+        if options.get("user"):
+            leads = leads.filter(owner__username=options["user"])
+        if options["rebuild"]:
+            LeadSignatureBand.objects.filter(lead__in=leads).delete()
+            leads.update(jd_signature=None, near_duplicate_of=None, near_duplicate_score=None)
+        owner_ids = list(leads.filter(jd_signature__isnull=True).values_list("owner_id", flat=True).distinct())
+
+        # Workers only hash text; the ORM stays in this process. Forking keeps
+        # start-up cheap and the children never touch the inherited connection.
+        if options["workers"] > 1 and "fork" in multiprocessing.get_all_start_methods():
+            executor = ProcessPoolExecutor(options["workers"], mp_context=multiprocessing.get_context("fork"))
+        else:
+            executor = _InlineExecutor()
+
+        indexed = flagged = 0
+        with executor:
+            for owner_id in owner_ids:
+                unindexed = (
+                    leads.filter(owner_id=owner_id, jd_signature__isnull=True)
+                    .order_by("pk")
+                    .values_list("pk", "jd_text")
+                )
+                last_pk = 0
+                exhausted = False
+                pending = deque()
+                while True:
+                    # Read ahead by id so batches are hashed while earlier ones are written.
+                    while not exhausted and len(pending) < options["workers"] * 2:
+                        batch = list(unindexed.filter(pk__gt=last_pk)[: options["batch_size"]])
+                        exhausted = len(batch) < options["batch_size"]
+                        if batch:
+                            last_pk = batch[-1][0]
+                            pending.append(executor.submit(compute_signatures, batch))
+                    if not pending:
+                        break
+                    signatures = pending.popleft().result()
+                    flagged += index_signatures(owner_id, signatures)
+                    indexed += len(signatures)
+
+        self.stdout.write(f"Indexed {indexed} leads; flagged {flagged} possible duplicates.")
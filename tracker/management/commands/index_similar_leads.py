@@ -0,0 +1,34 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Exists, OuterRef
+
+from tracker.models import JobLead, LeadTerm, LeadTermCount
+from tracker.similar_leads import index_owner_leads
+
+
+class Command(BaseCommand):
+    help = "Build the TF-IDF index behind the similar-leads panel."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only index this username's leads.")
+        parser.add_argument("--rebuild", action="store_true", help="Reweight every lead, not just unindexed ones.")
+        parser.add_argument("--batch-size", type=int, default=500)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        leads = JobLead.objects.filter(owner__isnull=False)
+        if options.get("user"):
+            leads = leads.filter(owner__username=options["user"])
+        if options["rebuild"]:
+            owner_ids = set(leads.values_list("owner_id", flat=True).distinct())
+            LeadTerm.objects.filter(owner_id__in=owner_ids).delete()
+            LeadTermCount.objects.filter(owner_id__in=owner_ids).delete()
+        unindexed = leads.filter(~Exists(LeadTerm.objects.filter(lead=OuterRef("pk"))))
+        owner_ids = list(unindexed.values_list("owner_id", flat=True).distinct())
+
+        indexed = 0
+        for owner_id in owner_ids:
+            indexed += index_owner_leads(owner_id, unindexed.filter(owner_id=owner_id), options["batch_size"])
+
+        self.stdout.write(f"Indexed {indexed} leads for similarity search.")
@@ -0,0 +1,47 @@
+import os
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.email_alerts import DEFAULT_BATCH_SIZE, ingest_mailbox
+
+
+class Command(BaseCommand):
+    help = "Create leads from job-alert emails in an mbox file or Maildir directory."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="mbox file or Maildir directory.")
+        parser.add_argument("--user", required=True, help="Username that will own the leads.")
+        parser.add_argument(
+            "--batch-size",
+            type=int,
+            default=DEFAULT_BATCH_SIZE,
+            help="Messages checked against the ledger and committed together.",
+        )
+
+    def handle(self, *args, **options):
+        try:
+            owner = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"Unknown user '{options['user']}'.") from exc
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+        if not os.path.exists(options["path"]):
+            raise CommandError(f"No such mailbox: {options['path']}")
+
+        try:
+            summary = ingest_mailbox(options["path"], owner, batch_size=options["batch_size"])
+        except OSError as exc:
+            raise CommandError(str(exc)) from exc
+
+        for error in summary.errors:
+            details = "; ".join(
+                f"{field}: {' '.join(messages)}" if field != "__all__" else " ".join(messages)
+                for field, messages in error["errors"].items()
+            )
+            self.stderr.write(f"Lead {error['row']}: {details}")
+        self.stdout.write(
+            f"Read {summary.messages} messages: {summary.skipped - summary.unreadable} already processed, "
+            f"{summary.processed} new ({summary.unmatched} without job links), {summary.unreadable} unreadable; "
+            f"created {summary.created} leads ({summary.duplicates} duplicates, {summary.rejected} rejected)."
+        )
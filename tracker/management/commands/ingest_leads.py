@@ -0,0 +1,60 @@
+import sys
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.ingest import DEFAULT_BATCH_SIZE, ingest_leads, iter_lead_records
+from tracker.models import JobLead
+
+
+class Command(BaseCommand):
+    help = "Bulk-import job leads from an NDJSON or JSON-array file ('-' for stdin)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("path", help="File to read, or '-' for stdin.")
+        parser.add_argument("--user", required=True, help="Username that will own the leads.")
+        parser.add_argument(
+            "--source",
+            default=JobLead.Source.MANUAL,
+            choices=JobLead.Source.values,
+            help="Source for rows that do not set one.",
+        )
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        try:
+            owner = get_user_model().objects.get(username=options["user"])
+        except get_user_model().DoesNotExist as exc:
+            raise CommandError(f"Unknown user '{options['user']}'.") from exc
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        if options["path"] == "-":
+            result = self._ingest(sys.stdin.buffer, owner, options)
+        else:
+            try:
+                with open(options["path"], "rb") as stream:
+                    result = self._ingest(stream, owner, options)
+            except OSError as exc:
+                raise CommandError(str(exc)) from exc
+
+        for error in result.errors:
+            details = "; ".join(
+                f"{field}: {' '.join(messages)}" if field != "__all__" else " ".join(messages)
+                for field, messages in error["errors"].items()
+            )
+            self.stderr.write(f"Row {error['row']}: {details}")
+        if result.failed > len(result.errors):
+            self.stderr.write(f"... {result.failed - len(result.errors)} more rows failed.")
+        self.stdout.write(
+            f"Created {result.created} leads; {result.failed} rows failed. "
+            f"Skipped {result.duplicates} duplicates."
+        )
+
+    def _ingest(self, stream, owner, options):
+        return ingest_leads(
+            iter_lead_records(stream),
+            owner,
+            default_source=options["source"],
+            batch_size=options["batch_size"],
+        )
@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.feeds import DEFAULT_TIMEOUT, DEFAULT_WORKERS, poll_feeds
+from tracker.models import FeedSubscription
+
+
+class Command(BaseCommand):
+    help = "Poll active RSS/Atom feed subscriptions and add new entries as leads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only poll this username's feeds.")
+        parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="Concurrent fetches.")
+        parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="Per-feed timeout in seconds.")
+
+    def handle(self, *args, **options):
+        if options["workers"] < 1:
+            raise CommandError("--workers must be at least 1.")
+
+        subscriptions = FeedSubscription.objects.select_related("owner").filter(is_active=True)
+        if options.get("user"):
+            subscriptions = subscriptions.filter(owner__username=options["user"])
+
+        summary = poll_feeds(list(subscriptions), workers=options["workers"], timeout=options["timeout"])
+
+        for subscription, error in summary.errors:
+            self.stderr.write(f"{subscription.url}: {error}")
+        self.stdout.write(
+            f"Polled {summary.feeds} feeds: {summary.updated} updated, "
+            f"{summary.not_modified} not modified, {summary.failed} failed; "
+            f"created {summary.created} leads ({summary.duplicates} duplicates, {summary.rejected} entries rejected)."
+        )
@@ -0,0 +1,39 @@
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from tracker.counters import refresh_pipeline_counters
+from tracker.fragments import bump_data_version
+from tracker.models import Application, PipelineCounters
+
+
+class Command(BaseCommand):
+    help = "Recompute every user's pipeline badge counters (run nightly)."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only reconcile this username.")
+
+    def handle(self, *args, **options):
+        today = timezone.localdate()
+        users = get_user_model().objects.filter(
+            Exists(Application.objects.filter(owner=OuterRef("pk")))
+            | Exists(PipelineCounters.objects.filter(owner=OuterRef("pk")))
+        )
+        if options.get("user"):
+            users = users.filter(username=options["user"])
+
+        reconciled = corrected = 0
+        for user_id in users.order_by("pk").values_list("pk", flat=True).iterator():
+            with transaction.atomic():
+                counters, _ = PipelineCounters.objects.select_for_update().get_or_create(owner_id=user_id)
+                before = counters.as_counters()
+                refresh_pipeline_counters(user_id, today=today, counters=counters)
+            reconciled += 1
+            # A new day legitimately moves due/overdue; only status drift is a bug.
+            if before["by_status"] != counters.as_counters()["by_status"]:
+                corrected += 1
+                bump_data_version(user_id)
+
+        self.stdout.write(f"Reconciled {reconciled} users ({corrected} with drifted status counts).")
@@ -0,0 +1,36 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.http import QueryDict
+
+from tracker.exports import claim_export_job, fail_stale_export_jobs, prune_export_files, run_export_job
+from tracker.models import ExportJob
+from tracker.views import ApplicationListView
+
+
+class Command(BaseCommand):
+    help = "Write pending background exports to disk."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-jobs", type=int, default=None, help="Stop after this many jobs.")
+
+    def handle(self, *args, **options):
+        if options["max_jobs"] is not None and options["max_jobs"] < 1:
+            raise CommandError("--max-jobs must be at least 1.")
+
+        for job in fail_stale_export_jobs():
+            self.stderr.write(f"Export {job.pk} was left running by a stopped worker; marked failed.")
+        pruned = prune_export_files()
+
+        done = failed = 0
+        while options["max_jobs"] is None or done + failed < options["max_jobs"]:
+            job = claim_export_job()
+            if job is None:
+                break
+            applications = ApplicationListView.queryset_for(job.owner, QueryDict(job.query))
+            run_export_job(job, applications)
+            if job.status == ExportJob.Status.FAILED:
+                failed += 1
+                self.stderr.write(f"Export {job.pk} failed: {job.error}")
+            else:
+                done += 1
+
+        self.stdout.write(f"Finished {done} exports ({failed} failed); removed {pruned} expired files.")
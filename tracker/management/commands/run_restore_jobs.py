@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.backups import fail_stale_restore_jobs, run_restore_job
+from tracker.exports import claim_job
+from tracker.models import RestoreJob
+
+
+class Command(BaseCommand):
+    help = "Restore queued account archives."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--max-jobs", type=int, default=None, help="Stop after this many jobs.")
+
+    def handle(self, *args, **options):
+        if options["max_jobs"] is not None and options["max_jobs"] < 1:
+            raise CommandError("--max-jobs must be at least 1.")
+
+        for job in fail_stale_restore_jobs():
+            self.stderr.write(f"Restore {job.pk} was left running by a stopped worker; marked failed.")
+
+        done = failed = 0
+        while options["max_jobs"] is None or done + failed < options["max_jobs"]:
+            job = claim_job(RestoreJob)
+            if job is None:
+                break
+            run_restore_job(job)
+            if job.status == RestoreJob.Status.FAILED:
+                failed += 1
+                self.stderr.write(f"Restore {job.pk} failed: {job.error}")
+            else:
+                done += 1
+
+        self.stdout.write(f"Finished {done} restores ({failed} failed).")
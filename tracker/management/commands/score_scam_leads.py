@@ -0,0 +1,31 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from tracker.models import JobLead
+from tracker.scam import DEFAULT_BATCH_SIZE, rescore_leads, scam_threshold
+
+
+class Command(BaseCommand):
+    help = "Re-score leads for scam signals; hand-reviewed leads are left alone."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--user", help="Only score this username's leads.")
+        parser.add_argument("--unscored", action="store_true", help="Only score leads that were never scored.")
+        parser.add_argument("--threshold", type=int, help="Override TRACKER_SCAM_THRESHOLD for this run.")
+        parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be at least 1.")
+
+        leads = JobLead.objects.all()
+        if options.get("user"):
+            leads = leads.filter(owner__username=options["user"])
+        if options["unscored"]:
+            leads = leads.filter(scam_score__isnull=True)
+        threshold = options["threshold"] if options["threshold"] is not None else scam_threshold()
+
+        scored, changed, flagged = rescore_leads(leads, batch_size=options["batch_size"], threshold=threshold)
+
+        self.stdout.write(
+            f"Scored {scored} leads (threshold {threshold}): {flagged} suspected, {changed} updated."
+        )
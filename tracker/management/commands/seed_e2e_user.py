@@ -3,6 +3,7 @@ import os
 from django.contrib.auth import get_user_model
 from django.core.management.base import BaseCommand, CommandError
 
+from tracker.counters import pipeline_write
 from tracker.models import Application, JobLead
 
 
@@ -43,11 +44,12 @@ class Command(BaseCommand):
             },
         )
 
-        Application.objects.get_or_create(
-            owner=user,
-            job=job,
-            defaults={"status": Application.Status.APPLIED},
-        )
+        with pipeline_write(user.pk):
+            Application.objects.get_or_create(
+                owner=user,
+                job=job,
+                defaults={"status": Application.Status.APPLIED},
+            )
 
         action = "Created" if created else "Updated"
         self.stdout.write(
@@ -0,0 +1,92 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:14
+
+import django.contrib.postgres.search
+from django.db import migrations
+
+# Triggers keep the vectors current on every insert/update of the indexed
+# columns; GIN indexes make `@@` lookups index scans. Postgres only.
+POSTGRES_FORWARD_SQL = [
+    """
+    CREATE OR REPLACE FUNCTION tracker_joblead_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.company, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.location, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.notes, '')), 'C') ||
+            setweight(to_tsvector('english', left(coalesce(NEW.jd_text, ''), 100000)), 'D');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tracker_joblead_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF title, company, location, notes, jd_text
+    ON tracker_joblead
+    FOR EACH ROW EXECUTE FUNCTION tracker_joblead_search_vector_update();
+    """,
+    """
+    CREATE OR REPLACE FUNCTION tracker_application_search_vector_update() RETURNS trigger AS $$
+    BEGIN
+        NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.location_text, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce(NEW.notes, '')), 'C');
+        RETURN NEW;
+    END
+    $$ LANGUAGE plpgsql;
+    """,
+    """
+    CREATE TRIGGER tracker_application_search_vector_trigger
+    BEFORE INSERT OR UPDATE OF location_text, notes
+    ON tracker_application
+    FOR EACH ROW EXECUTE FUNCTION tracker_application_search_vector_update();
+    """,
+    "UPDATE tracker_joblead SET title = title;",
+    "UPDATE tracker_application SET notes = notes;",
+    "CREATE INDEX tracker_joblead_search_gin ON tracker_joblead USING gin (search_vector);",
+    "CREATE INDEX tracker_application_search_gin ON tracker_application USING gin (search_vector);",
+]
+
+POSTGRES_REVERSE_SQL = [
+    "DROP INDEX IF EXISTS tracker_application_search_gin;",
+    "DROP INDEX IF EXISTS tracker_joblead_search_gin;",
+    "DROP TRIGGER IF EXISTS tracker_application_search_vector_trigger ON tracker_application;",
+    "DROP FUNCTION IF EXISTS tracker_application_search_vector_update();",
+    "DROP TRIGGER IF EXISTS tracker_joblead_search_vector_trigger ON tracker_joblead;",
+    "DROP FUNCTION IF EXISTS tracker_joblead_search_vector_update();",
+]
+
+
+def install_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in POSTGRES_FORWARD_SQL:
+        schema_editor.execute(statement)
+
+
+def remove_search_triggers(apps, schema_editor):
+    if schema_editor.connection.vendor != "postgresql":
+        return
+    for statement in POSTGRES_REVERSE_SQL:
+        schema_editor.execute(statement)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0005_joblead_archived_at_joblead_is_archived_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='application',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblead',
+            name='search_vector',
+            field=django.contrib.postgres.search.SearchVectorField(editable=False, null=True),
+        ),
+        migrations.RunPython(install_search_triggers, remove_search_triggers),
+    ]
@@ -0,0 +1,52 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:19
+
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0006_search_vectors'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='application',
+            index=models.Index(fields=['owner', '-updated_at', 'id'], name='app_owner_updated_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='application',
+            index=models.Index(fields=['owner', 'status', '-updated_at'], name='app_owner_status_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='application',
+            index=models.Index(condition=models.Q(('status__in', ['ACCEPTED', 'REJECTED']), _negated=True), fields=['owner', 'follow_up_on', 'status'], name='app_owner_followup_open_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='followup',
+            index=models.Index(condition=models.Q(('is_completed', False)), fields=['application', 'due_on'], name='followup_open_due_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['owner', '-discovered_at', '-updated_at'], name='lead_owner_active_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(fields=['owner', 'is_archived', '-discovered_at'], name='lead_owner_archived_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(fields=['owner', 'source'], name='lead_owner_source_idx'),
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(fields=['owner', 'work_mode'], name='lead_owner_work_mode_idx'),
+        ),
+    ]
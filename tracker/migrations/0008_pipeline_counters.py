@@ -0,0 +1,31 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:27
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tracker', '0007_index_pack'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PipelineCounters',
+            fields=[
+                ('owner', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='pipeline_counters', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('total', models.PositiveIntegerField(default=0)),
+                ('by_status', models.JSONField(default=dict)),
+                ('due_today', models.PositiveIntegerField(default=0)),
+                ('overdue', models.PositiveIntegerField(default=0)),
+                ('followups_today', models.PositiveIntegerField(default=0)),
+                ('followups_overdue', models.PositiveIntegerField(default=0)),
+                ('followups_week', models.PositiveIntegerField(default=0)),
+                ('computed_on', models.DateField(blank=True, null=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
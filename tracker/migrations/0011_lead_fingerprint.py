@@ -0,0 +1,95 @@
+# Generated by Django 5.1.15 on 2026-10-18 06:55
+
+import hashlib
+import re
+import unicodedata
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres
+
+# A frozen copy of ``tracker.fingerprints`` as of this migration, so later
+# changes to the live rules cannot change what this backfill writes.
+TRACKING_PARAMS = re.compile(
+    r"^(utm_|trk|ref$|refid$|trackingid$|lipi$|midtoken$|midsig$|eid$|from$|gclid$|fbclid$|"
+    r"mc_[ce]id$|gh_src$|lever-source|src$)",
+    re.IGNORECASE,
+)
+COMPANY_SUFFIXES = re.compile(
+    r"(\s+(inc|llc|ltd|limited|gmbh|plc|corp|corporation|co|pvt|private|sa|ag|bv))+$"
+)
+
+
+def canonical_url(url):
+    url = (url or "").strip()
+    if not url:
+        return ""
+    try:
+        parts = urlsplit(url)
+        port = parts.port
+    except ValueError:
+        return url
+    host = (parts.hostname or "").lower().removeprefix("www.")
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+    path = re.sub(r"/{2,}", "/", parts.path).rstrip("/")
+    query = sorted(
+        (key, value)
+        for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if not TRACKING_PARAMS.match(key)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+
+def normalize_text(value):
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", value).split())
+
+
+def lead_fingerprint(job_url="", company="", title="", location=""):
+    url = canonical_url(job_url)
+    if url:
+        key = f"url:{url}"
+    else:
+        company = COMPANY_SUFFIXES.sub("", normalize_text(company))
+        key = f"lead:{company}|{normalize_text(title)}|{normalize_text(location)}"
+    return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+
+def backfill_fingerprints(apps, schema_editor):
+    JobLead = apps.get_model("tracker", "JobLead")
+    batch = []
+    for lead in JobLead.objects.only("job_url", "company", "title", "location").iterator(chunk_size=2000):
+        lead.fingerprint = lead_fingerprint(lead.job_url, lead.company, lead.title, lead.location)
+        batch.append(lead)
+        if len(batch) >= 2000:
+            JobLead.objects.bulk_update(batch, ["fingerprint"])
+            batch = []
+    JobLead.objects.bulk_update(batch, ["fingerprint"])
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction; the backfill
+    # still runs in one.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0010_processed_emails'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblead',
+            name='fingerprint',
+            field=models.CharField(blank=True, editable=False, max_length=64),
+        ),
+        migrations.RunPython(backfill_fingerprints, migrations.RunPython.noop, atomic=True),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(fields=['owner', 'fingerprint'], name='lead_owner_fingerprint_idx'),
+        ),
+    ]
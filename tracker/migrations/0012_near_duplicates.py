@@ -0,0 +1,49 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:00
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0011_lead_fingerprint'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblead',
+            name='jd_signature',
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name='joblead',
+            name='near_duplicate_of',
+            field=models.ForeignKey(blank=True, editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='near_duplicates', to='tracker.joblead'),
+        ),
+        migrations.AddField(
+            model_name='joblead',
+            name='near_duplicate_score',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.CreateModel(
+            name='LeadSignatureBand',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('key', models.BigIntegerField()),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='signature_bands', to='tracker.joblead')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='leadsignatureband',
+            index=models.Index(fields=['owner', 'key'], name='lead_band_owner_key_idx'),
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tracker', '0012_near_duplicates'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblead',
+            name='scam_reviewed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='joblead',
+            name='scam_score',
+            field=models.PositiveSmallIntegerField(blank=True, editable=False, null=True),
+        ),
+    ]
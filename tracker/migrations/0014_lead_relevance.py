@@ -0,0 +1,121 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:11
+
+import re
+import unicodedata
+
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres
+
+# A frozen copy of the scoring in ``tracker.relevance`` as of this migration,
+# so later changes to the live weights cannot change what this backfill writes.
+ROLE_WEIGHT = 40
+COMPANY_WEIGHT = 20
+LOCATION_WEIGHT = 15
+WORK_MODE_WEIGHT = 15
+SALARY_WEIGHT = 10
+WORK_MODE_FIT = {
+    ("REMOTE", "REMOTE"): 1.0,
+    ("REMOTE", "HYBRID"): 0.5,
+    ("HYBRID", "HYBRID"): 1.0,
+    ("HYBRID", "REMOTE"): 0.75,
+    ("HYBRID", "ONSITE"): 0.5,
+    ("ONSITE", "ONSITE"): 1.0,
+    ("ONSITE", "HYBRID"): 0.5,
+}
+UNKNOWN_WORK_MODE_FIT = 0.33
+ANNUAL_PAY = re.compile(r"[$€£₹]\s?(\d{2,3}(?:,\d{3})+|\d{2,3}(?:\.\d)?\s?k)\b", re.IGNORECASE)
+LIST_SEPARATORS = re.compile(r"[,;\n|]+")
+COMPANY_SUFFIXES = re.compile(
+    r"(\s+(inc|llc|ltd|limited|gmbh|plc|corp|corporation|co|pvt|private|sa|ag|bv))+$"
+)
+
+
+def normalize_text(value):
+    value = unicodedata.normalize("NFKC", value or "").casefold()
+    return " ".join(re.sub(r"[^\w]+", " ", value).split())
+
+
+def _entries(text):
+    return [entry for entry in (normalize_text(part) for part in LIST_SEPARATORS.split(text or "")) if entry]
+
+
+def _company_key(company):
+    return COMPANY_SUFFIXES.sub("", normalize_text(company))
+
+
+def _annual_amounts(text):
+    for match in ANNUAL_PAY.finditer(text or ""):
+        raw = match.group(1).lower().replace(",", "").replace(" ", "")
+        yield float(raw[:-1]) * 1000 if raw.endswith("k") else float(raw)
+
+
+class Targeting:
+    def __init__(self, profile):
+        self.roles = [set(role.split()) for role in _entries(profile.target_roles)]
+        self.companies = {_company_key(company) for company in _entries(profile.target_companies)}
+        self.locations = _entries(profile.preferred_locations)
+        self.remote_preference = profile.remote_preference or "ANY"
+        self.salary_min = profile.salary_expectation_min
+
+    def score_lead(self, lead):
+        total = 0.0
+        if self.roles:
+            title_words = set(normalize_text(lead.title).split())
+            total += ROLE_WEIGHT * max(len(role & title_words) / len(role) for role in self.roles)
+        if self.companies and _company_key(lead.company) in self.companies:
+            total += COMPANY_WEIGHT
+        if self.locations:
+            lead_location = f" {normalize_text(lead.location)} "
+            if any(f" {place} " in lead_location for place in self.locations):
+                total += LOCATION_WEIGHT
+        if self.remote_preference != "ANY":
+            fit = WORK_MODE_FIT.get((self.remote_preference, lead.work_mode))
+            total += WORK_MODE_WEIGHT * (UNKNOWN_WORK_MODE_FIT if lead.work_mode == "UNKNOWN" else fit or 0)
+        if self.salary_min and any(amount >= self.salary_min for amount in _annual_amounts(lead.jd_text)):
+            total += SALARY_WEIGHT
+        return min(100, round(total))
+
+
+def backfill_relevance(apps, schema_editor):
+    JobLead = apps.get_model("tracker", "JobLead")
+    UserProfile = apps.get_model("tracker", "UserProfile")
+    for profile in UserProfile.objects.iterator():
+        targeting = Targeting(profile)
+        batch = []
+        leads = JobLead.objects.filter(owner_id=profile.user_id).only(
+            "title", "company", "location", "work_mode", "jd_text"
+        )
+        for lead in leads.iterator(chunk_size=2000):
+            lead.relevance_score = targeting.score_lead(lead)
+            batch.append(lead)
+            if len(batch) >= 2000:
+                JobLead.objects.bulk_update(batch, ["relevance_score"])
+                batch = []
+        JobLead.objects.bulk_update(batch, ["relevance_score"])
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction; the backfill
+    # still runs in one.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0013_scam_scoring'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='joblead',
+            name='relevance_score',
+            field=models.PositiveSmallIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(backfill_relevance, migrations.RunPython.noop, atomic=True),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['owner', '-relevance_score', '-discovered_at'], name='lead_owner_relevance_idx'),
+        ),
+    ]
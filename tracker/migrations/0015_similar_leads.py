@@ -0,0 +1,47 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:18
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0014_lead_relevance'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='LeadTerm',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.BigIntegerField()),
+                ('weight', models.FloatField()),
+                ('lead', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='terms', to='tracker.joblead')),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='leadterm',
+            index=models.Index(fields=['owner', 'term'], name='lead_term_owner_term_idx'),
+        ),
+        migrations.CreateModel(
+            name='LeadTermCount',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.BigIntegerField()),
+                ('leads', models.IntegerField(default=0)),
+                ('owner', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='+', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('owner', 'term'), name='lead_term_count_owner_term_unique')],
+            },
+        ),
+    ]
@@ -0,0 +1,61 @@
+# Generated by Django 5.1.15 on 2026-10-18 07:39
+
+from django.conf import settings
+from django.db import migrations, models
+
+from ._operations import AddIndexConcurrentlyOnPostgres, RemoveIndexConcurrentlyOnPostgres
+
+
+class Migration(migrations.Migration):
+
+    # Concurrent index builds cannot run inside a transaction. Each wider
+    # index is built under a temporary name before the one it replaces is
+    # dropped, so the inbox keeps an index to read throughout.
+    atomic = False
+
+    dependencies = [
+        ('tracker', '0015_similar_leads'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['owner', '-discovered_at', '-updated_at', 'id'], name='lead_owner_active_idx_new'),
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            name='lead_owner_active_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='joblead',
+            new_name='lead_owner_active_idx',
+            old_name='lead_owner_active_idx_new',
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(fields=['owner', 'is_archived', '-discovered_at', '-updated_at', 'id'], name='lead_owner_archived_idx_new'),
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            name='lead_owner_archived_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='joblead',
+            new_name='lead_owner_archived_idx',
+            old_name='lead_owner_archived_idx_new',
+        ),
+        AddIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            index=models.Index(condition=models.Q(('is_archived', False)), fields=['owner', '-relevance_score', '-discovered_at', '-updated_at', 'id'], name='lead_owner_relevance_idx_new'),
+        ),
+        RemoveIndexConcurrentlyOnPostgres(
+            model_name='joblead',
+            name='lead_owner_relevance_idx',
+        ),
+        migrations.RenameIndex(
+            model_name='joblead',
+            new_name='lead_owner_relevance_idx',
+            old_name='lead_owner_relevance_idx_new',
+        ),
+    ]
@@ -1,11 +1,16 @@
 from datetime import time
 
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
 from django.db import models
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save
 from django.dispatch import receiver
 from django.utils import timezone
 
+from .fingerprints import FINGERPRINT_FIELDS, lead_fingerprint
+from .fragments import bulk_written, bump_data_version
+from .relevance import RELEVANCE_FIELDS, TARGETING_FIELDS, Targeting
+
 
 class JobLead(models.Model):
     class WorkMode(models.TextChoices):
@@ -33,6 +38,11 @@ class JobLead(models.Model):
 
     is_scam_suspected = models.BooleanField(default=False)
     scam_reasons = models.TextField(blank=True)
+    # 0-100 fit against the owner's profile targeting; see relevance.py.
+    relevance_score = models.PositiveSmallIntegerField(default=0, editable=False)
+    # Set by scam.py; null until scored. Hand-reviewed leads are not re-scored.
+    scam_score = models.PositiveSmallIntegerField(null=True, blank=True, editable=False)
+    scam_reviewed = models.BooleanField(default=False, editable=False)
     is_archived = models.BooleanField(default=False)
     archived_at = models.DateTimeField(null=True, blank=True)
 
@@ -46,12 +56,113 @@ class JobLead(models.Model):
 
     discovered_at = models.DateTimeField(default=timezone.now)
 
+    # Canonical job URL or normalised company/title/location; see fingerprints.py.
+    fingerprint = models.CharField(max_length=64, blank=True, editable=False)
+
+    # MinHash of jd_text (empty when too short) and the older lead it most
+    # resembles; maintained by near_duplicates.py.
+    jd_signature = models.BinaryField(null=True, blank=True, editable=False)
+    near_duplicate_of = models.ForeignKey(
+        "self",
+        on_delete=models.SET_NULL,
+        related_name="near_duplicates",
+        null=True,
+        blank=True,
+        editable=False,
+    )
+    near_duplicate_score = models.FloatField(null=True, blank=True, editable=False)
+
+    # Maintained by a Postgres trigger; unused on other databases.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
     def __str__(self) -> str:
         return f"{self.company} - {self.title}"
 
+    def refresh_fingerprint(self):
+        """Recompute ``fingerprint``; ``bulk_create`` callers must call this themselves."""
+
+        self.fingerprint = lead_fingerprint(self.job_url, self.company, self.title, self.location)
+        return self.fingerprint
+
+    def refresh_relevance(self, targeting=None):
+        """Recompute ``relevance_score``, loading the owner's profile unless ``targeting`` is given."""
+
+        if targeting is None:
+            if self.owner_id is None:
+                profile = None
+            elif JobLead.owner.is_cached(self):
+                profile = getattr(self.owner, "profile", None)
+            else:
+                profile = UserProfile.objects.filter(user_id=self.owner_id).first()
+            targeting = Targeting(profile)
+        self.relevance_score = targeting.score_lead(self)
+        return self.relevance_score
+
+    def save(self, *args, **kwargs):
+        self.refresh_fingerprint()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is None or RELEVANCE_FIELDS.intersection(update_fields):
+            self.refresh_relevance()
+        if update_fields is not None:
+            extra = set()
+            if FINGERPRINT_FIELDS.intersection(update_fields):
+                extra.add("fingerprint")
+            if RELEVANCE_FIELDS.intersection(update_fields):
+                extra.add("relevance_score")
+            kwargs["update_fields"] = {*update_fields, *extra}
+        super().save(*args, **kwargs)
+
+    def fill_blanks(self, **values):
+        """Copy ``values`` onto fields that are still empty and save those fields."""
+
+        changed = [field for field, value in values.items() if value and not getattr(self, field)]
+        for field in changed:
+            setattr(self, field, values[field])
+        if changed:
+            self.save(update_fields=[*changed, "updated_at"])
+        return changed
+
+    @classmethod
+    def find_duplicate(cls, owner, fingerprint):
+        """Return ``owner``'s lead with ``fingerprint``, or ``None``.
+
+        The lead carries ``owner_application_id``, the owner's application on
+        it if there is one, so callers can merge or reject in a single query.
+        """
+
+        applications = Application.objects.filter(job=models.OuterRef("pk"), owner=owner)
+        return (
+            cls.objects.filter(owner=owner, fingerprint=fingerprint)
+            .annotate(owner_application_id=models.Subquery(applications.values("pk")[:1]))
+            .order_by("pk")
+            .first()
+        )
+
+    class Meta:
+        indexes = [
+            # Both cover the inbox's keyset order, id included, for either archive side.
+            models.Index(
+                fields=["owner", "-discovered_at", "-updated_at", "id"],
+                condition=models.Q(is_archived=False),
+                name="lead_owner_active_idx",
+            ),
+            models.Index(
+                fields=["owner", "is_archived", "-discovered_at", "-updated_at", "id"],
+                name="lead_owner_archived_idx",
+            ),
+            models.Index(fields=["owner", "source"], name="lead_owner_source_idx"),
+            models.Index(fields=["owner", "work_mode"], name="lead_owner_work_mode_idx"),
+            models.Index(fields=["owner", "fingerprint"], name="lead_owner_fingerprint_idx"),
+            models.Index(
+                fields=["owner", "-relevance_score", "-discovered_at", "-updated_at", "id"],
+                condition=models.Q(is_archived=False),
+                name="lead_owner_relevance_idx",
+            ),
+        ]
+
 
 class Application(models.Model):
     class Status(models.TextChoices):
@@ -74,6 +185,9 @@ class Application(models.Model):
     compensation_text = models.CharField(max_length=200, blank=True)
     location_text = models.CharField(max_length=200, blank=True)
 
+    # Maintained by a Postgres trigger; unused on other databases.
+    search_vector = SearchVectorField(null=True, editable=False)
+
     owner = models.ForeignKey(
         settings.AUTH_USER_MODEL,
         on_delete=models.CASCADE,
@@ -93,6 +207,16 @@ class Application(models.Model):
                 name="unique_application_per_owner_job",
             ),
         ]
+        indexes = [
+            models.Index(fields=["owner", "-updated_at", "id"], name="app_owner_updated_idx"),
+            models.Index(fields=["owner", "status", "-updated_at"], name="app_owner_status_idx"),
+            # Follow-up badges and the inbox only look at open applications.
+            models.Index(
+                fields=["owner", "follow_up_on", "status"],
+                condition=~models.Q(status__in=["ACCEPTED", "REJECTED"]),
+                name="app_owner_followup_open_idx",
+            ),
+        ]
 
 
 class FollowUp(models.Model):
@@ -112,6 +236,274 @@ class FollowUp(models.Model):
     def __str__(self) -> str:
         return f"{self.application} ({self.due_on})"
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["application", "due_on"],
+                condition=models.Q(is_completed=False),
+                name="followup_open_due_idx",
+            ),
+        ]
+
+
+class PipelineCounters(models.Model):
+    """Per-user badge counts, kept current by the write paths.
+
+    Status counts only change on writes. The date-relative counts also go
+    stale at midnight, so ``computed_on`` records the day they were computed
+    for and readers recompute when it is not today.
+    """
+
+    owner = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="pipeline_counters",
+    )
+    total = models.PositiveIntegerField(default=0)
+    by_status = models.JSONField(default=dict)
+    due_today = models.PositiveIntegerField(default=0)
+    overdue = models.PositiveIntegerField(default=0)
+    followups_today = models.PositiveIntegerField(default=0)
+    followups_overdue = models.PositiveIntegerField(default=0)
+    followups_week = models.PositiveIntegerField(default=0)
+    computed_on = models.DateField(null=True, blank=True)
+
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Pipeline counters for {self.owner}"
+
+    def as_counters(self):
+        return {
+            "total": self.total,
+            "by_status": {code: self.by_status.get(code, 0) for code in Application.Status.values},
+            "due_today": self.due_today,
+            "overdue": self.overdue,
+            "followups": {
+                "today": self.followups_today,
+                "overdue": self.followups_overdue,
+                "week": self.followups_week,
+            },
+        }
+
+    def apply(self, counters, computed_on):
+        """Copy an ``application_counters`` result onto this row."""
+
+        self.total = counters["total"]
+        self.by_status = counters["by_status"]
+        self.due_today = counters["due_today"]
+        self.overdue = counters["overdue"]
+        self.followups_today = counters["followups"]["today"]
+        self.followups_overdue = counters["followups"]["overdue"]
+        self.followups_week = counters["followups"]["week"]
+        self.computed_on = computed_on
+
+
+class FeedSubscription(models.Model):
+    """An RSS/Atom feed polled into the owner's lead inbox."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="feed_subscriptions",
+    )
+    url = models.URLField(max_length=500)
+    title = models.CharField(max_length=200, blank=True)
+    is_active = models.BooleanField(default=True)
+
+    # Validators from the last 200 response, replayed as conditional headers.
+    etag = models.CharField(max_length=255, blank=True)
+    last_modified = models.CharField(max_length=64, blank=True)
+
+    last_polled_at = models.DateTimeField(null=True, blank=True)
+    last_status = models.PositiveSmallIntegerField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return self.title or self.url
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "url"], name="unique_feed_per_owner"),
+        ]
+
+
+class FeedEntry(models.Model):
+    """Marks a feed item as already ingested, by a hash of its GUID or link."""
+
+    subscription = models.ForeignKey(
+        FeedSubscription,
+        on_delete=models.CASCADE,
+        related_name="entries",
+    )
+    guid_hash = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["subscription", "guid_hash"],
+                name="unique_feed_entry_per_subscription",
+            ),
+        ]
+
+
+class LeadSignatureBand(models.Model):
+    """One locality-sensitive hashing bucket of a lead's ``jd_signature``."""
+
+    lead = models.ForeignKey(JobLead, on_delete=models.CASCADE, related_name="signature_bands")
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    key = models.BigIntegerField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "key"], name="lead_band_owner_key_idx"),
+        ]
+
+
+class LeadTerm(models.Model):
+    """One weighted term of a lead's TF-IDF vector; maintained by similar_leads.py."""
+
+    lead = models.ForeignKey(JobLead, on_delete=models.CASCADE, related_name="terms")
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    term = models.BigIntegerField()
+    weight = models.FloatField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["owner", "term"], name="lead_term_owner_term_idx"),
+        ]
+
+
+class LeadTermCount(models.Model):
+    """How many of an owner's leads contain a term (its document frequency)."""
+
+    owner = models.ForeignKey(settings.AUTH_USER_MODEL, on_delete=models.CASCADE, related_name="+")
+    term = models.BigIntegerField()
+    leads = models.IntegerField(default=0)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["owner", "term"], name="lead_term_count_owner_term_unique"),
+        ]
+
+
+class ExportJob(models.Model):
+    """An application export written to disk by ``run_export_jobs``.
+
+    ``query`` holds the list view's filters (urlencoded) so the worker
+    exports the same rows the user was looking at.
+    """
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        DONE = "DONE", "Done"
+        FAILED = "FAILED", "Failed"
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="export_jobs",
+    )
+    query = models.TextField(blank=True)
+    export_format = models.CharField(max_length=10, default="csv")
+    columns = models.JSONField(default=list)
+    compress = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    rows_total = models.PositiveIntegerField(null=True, blank=True)
+    rows_written = models.PositiveIntegerField(default=0)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    file_path = models.CharField(max_length=500, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Export {self.pk} ({self.status})"
+
+    @property
+    def filename(self):
+        suffix = ".gz" if self.compress else ""
+        return f"applications-{self.pk}.{self.export_format}{suffix}"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                name="export_job_pending_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
+
+
+class RestoreJob(models.Model):
+    """An uploaded account archive restored by ``run_restore_jobs``.
+
+    The archive is spooled to ``file_path`` by the request and removed once
+    the restore has run.
+    """
+
+    Status = ExportJob.Status
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="restore_jobs",
+    )
+    replace = models.BooleanField(default=False)
+
+    status = models.CharField(max_length=10, choices=Status.choices, default=Status.PENDING)
+    size_bytes = models.PositiveBigIntegerField(default=0)
+    file_path = models.CharField(max_length=500, blank=True)
+    restored = models.JSONField(default=dict, blank=True)
+    error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self) -> str:
+        return f"Restore {self.pk} ({self.status})"
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["created_at"],
+                name="restore_job_pending_idx",
+                condition=models.Q(status="PENDING"),
+            ),
+        ]
+
+
+class ProcessedEmail(models.Model):
+    """Marks an alert email as already ingested, by a hash of its Message-ID."""
+
+    owner = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name="processed_emails",
+    )
+    message_hash = models.CharField(max_length=64)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["owner", "message_hash"],
+                name="unique_processed_email_per_owner",
+            ),
+        ]
+
 
 class UserProfile(models.Model):
     class RemotePreference(models.TextChoices):
@@ -182,8 +574,91 @@ class UserProfile(models.Model):
     def __str__(self) -> str:
         return f"{self.user}"
 
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        instance._loaded_targeting = instance.targeting_values()
+        return instance
+
+    def targeting_values(self):
+        """The targeting fields that are loaded, by name.
+
+        Read from ``__dict__`` so deferred fields are left alone: touching one
+        would load it through ``refresh_from_db`` and so ``from_db`` again.
+        """
+
+        return {field: self.__dict__[field] for field in TARGETING_FIELDS if field in self.__dict__}
+
+    def refresh_from_db(self, using=None, fields=None, from_queryset=None):
+        super().refresh_from_db(using=using, fields=fields, from_queryset=from_queryset)
+        if hasattr(self, "_loaded_targeting"):
+            self._loaded_targeting.update(
+                (field, value) for field, value in self.targeting_values().items() if fields is None or field in fields
+            )
+
+    def save(self, *args, **kwargs):
+        super().save(*args, **kwargs)
+        loaded = getattr(self, "_loaded_targeting", None)
+        current = self.targeting_values()
+        update_fields = kwargs.get("update_fields")
+        if update_fields is not None:
+            current = {field: value for field, value in current.items() if field in update_fields}
+        # A field deferred when the row loaded and assigned since has no old
+        # value to compare, so it counts as changed.
+        if loaded is not None and any(field not in loaded or loaded[field] != value for field, value in current.items()):
+            rescore_relevance(self.user_id, Targeting(self))
+        self._loaded_targeting = {**(loaded or {}), **current}
+
+
+def rescore_relevance(owner_id, targeting, batch_size=1000):
+    """Re-score all of ``owner_id``'s leads against ``targeting``; returns rows changed."""
+
+    leads = (
+        JobLead.objects.filter(owner_id=owner_id)
+        .only("pk", "title", "company", "location", "work_mode", "jd_text", "relevance_score")
+        .order_by("pk")
+    )
+    changed = 0
+    last_pk = 0
+    while batch := list(leads.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1].pk
+        updates = [lead for lead in batch if lead.relevance_score != lead.refresh_relevance(targeting)]
+        if updates:
+            JobLead.objects.bulk_update(updates, ["relevance_score"])
+            changed += len(updates)
+    if changed:
+        bulk_written(owner_id)
+    return changed
+
 
 @receiver(post_save, sender=settings.AUTH_USER_MODEL)
 def create_profile_for_user(sender, instance, created, **kwargs):
     if created:
         UserProfile.objects.create(user=instance)
+
+
+@receiver([post_save, post_delete], sender=Application)
+@receiver([post_save, post_delete], sender=JobLead)
+def bump_owner_data_version(sender, instance, **kwargs):
+    bump_data_version(instance.owner_id)
+
+
+@receiver(post_save, sender=FollowUp)
+def bump_followup_owner_data_version(sender, instance, **kwargs):
+    try:
+        owner_id = instance.application.owner_id
+    except Application.DoesNotExist:
+        return
+    bump_data_version(owner_id)
+
+
+@receiver(post_delete, sender=FollowUp)
+def bump_deleted_followup_owner_data_version(sender, instance, origin=None, **kwargs):
+    # When an application or lead delete cascades here, its own receiver
+    # bumps the owner; looking the owner up per follow-up would cost a query
+    # (and a cache write) for every row.
+    origin_model = getattr(origin, "model", type(origin))
+    if origin_model in (Application, JobLead):
+        return
+    owner_id = Application.objects.filter(pk=instance.application_id).values_list("owner_id", flat=True).first()
+    bump_data_version(owner_id)
@@ -0,0 +1,210 @@
+"""Near-duplicate detection over job descriptions.
+
+Reposts rarely keep the same URL or title, but their ``jd_text`` barely
+changes. Each description is reduced to word 5-gram shingles and summarised
+by a 64-slot MinHash signature, computed with one-permutation hashing (each
+shingle is hashed once, not once per slot) and rotation densification for
+empty slots. The share of equal slots between two signatures estimates the
+Jaccard similarity of their shingle sets.
+
+For sub-linear lookups the signature is cut into 16 bands of 4 slots and
+each band is hashed to a bucket key stored in :class:`LeadSignatureBand`.
+Leads sharing a bucket are candidates; finding them for a batch of new
+leads is one indexed ``IN`` query on the owner's buckets, however many
+leads they already have. A lead whose best older candidate reaches
+``TRACKER_NEAR_DUPLICATE_THRESHOLD`` (default 0.7) is flagged with
+``near_duplicate_of``.
+"""
+
+import hashlib
+import struct
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .batching import LOOKUP_CHUNK, chunked
+from .fingerprints import normalize_text
+from .fragments import bulk_written
+from .models import JobLead, LeadSignatureBand
+
+SHINGLE_SIZE = 5
+SLOTS = 64
+BANDS = 16
+ROWS_PER_BAND = SLOTS // BANDS
+# Descriptions shorter than this many shingles get an empty signature.
+MIN_SHINGLES = 8
+DEFAULT_THRESHOLD = 0.7
+
+_EMPTY = (1 << 64) - 1
+_BORROW_STEP = _EMPTY // SLOTS + 1
+_SIGNATURE = struct.Struct(f">{SLOTS}Q")
+_BAND_BYTES = ROWS_PER_BAND * 8
+
+
+def near_duplicate_threshold():
+    return getattr(settings, "TRACKER_NEAR_DUPLICATE_THRESHOLD", DEFAULT_THRESHOLD)
+
+
+def shingles(text):
+    words = normalize_text(text).split()
+    return {" ".join(words[index : index + SHINGLE_SIZE]) for index in range(len(words) - SHINGLE_SIZE + 1)}
+
+
+def minhash(shingle_set):
+    """Packed signature bytes, or ``b""`` when there is too little text to compare."""
+
+    if len(shingle_set) < MIN_SHINGLES:
+        return b""
+    slots = [_EMPTY] * SLOTS
+    for shingle in shingle_set:
+        digest = int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "big")
+        slot, value = digest % SLOTS, digest // SLOTS
+        if value < slots[slot]:
+            slots[slot] = value
+
+    # An empty slot borrows the next filled slot's value, offset by the
+    # distance so borrowed and native values never collide.
+    dense = list(slots)
+    for index in range(SLOTS):
+        distance = 0
+        while slots[(index + distance) % SLOTS] == _EMPTY:
+            distance += 1
+        if distance:
+            dense[index] = slots[(index + distance) % SLOTS] + distance * _BORROW_STEP
+    return _SIGNATURE.pack(*dense)
+
+
+def signature_for_text(text):
+    return minhash(shingles(text))
+
+
+def compute_signatures(items):
+    """``[(lead_id, jd_text)]`` -> ``[(lead_id, signature)]``; no ORM, safe in worker processes."""
+
+    return [(lead_id, signature_for_text(text)) for lead_id, text in items]
+
+
+def similarity(first, second):
+    if not first or not second:
+        return 0.0
+    matches = sum(a == b for a, b in zip(_SIGNATURE.unpack(first), _SIGNATURE.unpack(second)))
+    return matches / SLOTS
+
+
+def band_keys(signature):
+    keys = []
+    for band in range(BANDS):
+        chunk = signature[band * _BAND_BYTES : (band + 1) * _BAND_BYTES]
+        digest = hashlib.blake2b(bytes([band]) + chunk, digest_size=8).digest()
+        keys.append(int.from_bytes(digest, "big", signed=True))
+    return keys
+
+
+def index_signatures(owner_id, items, threshold=None, new=False, touch=True):
+    """Store ``(lead_id, signature)`` pairs for one owner and flag near-duplicates.
+
+    A lead is only flagged against an older lead (lower id), so the first
+    copy of a posting stays unflagged. ``new`` says the leads were just
+    inserted with their signatures, so there are no old buckets to clear and
+    only flagged rows need an UPDATE. Otherwise the leads already flagged as
+    copies of these ones were judged on their old text, so they are checked
+    again. ``touch=False`` leaves ``updated_at`` alone (restored rows keep
+    their archived one). Returns the number of leads flagged.
+    """
+
+    threshold = near_duplicate_threshold() if threshold is None else threshold
+    flagged = _index_signatures(owner_id, items, threshold, new, touch)
+    if not new:
+        batch_ids = {lead_id for lead_id, _ in items}
+        dependents = []
+        for lead_ids in chunked(batch_ids):
+            rows = JobLead.objects.filter(owner_id=owner_id, near_duplicate_of_id__in=lead_ids)
+            dependents.extend(
+                (lead_id, bytes(signature or b""))
+                for lead_id, signature in rows.values_list("pk", "jd_signature")
+                if lead_id not in batch_ids
+            )
+        if dependents:
+            flagged += _index_signatures(owner_id, dependents, threshold, False, touch)
+    return flagged
+
+
+def _index_signatures(owner_id, items, threshold, new, touch):
+    items = sorted(items)
+    keys_by_lead = {lead_id: band_keys(signature) for lead_id, signature in items if signature}
+    if not items or (new and not keys_by_lead):
+        return 0
+    batch_ids = {lead_id for lead_id, _ in items}
+
+    buckets = defaultdict(set)
+    for keys in chunked({key for keys in keys_by_lead.values() for key in keys}):
+        for key, lead_id in LeadSignatureBand.objects.filter(owner_id=owner_id, key__in=keys).values_list(
+            "key", "lead_id"
+        ):
+            if lead_id not in batch_ids:
+                buckets[key].add(lead_id)
+    signatures = {}
+    for lead_ids in chunked({lead_id for members in buckets.values() for lead_id in members}):
+        for lead_id, signature in JobLead.objects.filter(pk__in=lead_ids).values_list("pk", "jd_signature"):
+            signatures[lead_id] = bytes(signature or b"")
+
+    now = timezone.now()
+    leads, bands = [], []
+    for lead_id, signature in items:
+        best_id, best_score = None, None
+        if signature:
+            candidates = set().union(*(buckets.get(key, ()) for key in keys_by_lead[lead_id]))
+            for candidate_id in sorted(candidates):
+                if candidate_id >= lead_id:
+                    continue
+                score = similarity(signature, signatures[candidate_id])
+                if score >= threshold and (best_score is None or score > best_score):
+                    best_id, best_score = candidate_id, score
+            for key in keys_by_lead[lead_id]:
+                buckets[key].add(lead_id)
+                bands.append(LeadSignatureBand(lead_id=lead_id, owner_id=owner_id, key=key))
+            signatures[lead_id] = signature
+        if best_id is not None or not new:
+            leads.append(
+                JobLead(
+                    pk=lead_id,
+                    jd_signature=signature,
+                    near_duplicate_of_id=best_id,
+                    near_duplicate_score=best_score,
+                    updated_at=now,
+                )
+            )
+
+    with transaction.atomic():
+        if not new:
+            for lead_ids in chunked(batch_ids):
+                LeadSignatureBand.objects.filter(lead_id__in=lead_ids).delete()
+        if leads:
+            fields = ["jd_signature", "near_duplicate_of", "near_duplicate_score"]
+            JobLead.objects.bulk_update(leads, [*fields, "updated_at"] if touch else fields, batch_size=500)
+        LeadSignatureBand.objects.bulk_create(bands, batch_size=LOOKUP_CHUNK)
+        bulk_written(owner_id)
+    return sum(lead.near_duplicate_of_id is not None for lead in leads)
+
+
+def index_leads(leads, threshold=None, new=False, touch=True):
+    """Check saved ``leads`` against their owners' leads and record their buckets.
+
+    With ``new``, each lead's ``jd_signature`` was set before it was inserted
+    (see :func:`signature_for_text`); otherwise signatures are computed here.
+    """
+
+    by_owner = defaultdict(list)
+    for lead in leads:
+        if lead.owner_id is None:
+            continue
+        if new and lead.jd_signature is not None:
+            by_owner[lead.owner_id].append((lead.pk, bytes(lead.jd_signature)))
+        else:
+            by_owner[lead.owner_id].append((lead.pk, signature_for_text(lead.jd_text)))
+    return sum(
+        index_signatures(owner_id, items, threshold=threshold, new=new, touch=touch)
+        for owner_id, items in by_owner.items()
+    )
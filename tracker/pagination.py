@@ -0,0 +1,151 @@
+"""Keyset (cursor) pagination for owner-scoped list views.
+
+Offset pagination makes page N scan and discard every row before it. A keyset
+cursor instead remembers the sort key of the last row served and asks the
+database for rows strictly after it, so every page costs the same.
+"""
+
+import base64
+import binascii
+import json
+
+from django.core.exceptions import ValidationError
+from django.db.models import F, Q
+
+
+class KeysetOrdering:
+    """An ordering that can resume after a given row.
+
+    ``keys`` is a sequence of ``(field_name, descending)`` pairs. Nullable
+    ascending keys sort nulls last, matching the list view's follow-up sort.
+    The last key must be unique (normally ``id``) so the order is total.
+    Keys that are annotations rather than model fields need an entry in
+    ``annotations`` mapping the name to a field instance for decoding.
+    """
+
+    def __init__(self, model, keys, annotations=None):
+        self.model = model
+        self.keys = tuple(keys)
+        self.annotations = annotations or {}
+
+    def _field(self, name):
+        if name in self.annotations:
+            return self.annotations[name]
+        return self.model._meta.get_field(name)
+
+    def _nullable(self, name):
+        return self._field(name).null
+
+    def order_by(self):
+        expressions = []
+        for name, descending in self.keys:
+            nulls_last = True if self._nullable(name) else None
+            if descending:
+                expressions.append(F(name).desc(nulls_last=nulls_last))
+            else:
+                expressions.append(F(name).asc(nulls_last=nulls_last))
+        return expressions
+
+    def values_for(self, obj):
+        return [getattr(obj, name) for name, _ in self.keys]
+
+    def encode(self, obj):
+        values = []
+        for value in self.values_for(obj):
+            values.append(value.isoformat() if hasattr(value, "isoformat") else value)
+        raw = json.dumps(values, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+    def decode(self, cursor):
+        """Return typed key values for ``cursor`` or ``None`` if it is malformed."""
+
+        if not cursor:
+            return None
+        padded = cursor + "=" * (-len(cursor) % 4)
+        try:
+            values = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        except (binascii.Error, ValueError, UnicodeError):
+            return None
+        if not isinstance(values, list) or len(values) != len(self.keys):
+            return None
+
+        typed = []
+        for (name, _), value in zip(self.keys, values):
+            if value is None:
+                typed.append(None)
+                continue
+            try:
+                typed.append(self._field(name).to_python(value))
+            except ValidationError:
+                return None
+        return typed
+
+    def _after_key(self, name, descending, value):
+        """Return (strictly_after, equal) predicates for a single key."""
+
+        if value is None:
+            # Nulls sort last in both directions, so nothing follows a null.
+            return None, Q(**{f"{name}__isnull": True})
+        lookup = "lt" if descending else "gt"
+        after = Q(**{f"{name}__{lookup}": value})
+        if self._nullable(name):
+            after |= Q(**{f"{name}__isnull": True})
+        return after, Q(**{name: value})
+
+    def after(self, values):
+        """Build the predicate selecting rows that sort after ``values``."""
+
+        predicate = None
+        for (name, descending), value in reversed(list(zip(self.keys, values))):
+            after, equal = self._after_key(name, descending, value)
+            if predicate is not None:
+                tail = equal & predicate
+                predicate = tail if after is None else after | tail
+            else:
+                predicate = after
+        return predicate
+
+
+class CursorPage:
+    """One page of a keyset-paginated queryset."""
+
+    def __init__(self, object_list, cursor, next_cursor):
+        self.object_list = object_list
+        self.cursor = cursor
+        self.next_cursor = next_cursor
+
+    @property
+    def has_next(self):
+        return bool(self.next_cursor)
+
+    @property
+    def has_previous(self):
+        return bool(self.cursor)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+
+def paginate_keyset(queryset, ordering, cursor, page_size):
+    """Return a :class:`CursorPage` of ``queryset`` ordered by ``ordering``.
+
+    Invalid cursors fall back to the first page rather than erroring, since
+    they normally come from stale bookmarks.
+    """
+
+    values = ordering.decode(cursor)
+    if values is None:
+        cursor = ""
+    else:
+        predicate = ordering.after(values)
+        queryset = queryset.filter(predicate) if predicate is not None else queryset.none()
+
+    rows = list(queryset.order_by(*ordering.order_by())[: page_size + 1])
+    next_cursor = ""
+    if len(rows) > page_size:
+        rows = rows[:page_size]
+        next_cursor = ordering.encode(rows[-1])
+    return CursorPage(rows, cursor, next_cursor)
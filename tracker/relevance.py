@@ -0,0 +1,94 @@
+"""Profile-aware relevance scores for job leads.
+
+A lead scores 0-100 against its owner's targeting: how much of a target
+role its title covers, whether the company is a target, whether its
+location and work mode fit, and whether pay mentioned in the description
+meets the salary expectation. The score is stored on the lead so the inbox
+can sort by it from an index; ``JobLead.save`` and bulk ingestion keep it
+current for changed leads, and a change to the profile's targeting fields
+re-scores that owner's leads.
+
+This module has no model imports so ``models`` can use it directly.
+"""
+
+import re
+
+from .fingerprints import COMPANY_SUFFIXES, normalize_text
+
+ROLE_WEIGHT = 40
+COMPANY_WEIGHT = 20
+LOCATION_WEIGHT = 15
+WORK_MODE_WEIGHT = 15
+SALARY_WEIGHT = 10
+
+# Lead fields that feed the score; saves touching none of them skip it.
+RELEVANCE_FIELDS = frozenset({"title", "company", "location", "work_mode", "jd_text"})
+TARGETING_FIELDS = (
+    "target_roles",
+    "target_companies",
+    "preferred_locations",
+    "remote_preference",
+    "salary_expectation_min",
+    "salary_expectation_max",
+)
+
+# Share of the work-mode weight for (preference, lead work mode) pairs.
+WORK_MODE_FIT = {
+    ("REMOTE", "REMOTE"): 1.0,
+    ("REMOTE", "HYBRID"): 0.5,
+    ("HYBRID", "HYBRID"): 1.0,
+    ("HYBRID", "REMOTE"): 0.75,
+    ("HYBRID", "ONSITE"): 0.5,
+    ("ONSITE", "ONSITE"): 1.0,
+    ("ONSITE", "HYBRID"): 0.5,
+}
+UNKNOWN_WORK_MODE_FIT = 0.33
+
+ANNUAL_PAY = re.compile(r"[$€£₹]\s?(\d{2,3}(?:,\d{3})+|\d{2,3}(?:\.\d)?\s?k)\b", re.IGNORECASE)
+LIST_SEPARATORS = re.compile(r"[,;\n|]+")
+
+
+def _entries(text):
+    return [entry for entry in (normalize_text(part) for part in LIST_SEPARATORS.split(text or "")) if entry]
+
+
+def _company_key(company):
+    return COMPANY_SUFFIXES.sub("", normalize_text(company))
+
+
+def _annual_amounts(text):
+    for match in ANNUAL_PAY.finditer(text or ""):
+        raw = match.group(1).lower().replace(",", "").replace(" ", "")
+        yield float(raw[:-1]) * 1000 if raw.endswith("k") else float(raw)
+
+
+class Targeting:
+    """The scoring-relevant parts of a profile, normalised once per batch."""
+
+    def __init__(self, profile=None):
+        self.roles = [set(role.split()) for role in _entries(getattr(profile, "target_roles", ""))]
+        self.companies = {_company_key(company) for company in _entries(getattr(profile, "target_companies", ""))}
+        self.locations = _entries(getattr(profile, "preferred_locations", ""))
+        self.remote_preference = getattr(profile, "remote_preference", "ANY") or "ANY"
+        self.salary_min = getattr(profile, "salary_expectation_min", None)
+
+    def score(self, title="", company="", location="", work_mode="", jd_text=""):
+        total = 0.0
+        if self.roles:
+            title_words = set(normalize_text(title).split())
+            total += ROLE_WEIGHT * max(len(role & title_words) / len(role) for role in self.roles)
+        if self.companies and _company_key(company) in self.companies:
+            total += COMPANY_WEIGHT
+        if self.locations:
+            lead_location = f" {normalize_text(location)} "
+            if any(f" {place} " in lead_location for place in self.locations):
+                total += LOCATION_WEIGHT
+        if self.remote_preference != "ANY":
+            fit = WORK_MODE_FIT.get((self.remote_preference, work_mode))
+            total += WORK_MODE_WEIGHT * (UNKNOWN_WORK_MODE_FIT if work_mode == "UNKNOWN" else fit or 0)
+        if self.salary_min and any(amount >= self.salary_min for amount in _annual_amounts(jd_text)):
+            total += SALARY_WEIGHT
+        return min(100, round(total))
+
+    def score_lead(self, lead):
+        return self.score(lead.title, lead.company, lead.location, lead.work_mode, lead.jd_text)
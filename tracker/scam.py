@@ -0,0 +1,260 @@
+"""Rule-based scam scoring for job leads.
+
+Every signal has a weight; a lead's score is the sum of the weights of the
+signals it matches, and it is flagged once the score reaches
+``TRACKER_SCAM_THRESHOLD`` (default 3). Weights can be overridden per signal
+with the ``TRACKER_SCAM_WEIGHTS`` setting, and a weight of 0 disables one.
+
+Text is lowercased once per lead, and each text signal's regex only runs
+when one of its trigger words is in the text (a C-speed substring search),
+so the typical legitimate description costs a handful of ``in`` checks. URL
+and company checks are set lookups. :func:`score_leads` works on a whole
+batch; scoring ten thousand leads takes seconds.
+
+Leads whose scam flag was set or cleared by hand (``scam_reviewed``) are
+never re-scored, so the engine does not fight the user.
+"""
+
+import re
+from urllib.parse import urlsplit
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .fragments import bulk_written
+from .models import JobLead
+
+DEFAULT_THRESHOLD = 3
+DEFAULT_BATCH_SIZE = 1000
+SCORED_FIELDS = ("scam_score", "is_scam_suspected", "scam_reasons")
+# Lead fields the signals read; editing any of them calls for a re-score.
+SIGNAL_FIELDS = ("title", "company", "job_url", "jd_text")
+
+# name: (weight, reason, trigger words, pattern). Patterns run on lowercased
+# text, and only when one of their trigger words occurs in it.
+TEXT_SIGNALS = {
+    "upfront_payment": (
+        3,
+        "Asks the candidate to pay (fees, training, equipment or starter kit).",
+        ("fee", "pay", "deposit"),
+        r"(?:registration|application|training|processing|onboarding)\s+fee"
+        r"|pay\s+(?:for|a)\s+(?:your\s+)?(?:training|equipment|starter\s+kit|background\s+check)"
+        r"|refundable\s+deposit",
+    ),
+    "payment_channel": (
+        3,
+        "Mentions wire transfers, gift cards, crypto or cheque cashing.",
+        ("western", "moneygram", "gift card", "bitcoin", "crypto", "usdt", "check", "cheque", "wire"),
+        r"western\s+union|moneygram|gift\s+cards?|bitcoin|crypto\s*currency|usdt"
+        r"|(?:cash|deposit)\s+(?:a\s+)?(?:cheque|check)s?|wire\s+(?:the\s+)?(?:funds|money)",
+    ),
+    "reshipping": (
+        3,
+        "Describes package reshipping or handling funds through a personal account.",
+        ("reship", "forward", "packages", "parcels", "bank account"),
+        r"reship(?:ping)?|package\s+forward|receive\s+(?:and\s+forward\s+)?(?:packages|parcels)"
+        r"|your\s+(?:personal\s+)?bank\s+account\s+(?:details|number)",
+    ),
+    "chat_only_contact": (
+        2,
+        "Interview or contact only over Telegram, WhatsApp or Signal.",
+        ("telegram", "whatsapp", "signal", "wechat"),
+        r"(?:telegram|whatsapp|signal|wechat)\b.{0,40}\b(?:interview|contact|message|reach|chat)"
+        r"|(?:interview|contact|message|reach|chat)\b.{0,40}\b(?:telegram|whatsapp|signal|wechat)",
+    ),
+    "easy_money": (
+        2,
+        "Promises easy money with no experience or minimal work.",
+        ("no experience", "money", "cash", "income", "get paid", "hour"),
+        r"no\s+experience\s+(?:needed|required|necessary)[^.]{0,60}(?:\$|earn|income)"
+        r"|(?:easy|quick|fast)\s+(?:money|cash|income)|get\s+paid\s+(?:daily|instantly|today)"
+        r"|work\s+(?:only\s+)?\d\s*(?:-|to)?\s*\d?\s*hours?\s+(?:a|per)\s+(?:day|week)[^.]{0,40}\$",
+    ),
+    "pressure": (
+        1,
+        "Pushes urgency (immediate start, limited slots, hired today).",
+        ("slots", "spots", "positions", "hired", "act ", "urgent"),
+        r"(?:limited|few)\s+(?:slots|spots|positions)\s+(?:left|available)|hired\s+(?:today|immediately)"
+        r"|act\s+(?:now|fast)|urgent(?:ly)?\s+hiring",
+    ),
+    "personal_email": (
+        1,
+        "Asks applicants to reply to a free webmail address.",
+        ("@",),
+        r"@(?:gmail|yahoo|hotmail|outlook|aol|proton(?:mail)?|gmx|mail)\.(?:com|me|net|ru)\b",
+    ),
+}
+_TEXT_RULES = [
+    (name, triggers, re.compile(pattern, re.DOTALL)) for name, (_, _, triggers, pattern) in TEXT_SIGNALS.items()
+]
+
+SALARY_SIGNAL = ("salary_too_good", 2, "Pay looks too good to be true for the role.")
+# Amounts per period above which pay is implausible for an ordinary listing.
+SALARY_LIMITS = {"hour": 150, "day": 1000, "week": 5000}
+SALARY_PATTERN = re.compile(
+    r"[$€£]\s?(\d{1,3}(?:[,.]\d{3})*|\d+)(?:\.\d+)?\s*(k)?\s*(?:/|per|an?|each)\s*(hour|hr|day|week|wk)\b",
+    re.IGNORECASE,
+)
+PERIOD_ALIASES = {"hr": "hour", "wk": "week"}
+
+URL_SIGNAL = ("suspicious_domain", 2, "Job link points to a URL shortener, chat app or free site builder.")
+SUSPICIOUS_DOMAINS = frozenset(
+    {
+        "bit.ly",
+        "tinyurl.com",
+        "t.co",
+        "goo.gl",
+        "cutt.ly",
+        "rb.gy",
+        "is.gd",
+        "t.me",
+        "telegram.me",
+        "wa.me",
+        "chat.whatsapp.com",
+        "forms.gle",
+        "docs.google.com",
+        "sites.google.com",
+        "blogspot.com",
+        "wixsite.com",
+        "weebly.com",
+        "000webhostapp.com",
+        "godaddysites.com",
+    }
+)
+SUSPICIOUS_TLDS = frozenset({"tk", "ml", "ga", "cf", "gq", "top", "xyz", "click", "work", "buzz"})
+
+COMPANY_SIGNAL = ("missing_company", 1, "No real company name is given.")
+PLACEHOLDER_COMPANIES = frozenset(
+    {
+        "",
+        "confidential",
+        "undisclosed",
+        "private",
+        "n/a",
+        "na",
+        "none",
+        "unknown",
+        "hiring",
+        "company",
+        "employer",
+        "recruiter",
+        "hr",
+        "hr team",
+        "hiring manager",
+    }
+)
+
+# Signal name -> the reason shown on a flagged lead, in display order.
+REASONS = {name: reason for name, (_, reason, _, _) in TEXT_SIGNALS.items()}
+REASONS.update({name: reason for name, _, reason in (SALARY_SIGNAL, URL_SIGNAL, COMPANY_SIGNAL)})
+
+
+def scam_threshold():
+    return getattr(settings, "TRACKER_SCAM_THRESHOLD", DEFAULT_THRESHOLD)
+
+
+def signal_weights():
+    weights = {name: weight for name, (weight, _, _, _) in TEXT_SIGNALS.items()}
+    for name, weight, _ in (SALARY_SIGNAL, URL_SIGNAL, COMPANY_SIGNAL):
+        weights[name] = weight
+    weights.update(getattr(settings, "TRACKER_SCAM_WEIGHTS", {}))
+    return weights
+
+
+def _domain_is_suspicious(url):
+    host = (urlsplit(url).hostname or "").lower().removeprefix("www.")
+    if not host:
+        return False
+    if host.rpartition(".")[2] in SUSPICIOUS_TLDS:
+        return True
+    return any(host == domain or host.endswith("." + domain) for domain in SUSPICIOUS_DOMAINS)
+
+
+def _salary_too_good(text):
+    for match in SALARY_PATTERN.finditer(text):
+        amount = float(re.sub(r"[,.]", "", match.group(1)))
+        if match.group(2):
+            amount *= 1000
+        period = match.group(3).lower()
+        if amount > SALARY_LIMITS[PERIOD_ALIASES.get(period, period)]:
+            return True
+    return False
+
+
+def lead_signals(title, company, job_url, jd_text):
+    """Names of the signals a lead matches, in a stable order."""
+
+    text = f"{title}\n{jd_text}".lower()
+    signals = {
+        name
+        for name, triggers, pattern in _TEXT_RULES
+        if any(trigger in text for trigger in triggers) and pattern.search(text)
+    }
+    if any(symbol in text for symbol in "$€£") and _salary_too_good(text):
+        signals.add(SALARY_SIGNAL[0])
+    if job_url and _domain_is_suspicious(job_url):
+        signals.add(URL_SIGNAL[0])
+    if (company or "").strip().casefold() in PLACEHOLDER_COMPANIES:
+        signals.add(COMPANY_SIGNAL[0])
+    return sorted(signals, key=list(REASONS).index)
+
+
+def score_leads(leads, threshold=None, weights=None):
+    """Score ``leads`` in place: ``scam_score``, ``is_scam_suspected`` and ``scam_reasons``.
+
+    Hand-reviewed leads are skipped. Returns the leads whose fields were set.
+    """
+
+    threshold = scam_threshold() if threshold is None else threshold
+    weights = signal_weights() if weights is None else weights
+    scored = []
+    for lead in leads:
+        if lead.scam_reviewed:
+            continue
+        signals = [
+            name
+            for name in lead_signals(lead.title, lead.company, lead.job_url, lead.jd_text)
+            if weights.get(name, 0)
+        ]
+        lead.scam_score = sum(weights[name] for name in signals)
+        lead.is_scam_suspected = lead.scam_score >= threshold
+        lead.scam_reasons = "\n".join(REASONS[name] for name in signals) if lead.is_scam_suspected else ""
+        scored.append(lead)
+    return scored
+
+
+def rescore_leads(leads, batch_size=DEFAULT_BATCH_SIZE, threshold=None):
+    """Re-score every unreviewed lead in the ``leads`` queryset, in id-ordered batches.
+
+    Only leads whose score, flag or reasons change are written. Returns
+    ``(scored, changed, flagged)`` counts.
+    """
+
+    weights = signal_weights()
+    queryset = (
+        leads.filter(scam_reviewed=False)
+        .only("pk", "owner_id", *SIGNAL_FIELDS, "scam_reviewed", *SCORED_FIELDS)
+        .order_by("pk")
+    )
+    scored = changed = flagged = 0
+    last_pk = 0
+    while batch := list(queryset.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1].pk
+        before = {lead.pk: tuple(getattr(lead, field) for field in SCORED_FIELDS) for lead in batch}
+        score_leads(batch, threshold=threshold, weights=weights)
+        now = timezone.now()
+        updates = []
+        for lead in batch:
+            flagged += lead.is_scam_suspected
+            if tuple(getattr(lead, field) for field in SCORED_FIELDS) != before[lead.pk]:
+                lead.updated_at = now
+                updates.append(lead)
+        if updates:
+            with transaction.atomic():
+                JobLead.objects.bulk_update(updates, [*SCORED_FIELDS, "updated_at"])
+                for owner_id in {lead.owner_id for lead in updates}:
+                    bulk_written(owner_id)
+        scored += len(batch)
+        changed += len(updates)
+    return scored, changed, flagged
@@ -0,0 +1,100 @@
+"""Full-text search over applications, leads and follow-ups.
+
+On Postgres, ``JobLead.search_vector`` and ``Application.search_vector`` are
+kept current by database triggers (see migration 0006) and GIN-indexed, so a
+search is an index lookup ranked with ``ts_rank``. Other databases fall back
+to the original ``icontains`` predicates, as do queries made only of stop
+words ("IT", "The"), which the ``english`` config would reduce to nothing.
+"""
+
+import functools
+import re
+
+from django.contrib.postgres.search import SearchQuery, SearchRank
+from django.db import connection
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.functions import Coalesce
+
+SEARCH_CONFIG = "english"
+TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+APPLICATION_VECTORS = ("job__search_vector", "search_vector")
+APPLICATION_FIELDS = ("job__company", "job__title", "job__location", "notes", "location_text")
+LEAD_VECTORS = ("search_vector",)
+LEAD_FIELDS = ("title", "company")
+FOLLOWUP_VECTORS = ("application__job__search_vector", "application__search_vector")
+FOLLOWUP_FIELDS = ("application__job__company", "application__job__title")
+
+
+def search_enabled():
+    return connection.vendor == "postgresql"
+
+
+def prefix_query_text(text):
+    """Return raw tsquery text matching every word of ``text`` as a prefix.
+
+    Requiring each word (AND) as a prefix keeps the feel of the old substring
+    search while still using the index. Returns ``""`` if there are no words.
+    """
+
+    tokens = TOKEN_RE.findall(text.lower())
+    return " & ".join(f"{token}:*" for token in tokens)
+
+
+@functools.lru_cache(maxsize=512)
+def _only_stop_words(raw):
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT numnode(to_tsquery(%s::regconfig, %s))", [SEARCH_CONFIG, raw])
+        return cursor.fetchone()[0] == 0
+
+
+def build_search_query(text):
+    """The tsquery for ``text``, or ``None`` when it has no searchable words."""
+
+    raw = prefix_query_text(text)
+    if not raw or (search_enabled() and _only_stop_words(raw)):
+        return None
+    return SearchQuery(raw, search_type="raw", config=SEARCH_CONFIG)
+
+
+def apply_search(queryset, text, vectors, fallback_fields, text_fields=()):
+    """Filter ``queryset`` by ``text``.
+
+    ``vectors`` are search vector paths used on Postgres, where matching rows
+    are annotated with ``search_rank``. ``fallback_fields`` are matched with
+    ``icontains`` elsewhere. ``text_fields`` are small columns outside any
+    vector that are matched with ``icontains`` on every backend.
+    """
+
+    text = text.strip()
+    if not text:
+        return queryset
+
+    query = build_search_query(text) if search_enabled() else None
+    if query is None:
+        predicate = Q()
+        for field in (*fallback_fields, *text_fields):
+            predicate |= Q(**{f"{field}__icontains": text})
+        return queryset.filter(predicate)
+
+    predicate = Q()
+    rank = None
+    for path in vectors:
+        predicate |= Q(**{path: query})
+        term = Coalesce(SearchRank(F(path), query), Value(0.0), output_field=FloatField())
+        rank = term if rank is None else rank + term
+    for field in text_fields:
+        predicate |= Q(**{f"{field}__icontains": text})
+    return queryset.filter(predicate).annotate(search_rank=rank)
+
+
+def search_applications(queryset, text, fallback_fields=APPLICATION_FIELDS):
+    return apply_search(queryset, text, APPLICATION_VECTORS, fallback_fields)
+
+
+def search_leads(queryset, text):
+    return apply_search(queryset, text, LEAD_VECTORS, LEAD_FIELDS)
+
+
+def search_followups(queryset, text):
+    return apply_search(queryset, text, FOLLOWUP_VECTORS, FOLLOWUP_FIELDS, text_fields=("note",))
@@ -0,0 +1,221 @@
+""""More like this" search over job descriptions.
+
+Each lead's title and ``jd_text`` are turned into a TF-IDF vector over its
+owner's leads: sublinear term frequency, smoothed inverse document
+frequency, unit length. Title words count :data:`TITLE_WEIGHT` times. The
+vector is kept as an inverted index of its :data:`MAX_TERMS` heaviest
+terms, one :class:`LeadTerm` row each, and the owner's document frequencies
+(over every term) live in :class:`LeadTermCount`. Both are updated
+incrementally when leads are created, edited or deleted, so queries never
+rebuild anything.
+
+A query takes the lead's :data:`QUERY_TERMS` heaviest terms and sums
+``query weight * posting weight`` per lead in one indexed aggregate. The
+heaviest terms are the rarest ones, so their posting lists are short and
+the dot product stays cheap however many leads the owner has. Weights keep
+the document frequencies of the moment they were written;
+``index_similar_leads --rebuild`` recomputes them against the current
+counts.
+"""
+
+import hashlib
+import math
+from collections import Counter, defaultdict
+
+from django.db import transaction
+from django.db.models import Case, F, FloatField, Sum, Value, When
+
+from .batching import LOOKUP_CHUNK, chunked
+from .fingerprints import normalize_text
+from .models import JobLead, LeadTerm, LeadTermCount
+
+TITLE_WEIGHT = 3
+# Postings kept per lead; the light tail adds rows but barely moves scores.
+MAX_TERMS = 32
+QUERY_TERMS = 24
+DEFAULT_LIMIT = 5
+# Leads below this share of the query vector are not worth showing.
+MIN_SIMILARITY = 0.1
+
+STOP_WORDS = frozenset(
+    """
+    a about all also an and any are as at be been but by can do for from has have how if in into is it its
+    job may more most must no not of on or our out per role so such than that the their them then there
+    these they this to up us via was we were what when where which while who will with work would you your
+    """.split()
+)
+
+
+def term_key(term):
+    digest = hashlib.blake2b(term.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "big", signed=True)
+
+
+def _words(text):
+    return [
+        word
+        for word in normalize_text(text).split()
+        if len(word) > 1 and not word.isdigit() and word not in STOP_WORDS
+    ]
+
+
+def term_counts(title, jd_text):
+    """Term key -> frequency for a lead's text; title words count extra."""
+
+    counts = Counter(term_key(word) for word in _words(jd_text))
+    for word in _words(title):
+        counts[term_key(word)] += TITLE_WEIGHT
+    return counts
+
+
+def add_term_counts(owner_id, deltas):
+    """Add ``{term: delta}`` to the owner's document frequencies.
+
+    Missing rows are created at zero first so every change is a relative
+    ``UPDATE``; concurrent indexing for the same owner cannot lose counts.
+    Call it inside a transaction.
+    """
+
+    deltas = {term: delta for term, delta in deltas.items() if delta}
+    added = [term for term, delta in deltas.items() if delta > 0]
+    by_delta = defaultdict(list)
+    for term, delta in deltas.items():
+        by_delta[delta].append(term)
+    counts = LeadTermCount.objects.filter(owner_id=owner_id)
+    LeadTermCount.objects.bulk_create(
+        [LeadTermCount(owner_id=owner_id, term=term, leads=0) for term in added],
+        ignore_conflicts=True,
+        batch_size=LOOKUP_CHUNK,
+    )
+    for delta, terms in by_delta.items():
+        for chunk in chunked(terms):
+            counts.filter(term__in=chunk).update(leads=F("leads") + delta)
+    if len(added) < len(deltas):
+        counts.filter(leads__lte=0).delete()
+
+
+def write_postings(owner_id, items):
+    """Store TF-IDF postings for ``[(lead_id, term_counts)]`` using the current frequencies."""
+
+    terms = {term for _, counts in items for term in counts}
+    documents = {}
+    for chunk in chunked(terms):
+        documents.update(
+            LeadTermCount.objects.filter(owner_id=owner_id, term__in=chunk).values_list("term", "leads")
+        )
+    total = JobLead.objects.filter(owner_id=owner_id).count()
+
+    postings = []
+    for lead_id, counts in items:
+        weights = {
+            term: (1 + math.log(frequency)) * (math.log((1 + total) / (1 + documents.get(term, 0))) + 1)
+            for term, frequency in counts.items()
+        }
+        norm = math.sqrt(sum(weight * weight for weight in weights.values())) or 1.0
+        heaviest = sorted(weights.items(), key=lambda item: (-item[1], item[0]))[:MAX_TERMS]
+        postings.extend(
+            LeadTerm(lead_id=lead_id, owner_id=owner_id, term=term, weight=weight / norm)
+            for term, weight in heaviest
+        )
+    LeadTerm.objects.bulk_create(postings, batch_size=LOOKUP_CHUNK)
+
+
+def index_terms(leads, previous=None):
+    """Add saved ``leads`` to the index, or re-index them after an edit.
+
+    ``previous`` maps the id of an already indexed lead to the ``(title,
+    jd_text)`` it was indexed with, so those terms come back out of the
+    document frequencies and its old postings are replaced.
+    """
+
+    previous = previous or {}
+    by_owner = defaultdict(list)
+    for lead in leads:
+        if lead.owner_id is not None:
+            by_owner[lead.owner_id].append((lead.pk, term_counts(lead.title, lead.jd_text)))
+    for owner_id, items in by_owner.items():
+        with transaction.atomic():
+            deltas = Counter(term for _, counts in items for term in counts)
+            edited = [lead_id for lead_id, _ in items if lead_id in previous]
+            for lead_id in edited:
+                deltas.subtract(term_counts(*previous[lead_id]).keys())
+            for lead_ids in chunked(edited):
+                LeadTerm.objects.filter(lead_id__in=lead_ids).delete()
+            add_term_counts(owner_id, deltas)
+            write_postings(owner_id, [(lead_id, counts) for lead_id, counts in items if counts])
+
+
+def _row_batches(leads, batch_size):
+    rows = leads.order_by("pk").values_list("pk", "title", "jd_text")
+    last_pk = 0
+    while batch := list(rows.filter(pk__gt=last_pk)[:batch_size]):
+        last_pk = batch[-1][0]
+        yield batch
+
+
+def index_owner_leads(owner_id, leads, batch_size=500):
+    """Index a queryset of one owner's unindexed leads in two keyset passes.
+
+    Every lead's terms are counted before any posting is written, so all the
+    weights see the same frequencies and the counts take one round of
+    updates instead of one per batch. Returns the number of leads indexed.
+    """
+
+    documents = Counter()
+    for batch in _row_batches(leads, batch_size):
+        for _, title, jd_text in batch:
+            documents.update(term_counts(title, jd_text).keys())
+    with transaction.atomic():
+        add_term_counts(owner_id, documents)
+    indexed = 0
+    for batch in _row_batches(leads, batch_size):
+        items = [(pk, term_counts(title, jd_text)) for pk, title, jd_text in batch]
+        write_postings(owner_id, [(pk, counts) for pk, counts in items if counts])
+        indexed += len(batch)
+    return indexed
+
+
+def forget_leads(leads):
+    """Take leads about to be deleted out of their owners' document frequencies.
+
+    Call it in the transaction that deletes them.
+    """
+
+    by_owner = defaultdict(Counter)
+    for lead in leads:
+        if lead.owner_id is not None:
+            by_owner[lead.owner_id].subtract(term_counts(lead.title, lead.jd_text).keys())
+    for owner_id, deltas in by_owner.items():
+        add_term_counts(owner_id, deltas)
+
+
+def similar_leads(lead, limit=DEFAULT_LIMIT):
+    """The owner's leads most similar to ``lead``, best first, each with a ``similarity`` attribute."""
+
+    query = list(LeadTerm.objects.filter(lead=lead).order_by("-weight").values_list("term", "weight")[:QUERY_TERMS])
+    if not query:
+        return []
+    score = Sum(
+        Case(
+            *(When(term=term, then=F("weight") * Value(weight)) for term, weight in query),
+            output_field=FloatField(),
+        )
+    )
+    ranked = list(
+        LeadTerm.objects.filter(owner_id=lead.owner_id, term__in=[term for term, _ in query])
+        .exclude(lead_id=lead.pk)
+        .values("lead_id")
+        .annotate(score=score)
+        .filter(score__gte=MIN_SIMILARITY)
+        .order_by("-score", "lead_id")
+        .values_list("lead_id", "score")[:limit]
+    )
+    leads = JobLead.objects.only("pk", "title", "company", "location", "owner_id").in_bulk(
+        [lead_id for lead_id, _ in ranked]
+    )
+    results = []
+    for lead_id, similarity in ranked:
+        if lead_id in leads:
+            leads[lead_id].similarity = min(similarity, 1.0)
+            results.append(leads[lead_id])
+    return results
@@ -1111,6 +1111,30 @@
             badge.textContent = `${next}`;
         }
 
+        kanban.addEventListener("click", (event) => {
+            const loadMore = event.target.closest("[data-board-load-more]");
+            if (!loadMore) {
+                return;
+            }
+            event.preventDefault();
+            loadMore.disabled = true;
+            fetch(loadMore.dataset.boardLoadMore, { credentials: "same-origin", cache: "no-store" })
+                .then((response) => {
+                    if (!response.ok) {
+                        throw new Error("load more failed");
+                    }
+                    return response.text();
+                })
+                .then((html) => {
+                    loadMore.insertAdjacentHTML("beforebegin", html);
+                    loadMore.remove();
+                })
+                .catch(() => {
+                    loadMore.disabled = false;
+                    showToast("Could not load more applications.");
+                });
+        });
+
         kanban.addEventListener("dragstart", (event) => {
             const card = event.target.closest(".kanban-card");
             if (!card) {
@@ -1463,6 +1487,75 @@
         }
     });
 
+    function setActiveViewSegment(mode) {
+        document.querySelectorAll("[data-view-partial]").forEach((segment) => {
+            const isActive = segment.dataset.viewMode === mode;
+            segment.classList.toggle("is-active", isActive);
+            segment.setAttribute("aria-selected", isActive ? "true" : "false");
+        });
+        const viewInput = document.querySelector(".filter-controls input[name='view']");
+        if (viewInput) {
+            viewInput.value = mode;
+        }
+        document.querySelectorAll(".view-pills a[href^='?']").forEach((pill) => {
+            const params = new URLSearchParams(pill.getAttribute("href").slice(1));
+            params.set("view", mode);
+            pill.setAttribute("href", `?${params.toString()}`);
+        });
+    }
+
+    function loadViewPartial(segment) {
+        const viewRoot = document.querySelector("[data-view-root]");
+        if (!viewRoot) {
+            window.location.href = segment.href;
+            return;
+        }
+        viewRoot.setAttribute("aria-busy", "true");
+        fetch(segment.dataset.viewPartial, { credentials: "same-origin", cache: "no-store" })
+            .then((response) => {
+                if (!response.ok) {
+                    throw new Error("partial failed");
+                }
+                return response.text();
+            })
+            .then((html) => {
+                closePopover(true);
+                viewRoot.innerHTML = html;
+                viewRoot.removeAttribute("aria-busy");
+                setActiveViewSegment(segment.dataset.viewMode);
+                window.history.pushState({}, "", segment.href);
+                initKanban();
+            })
+            .catch(() => {
+                window.location.href = segment.href;
+            });
+    }
+
+    function initViewSwitcher() {
+        const switcher = document.querySelector(".view-switcher");
+        if (!switcher) {
+            return;
+        }
+        switcher.addEventListener("click", (event) => {
+            const segment = event.target.closest("[data-view-partial]");
+            if (!segment || event.metaKey || event.ctrlKey || event.shiftKey || event.button !== 0) {
+                return;
+            }
+            event.preventDefault();
+            if (segment.classList.contains("is-active")) {
+                return;
+            }
+            loadViewPartial(segment);
+        });
+        window.addEventListener("popstate", () => {
+            const mode = new URLSearchParams(window.location.search).get("view") || "list";
+            const active = switcher.querySelector(".is-active");
+            if (active && active.dataset.viewMode !== mode) {
+                window.location.reload();
+            }
+        });
+    }
+
     function handleSelectedParamChange() {
         const selected = new URLSearchParams(window.location.search).get("selected");
         if (selected && selected !== state.selectedId) {
@@ -1495,6 +1588,7 @@
     initSidebarToggle();
     initUserMenu();
     initKanban();
+    initViewSwitcher();
     updateTopbarHeight();
 
     const selected = new URLSearchParams(window.location.search).get("selected");
@@ -1,17 +1,60 @@
 from datetime import timedelta
+from email.message import EmailMessage
+import gzip
+import hashlib
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import io
 import json
+import mailbox
+from pathlib import Path
+import tempfile
+import threading
+from urllib.parse import urlencode
+from unittest import mock, skipUnless
 
 from django.contrib.auth import get_user_model
 from django.core import mail
+from django.core.cache import cache
 from django.core.management import call_command
+from django.db import DatabaseError, connection
 from django.test import Client, TestCase, override_settings
+from django.http import QueryDict
 from django.urls import reverse
 from django.utils import timezone
 
-from .models import Application, FollowUp, JobLead, UserProfile
+from .backups import ArchiveTooLarge, queue_restore
+from .counters import application_counters, cached_counters_for_user, counters_for_user, refresh_pipeline_counters
+from .email_alerts import GenericExtractor
+from .fingerprints import canonical_url, lead_fingerprint
+from .fragments import bump_data_version
+from .ingest import ingest_leads
+from .near_duplicates import signature_for_text, similarity
+from .relevance import Targeting
+from .scam import lead_signals
+from .models import (
+    Application,
+    ExportJob,
+    FeedEntry,
+    FeedSubscription,
+    FollowUp,
+    JobLead,
+    LeadTermCount,
+    PipelineCounters,
+    ProcessedEmail,
+    RestoreJob,
+    UserProfile,
+)
+from .search import build_search_query, prefix_query_text
+from .similar_leads import similar_leads
+from .views import ApplicationListView
 
 
 class BaseTestCase(TestCase):
+    def _pre_setup(self):
+        super()._pre_setup()
+        # Cached fragments are keyed by user id, which test databases reuse.
+        cache.clear()
+
     def create_user(self, username, password="password123", **kwargs):
         return get_user_model().objects.create_user(username=username, password=password, **kwargs)
 
@@ -241,6 +284,1656 @@ class ApplicationFilterTests(BaseTestCase):
         self.assertContains(response, "Clear filters")
 
 
+class ApplicationPaginationTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("pager")
+        self.client.login(username="pager", password="password123")
+        today = timezone.localdate()
+        self.applications = [
+            self.create_application(
+                owner=self.user,
+                company=f"Company {index}",
+                follow_up_on=today + timedelta(days=index) if index % 2 else None,
+            )
+            for index in range(5)
+        ]
+
+    def walk_pages(self, params):
+        seen = []
+        url = reverse("tracker:application_list")
+        query = {**params, "format": "json", "page_size": 2}
+        while True:
+            payload = self.client.get(url, query).json()
+            seen.extend(item["id"] for item in payload["applications"])
+            if not payload["next_cursor"]:
+                return seen
+            query["cursor"] = payload["next_cursor"]
+
+    def test_cursor_walks_default_sort_without_gaps(self):
+        expected = list(
+            Application.objects.filter(owner=self.user)
+            .order_by("-updated_at", "id")
+            .values_list("id", flat=True)
+        )
+
+        self.assertEqual(self.walk_pages({}), expected)
+
+    def test_cursor_walks_follow_up_sort_with_nulls_last(self):
+        seen = self.walk_pages({"sort": "follow_up"})
+
+        dated = [app.pk for app in self.applications if app.follow_up_on]
+        self.assertEqual(seen[: len(dated)], dated)
+        self.assertEqual(sorted(seen), sorted(app.pk for app in self.applications))
+
+    def test_cursor_respects_filters(self):
+        seen = self.walk_pages({"due": "none"})
+
+        self.assertEqual(
+            set(seen),
+            {app.pk for app in self.applications if app.follow_up_on is None},
+        )
+
+    def test_next_link_rendered_and_invalid_cursor_falls_back(self):
+        response = self.client.get(reverse("tracker:application_list"), {"page_size": 2})
+
+        self.assertContains(response, "Next page")
+        self.assertEqual(len(response.context["applications"]), 2)
+
+        response = self.client.get(
+            reverse("tracker:application_list"),
+            {"page_size": 2, "cursor": "not-a-cursor"},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(response.context["page_obj"].has_previous)
+
+
+class ApplicationViewModeQueryTests(BaseTestCase):
+    """Each view mode only pays for its own queries.
+
+    Every request also spends three queries on the session, the user and the
+    profile context processor.
+    """
+
+    def setUp(self):
+        self.user = self.create_user("modes")
+        self.client.login(username="modes", password="password123")
+        today = timezone.localdate()
+        for index in range(3):
+            application = self.create_application(
+                owner=self.user,
+                company=f"Company {index}",
+                status=Application.Status.APPLIED,
+                follow_up_on=today,
+            )
+            FollowUp.objects.create(application=application, due_on=today)
+        refresh_pipeline_counters(self.user.pk)
+
+    def test_list_mode_query_count(self):
+        # Includes the conditional-GET validator query.
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse("tracker:application_list"), {"view": "list"})
+
+        self.assertNotIn("status_columns", response.context)
+        self.assertNotIn("today_items", response.context)
+
+    def test_board_mode_query_count(self):
+        # Includes the validator and sidebar badge queries.
+        with self.assertNumQueries(6):
+            response = self.client.get(reverse("tracker:application_list"), {"view": "board"})
+
+        self.assertNotIn("due_today_count", response.context)
+        self.assertNotIn("today_items", response.context)
+
+    def test_followups_mode_query_count(self):
+        # Includes the validator and sidebar badge queries.
+        with self.assertNumQueries(7):
+            response = self.client.get(reverse("tracker:application_list"), {"view": "followups"})
+
+        self.assertNotIn("status_columns", response.context)
+        self.assertNotIn("due_today_count", response.context)
+
+    def test_partial_renders_fragment_only(self):
+        response = self.client.get(
+            reverse("tracker:application_view_partial", args=["board"]),
+            {"status": Application.Status.APPLIED},
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "data-kanban")
+        self.assertNotContains(response, "<aside class=\"sidebar\"", html=False)
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_partial_rejects_unknown_mode(self):
+        response = self.client.get(reverse("tracker:application_view_partial", args=["nope"]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+@mock.patch.object(ApplicationListView, "board_column_size", 2)
+class BoardColumnTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("board")
+        self.client.login(username="board", password="password123")
+        self.rejected = [
+            self.create_application(
+                owner=self.user,
+                company=f"Rejected {index}",
+                status=Application.Status.REJECTED,
+            )
+            for index in range(5)
+        ]
+        self.offer = self.create_application(
+            owner=self.user,
+            company="Offer Co",
+            status=Application.Status.OFFER,
+        )
+
+    def column(self, response, code):
+        return next(col for col in response.context["status_columns"] if col["code"] == code)
+
+    def test_columns_are_capped_with_totals(self):
+        response = self.client.get(reverse("tracker:application_list"), {"view": "board"})
+
+        rejected = self.column(response, Application.Status.REJECTED)
+        self.assertEqual(rejected["total"], 5)
+        self.assertEqual(
+            [app.pk for app in rejected["applications"]],
+            [app.pk for app in reversed(self.rejected)][:2],
+        )
+        self.assertTrue(rejected["load_more_query"])
+        offer = self.column(response, Application.Status.OFFER)
+        self.assertEqual(offer["applications"], [self.offer])
+        self.assertFalse(offer["load_more_query"])
+        self.assertContains(response, "data-board-load-more")
+
+    def test_load_more_walks_the_rest_of_a_column(self):
+        response = self.client.get(reverse("tracker:application_list"), {"view": "board"})
+        seen = [app.pk for app in self.column(response, Application.Status.REJECTED)["applications"]]
+        query = self.column(response, Application.Status.REJECTED)["load_more_query"]
+        url = reverse("tracker:application_board_column", args=[Application.Status.REJECTED])
+
+        while query:
+            response = self.client.get(f"{url}?{query}")
+            self.assertEqual(response.status_code, 200)
+            seen.extend(app.pk for app in response.context["applications"])
+            query = response.context["load_more_query"]
+
+        self.assertEqual(seen, [app.pk for app in reversed(self.rejected)])
+
+    def test_board_search_filters_single_query(self):
+        response = self.client.get(
+            reverse("tracker:application_list"),
+            {"view": "board", "search": "Offer"},
+        )
+
+        totals = {col["code"]: col["total"] for col in response.context["status_columns"]}
+        self.assertEqual(totals[Application.Status.OFFER], 1)
+        self.assertEqual(totals[Application.Status.REJECTED], 0)
+
+    def test_load_more_rejects_unknown_status(self):
+        response = self.client.get(reverse("tracker:application_board_column", args=["NOPE"]))
+
+        self.assertEqual(response.status_code, 404)
+
+
+class SearchQueryBuilderTests(TestCase):
+    def test_tokens_become_prefix_terms(self):
+        self.assertEqual(prefix_query_text("Acme  back-end!"), "acme:* & back:* & end:*")
+
+    def test_punctuation_only_returns_none(self):
+        self.assertIsNone(build_search_query("  '&|!  "))
+
+
+@skipUnless(connection.vendor == "postgresql", "Full-text search requires Postgres.")
+class FullTextSearchTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("fts")
+        self.client.login(username="fts", password="password123")
+
+    def test_trigger_maintains_vector_and_matches_jd_text(self):
+        application = self.create_application(owner=self.user, company="Acme", title="Engineer")
+        application.job.jd_text = "We build distributed telemetry pipelines."
+        application.job.save()
+
+        response = self.client.get(reverse("tracker:application_list"), {"search": "telemetr"})
+
+        self.assertEqual(list(response.context["applications"]), [application])
+
+    def test_relevance_sort_ranks_title_matches_first(self):
+        notes_match = self.create_application(owner=self.user, company="Beta", notes="python tooling")
+        title_match = self.create_application(owner=self.user, company="Gamma", title="Python Developer")
+
+        response = self.client.get(
+            reverse("tracker:application_list"),
+            {"search": "python", "sort": "relevance"},
+        )
+
+        self.assertEqual(list(response.context["applications"]), [title_match, notes_match])
+
+    def test_lead_search_uses_vector(self):
+        lead = JobLead.objects.create(
+            company="Acme",
+            title="Engineer",
+            location="Berlin",
+            owner=self.user,
+        )
+        JobLead.objects.create(company="Other", title="Designer", owner=self.user)
+
+        response = self.client.get(reverse("tracker:lead_list"), {"q": "berl"})
+
+        self.assertEqual([item.pk for item in response.context["leads"]], [lead.pk])
+
+    def test_stop_word_queries_fall_back_to_substring_match(self):
+        it = self.create_application(owner=self.user, company="IT Solutions")
+        self.create_application(owner=self.user, company="Acme")
+        desk = self.create_application(owner=self.user, company="The Trade Desk")
+
+        response = self.client.get(reverse("tracker:application_list"), {"search": "IT", "format": "json"})
+        self.assertEqual([row["id"] for row in response.json()["applications"]], [it.pk])
+
+        response = self.client.get(reverse("tracker:application_list"), {"search": "The Trade Desk"})
+        self.assertEqual(list(response.context["applications"]), [desk])
+
+        response = self.client.get(reverse("tracker:lead_list"), {"q": "it"})
+        self.assertEqual([item.pk for item in response.context["leads"]], [it.job_id])
+
+
+class IndexPackTests(TestCase):
+    def test_hot_path_indexes_exist(self):
+        expected = {
+            Application: {"app_owner_updated_idx", "app_owner_status_idx", "app_owner_followup_open_idx"},
+            FollowUp: {"followup_open_due_idx"},
+            JobLead: {
+                "lead_owner_active_idx",
+                "lead_owner_archived_idx",
+                "lead_owner_source_idx",
+                "lead_owner_work_mode_idx",
+            },
+        }
+        with connection.cursor() as cursor:
+            for model, names in expected.items():
+                constraints = connection.introspection.get_constraints(cursor, model._meta.db_table)
+                self.assertLessEqual(names, set(constraints))
+
+
+class FollowUpInboxTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("inbox")
+        self.client.login(username="inbox", password="password123")
+        self.today = timezone.localdate()
+
+    def items(self, response, key):
+        return [
+            (item["type"], item["due_on"], item["application"].pk)
+            for item in response.context[key]
+        ]
+
+    def test_sources_are_merged_in_due_date_order(self):
+        early = self.create_application(owner=self.user, follow_up_on=self.today - timedelta(days=5))
+        late = self.create_application(owner=self.user, follow_up_on=self.today - timedelta(days=1))
+        FollowUp.objects.create(application=late, due_on=self.today - timedelta(days=3))
+        FollowUp.objects.create(application=early, due_on=self.today - timedelta(days=1))
+        FollowUp.objects.create(application=early, due_on=self.today - timedelta(days=2), is_completed=True)
+
+        response = self.client.get(reverse("tracker:application_list"), {"view": "followups"})
+
+        self.assertEqual(
+            self.items(response, "overdue_items"),
+            [
+                ("application", self.today - timedelta(days=5), early.pk),
+                ("followup", self.today - timedelta(days=3), late.pk),
+                ("application", self.today - timedelta(days=1), late.pk),
+                ("followup", self.today - timedelta(days=1), early.pk),
+            ],
+        )
+
+    def test_items_land_in_their_sections(self):
+        today_app = self.create_application(owner=self.user, follow_up_on=self.today)
+        week_app = self.create_application(owner=self.user, follow_up_on=self.today + timedelta(days=7))
+        self.create_application(owner=self.user, follow_up_on=self.today + timedelta(days=8))
+        self.create_application(
+            owner=self.user,
+            follow_up_on=self.today,
+            status=Application.Status.REJECTED,
+        )
+        FollowUp.objects.create(application=week_app, due_on=self.today)
+
+        response = self.client.get(reverse("tracker:application_list"), {"view": "followups"})
+
+        self.assertEqual(
+            self.items(response, "today_items"),
+            [("application", self.today, today_app.pk), ("followup", self.today, week_app.pk)],
+        )
+        self.assertEqual(
+            self.items(response, "week_items"),
+            [("application", self.today + timedelta(days=7), week_app.pk)],
+        )
+        self.assertEqual(response.context["overdue_items"], [])
+
+    def test_due_filter_only_fetches_requested_section(self):
+        self.create_application(owner=self.user, follow_up_on=self.today)
+        overdue = self.create_application(owner=self.user, follow_up_on=self.today - timedelta(days=2))
+
+        response = self.client.get(
+            reverse("tracker:application_list"),
+            {"view": "followups", "due": "overdue"},
+        )
+
+        self.assertEqual(response.context["today_items"], [])
+        self.assertEqual(
+            self.items(response, "overdue_items"),
+            [("application", self.today - timedelta(days=2), overdue.pk)],
+        )
+
+
+class BadgeCounterTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("badges")
+        self.client.login(username="badges", password="password123")
+        self.today = timezone.localdate()
+
+    def test_counts_come_from_one_query(self):
+        due = self.create_application(owner=self.user, follow_up_on=self.today)
+        late = self.create_application(
+            owner=self.user,
+            status=Application.Status.INTERVIEW,
+            follow_up_on=self.today - timedelta(days=2),
+        )
+        self.create_application(
+            owner=self.user,
+            status=Application.Status.REJECTED,
+            follow_up_on=self.today - timedelta(days=2),
+        )
+        FollowUp.objects.create(application=due, due_on=self.today)
+        FollowUp.objects.create(application=due, due_on=self.today + timedelta(days=3))
+        FollowUp.objects.create(application=late, due_on=self.today - timedelta(days=1))
+        FollowUp.objects.create(application=late, due_on=self.today - timedelta(days=1), is_completed=True)
+        self.create_application(owner=self.create_user("someone"), follow_up_on=self.today)
+
+        with self.assertNumQueries(1):
+            counters = application_counters(Application.objects.filter(owner=self.user), today=self.today)
+
+        self.assertEqual(counters["total"], 3)
+        self.assertEqual(counters["by_status"][Application.Status.INTERVIEW], 1)
+        self.assertEqual(counters["by_status"][Application.Status.REJECTED], 1)
+        self.assertEqual(counters["by_status"][Application.Status.OFFER], 0)
+        self.assertEqual(counters["due_today"], 1)
+        self.assertEqual(counters["overdue"], 1)
+        self.assertEqual(counters["followups"], {"today": 2, "overdue": 2, "week": 1})
+
+    def test_counters_endpoint(self):
+        self.create_application(owner=self.user, follow_up_on=self.today)
+
+        response = self.client.get(reverse("tracker:application_counters"))
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["due_today"], 1)
+        self.assertEqual(payload["by_status"][Application.Status.WISHLIST], 1)
+        self.assertEqual(response["Cache-Control"], "no-store")
+
+    def test_followup_badges_match_inbox_sections(self):
+        rejected = self.create_application(owner=self.user, status=Application.Status.REJECTED)
+        active = self.create_application(owner=self.user, follow_up_on=self.today + timedelta(days=2))
+        FollowUp.objects.create(application=rejected, due_on=self.today)
+        FollowUp.objects.create(application=active, due_on=self.today - timedelta(days=1))
+
+        inbox = self.client.get(reverse("tracker:application_list"), {"view": "followups"}).context
+        badges = self.client.get(reverse("tracker:application_counters")).json()["followups"]
+
+        self.assertEqual(badges, {section: len(inbox[f"{section}_items"]) for section in ("today", "overdue", "week")})
+        self.assertEqual(badges, {"today": 1, "overdue": 1, "week": 1})
+
+    def test_sidebar_shows_overdue_badge(self):
+        self.create_application(owner=self.user, follow_up_on=self.today - timedelta(days=1))
+
+        response = self.client.get(reverse("tracker:profile"))
+
+        self.assertContains(response, 'title="Overdue follow-ups"')
+
+
+class PipelineCountersTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("pipeline")
+        self.client.login(username="pipeline", password="password123")
+        self.today = timezone.localdate()
+
+    def stored(self):
+        return PipelineCounters.objects.get(owner=self.user).as_counters()
+
+    def test_badges_read_a_single_row(self):
+        self.create_application(owner=self.user, follow_up_on=self.today)
+        refresh_pipeline_counters(self.user.pk)
+
+        with self.assertNumQueries(1):
+            counters = counters_for_user(self.user)
+
+        self.assertEqual(counters["due_today"], 1)
+
+    def test_stale_day_is_recomputed(self):
+        self.create_application(owner=self.user, follow_up_on=self.today)
+        refresh_pipeline_counters(self.user.pk, today=self.today - timedelta(days=1))
+
+        counters = counters_for_user(self.user)
+
+        self.assertEqual(counters["due_today"], 1)
+        self.assertEqual(PipelineCounters.objects.get(owner=self.user).computed_on, self.today)
+
+    def test_stale_day_is_not_recomputed_over_a_concurrent_refresh(self):
+        self.create_application(owner=self.user, follow_up_on=self.today)
+        refresh_pipeline_counters(self.user.pk, today=self.today - timedelta(days=1))
+        refreshed = []
+
+        def concurrent_write(execute, sql, params, many, context):
+            # A writer refreshes the row after this reader found it stale.
+            result = execute(sql, params, many, context)
+            if not refreshed and 'FROM "tracker_pipelinecounters"' in sql:
+                refreshed.append(True)
+                refresh_pipeline_counters(self.user.pk, today=self.today)
+            return result
+
+        with connection.execute_wrapper(concurrent_write):
+            with mock.patch("tracker.counters.refresh_pipeline_counters") as reader_refresh:
+                counters = counters_for_user(self.user)
+
+        self.assertEqual(len(refreshed), 1)
+        reader_refresh.assert_not_called()
+        self.assertEqual(counters["due_today"], 1)
+
+    def test_write_views_keep_counters_current(self):
+        self.client.post(
+            reverse("tracker:application_quick_add"),
+            data=json.dumps({"company": "Acme", "title": "Engineer"}),
+            content_type="application/json",
+        )
+        self.assertEqual(self.stored()["by_status"][Application.Status.WISHLIST], 1)
+        application = Application.objects.get(owner=self.user)
+
+        self.client.post(
+            reverse("tracker:application_patch", args=[application.pk]),
+            data=json.dumps({"status": "INTERVIEW", "follow_up_on": self.today.isoformat()}),
+            content_type="application/json",
+        )
+        counters = self.stored()
+        self.assertEqual(counters["by_status"][Application.Status.WISHLIST], 0)
+        self.assertEqual(counters["by_status"][Application.Status.INTERVIEW], 1)
+        self.assertEqual(counters["due_today"], 1)
+
+        self.client.post(
+            reverse("tracker:application_followup_create", args=[application.pk]),
+            data=json.dumps({"due_on": self.today.isoformat()}),
+            content_type="application/json",
+        )
+        self.assertEqual(self.stored()["followups"]["today"], 2)
+
+        self.client.post(reverse("tracker:application_delete", args=[application.pk]))
+        self.assertEqual(self.stored()["total"], 0)
+
+        lead = JobLead.objects.create(owner=self.user, title="Engineer", company="Initech")
+        self.client.post(reverse("tracker:lead_convert", args=[lead.pk]))
+        self.assertEqual(self.stored()["by_status"][Application.Status.WISHLIST], 1)
+
+    def test_reconcile_command_repairs_drift(self):
+        self.create_application(owner=self.user, status=Application.Status.OFFER)
+        PipelineCounters.objects.create(owner=self.user, computed_on=self.today)
+
+        call_command("reconcile_pipeline_counters", stdout=io.StringIO())
+
+        self.assertEqual(self.stored()["by_status"][Application.Status.OFFER], 1)
+
+
+@override_settings(TRACKER_FRAGMENT_CACHE=True)
+class FragmentCacheTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("fragments")
+        self.client.login(username="fragments", password="password123")
+        self.application = self.create_application(
+            owner=self.user,
+            company="Cachely",
+            follow_up_on=timezone.localdate(),
+        )
+        FollowUp.objects.create(application=self.application, due_on=timezone.localdate())
+
+    def get(self, view, **params):
+        return self.client.get(reverse("tracker:application_list"), {"view": view, **params})
+
+    def test_unchanged_reload_renders_without_data_queries(self):
+        for view in ("list", "board", "followups"):
+            with self.subTest(view=view):
+                first = self.get(view)
+                # Only the session, user, validator and profile lookups remain.
+                with self.assertNumQueries(4):
+                    second = self.get(view)
+                self.assertContains(second, "Cachely")
+                self.assertEqual(
+                    first.content.decode().count("Cachely"),
+                    second.content.decode().count("Cachely"),
+                )
+
+    def test_edit_invalidates_cached_fragments(self):
+        self.get("list")
+        self.get("board")
+
+        self.client.post(
+            reverse("tracker:application_patch", args=[self.application.pk]),
+            data=json.dumps({"company": "Renamed Co"}),
+            content_type="application/json",
+        )
+
+        self.assertContains(self.get("list"), "Renamed Co")
+        self.assertContains(self.get("board"), "Renamed Co")
+
+    def test_followup_change_invalidates_followups_view(self):
+        self.get("followups")
+        FollowUp.objects.create(
+            application=self.application,
+            due_on=timezone.localdate(),
+            note="Send portfolio",
+        )
+
+        self.assertContains(self.get("followups"), "Send portfolio")
+
+    def test_filters_are_cached_separately(self):
+        other = self.create_application(owner=self.user, company="Elsewhere", status=Application.Status.OFFER)
+        self.get("list")
+
+        response = self.get("list", status=Application.Status.OFFER)
+
+        self.assertContains(response, "Elsewhere")
+        self.assertNotContains(response, "Cachely")
+        self.assertTrue(other.pk)
+
+    def test_other_users_do_not_share_fragments(self):
+        self.get("list")
+        self.create_user("neighbour")
+        self.client.login(username="neighbour", password="password123")
+
+        self.assertNotContains(self.get("list"), "Cachely")
+
+    def test_partial_view_reuses_page_fragment(self):
+        self.get("board")
+
+        with self.assertNumQueries(2):
+            response = self.client.get(reverse("tracker:application_view_partial", args=["board"]))
+
+        self.assertContains(response, "Cachely")
+
+    def test_cascade_deletes_bump_once_without_per_followup_queries(self):
+        FollowUp.objects.bulk_create(
+            FollowUp(application=self.application, due_on=timezone.localdate(), note=f"Note {index}")
+            for index in range(40)
+        )
+        self.get("followups")
+
+        with mock.patch("tracker.models.bump_data_version", wraps=bump_data_version) as bump:
+            # Collect the follow-ups, delete them, delete the application.
+            with self.assertNumQueries(3):
+                self.application.delete()
+
+        bump.assert_called_once_with(self.user.pk)
+        self.assertNotContains(self.get("followups"), "Note 1")
+
+    def test_deleting_a_followup_invalidates_followups_view(self):
+        followup = FollowUp.objects.create(application=self.application, due_on=timezone.localdate(), note="Obsolete")
+        self.get("followups")
+
+        followup.delete()
+
+        self.assertNotContains(self.get("followups"), "Obsolete")
+
+    @override_settings(TRACKER_FRAGMENT_CACHE=False)
+    def test_disabled_cache_renders_every_request(self):
+        self.get("list")
+        # A write that skips the signals, so only a fresh render shows it.
+        JobLead.objects.filter(pk=self.application.job_id).update(company="Uncached Co")
+
+        self.assertContains(self.get("list"), "Uncached Co")
+
+
+class ConditionalGetTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("etag")
+        self.client.login(username="etag", password="password123")
+        self.application = self.create_application(owner=self.user, company="Validated")
+
+    def test_unchanged_list_returns_304_without_rendering(self):
+        url = reverse("tracker:application_list")
+        first = self.client.get(url)
+        self.assertTrue(first.has_header("ETag"))
+        self.assertTrue(first.has_header("Last-Modified"))
+
+        # Session, user and the validator query; no rendering.
+        with self.assertNumQueries(3):
+            second = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        self.assertEqual(second.status_code, 304)
+        self.assertEqual(second.content, b"")
+
+    def test_edits_and_deletes_change_the_etag(self):
+        url = reverse("tracker:application_list")
+        etag = self.client.get(url)["ETag"]
+
+        other = self.create_application(owner=self.user, company="Second")
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+        etag = self.client.get(url)["ETag"]
+        other.delete()
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 200)
+
+    def test_filters_have_their_own_etag(self):
+        url = reverse("tracker:application_list")
+        etag = self.client.get(url)["ETag"]
+
+        response = self.client.get(url, {"status": Application.Status.OFFER}, HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+
+    def test_lead_inbox_honours_if_modified_since(self):
+        url = reverse("tracker:lead_list")
+        first = self.client.get(url)
+
+        response = self.client.get(url, HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+        self.assertEqual(response.status_code, 304)
+
+    def test_other_users_changes_do_not_affect_etag(self):
+        url = reverse("tracker:lead_list")
+        etag = self.client.get(url)["ETag"]
+
+        self.create_application(owner=self.create_user("someone_else"))
+
+        self.assertEqual(self.client.get(url, HTTP_IF_NONE_MATCH=etag).status_code, 304)
+
+
+class LeadIngestTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("ingest")
+        self.client.login(username="ingest", password="password123")
+
+    def post(self, body, content_type="application/x-ndjson", **params):
+        url = reverse("tracker:lead_ingest")
+        if params:
+            url = f"{url}?{urlencode(params)}"
+        return self.client.post(url, data=body, content_type=content_type)
+
+    def test_ndjson_rows_are_created_in_batches(self):
+        body = "\n".join(
+            json.dumps({"title": f"Engineer {index}", "company": "Acme", "job_url": f"https://jobs.example/{index}"})
+            for index in range(5)
+        )
+
+        # Five inserts in two batches: a fingerprint lookup, one INSERT and a
+        # savepoint pair each, plus seven queries (in a savepoint) updating
+        # the similar-leads index, on top of session, user and profile lookups.
+        with self.assertNumQueries(3 + 2 * (4 + 7)):
+            response = self.post(body, batch_size=3, source=JobLead.Source.RSS)
+
+        payload = response.json()
+        self.assertTrue(payload["ok"])
+        self.assertEqual(payload["created"], 5)
+        leads = JobLead.objects.filter(owner=self.user)
+        self.assertEqual(leads.count(), 5)
+        self.assertEqual(set(leads.values_list("source", flat=True)), {JobLead.Source.RSS})
+        self.assertFalse(Application.objects.filter(owner=self.user).exists())
+
+    def test_json_array_reports_row_errors(self):
+        body = json.dumps(
+            [
+                {"title": "Backend", "company": "Acme", "work_mode": "REMOTE"},
+                {"company": "No Title"},
+                {"title": "Bad URL", "company": "Acme", "job_url": "not a url"},
+                "just a string",
+            ]
+        )
+
+        response = self.post(body, content_type="application/json")
+
+        payload = response.json()
+        self.assertFalse(payload["ok"])
+        self.assertEqual(payload["created"], 1)
+        self.assertEqual(payload["failed"], 3)
+        self.assertEqual([error["row"] for error in payload["errors"]], [2, 3, 4])
+        self.assertIn("title", payload["errors"][0]["errors"])
+        self.assertIn("job_url", payload["errors"][1]["errors"])
+        self.assertEqual(JobLead.objects.get(owner=self.user).work_mode, JobLead.WorkMode.REMOTE)
+
+    def test_invalid_ndjson_line_does_not_stop_the_run(self):
+        body = '{"title": "One", "company": "A"}\n{broken\n{"title": "Two", "company": "B"}\n'
+
+        payload = self.post(body).json()
+
+        self.assertEqual(payload["created"], 2)
+        self.assertEqual(payload["errors"][0]["row"], 2)
+
+    def test_rejects_unknown_source(self):
+        response = self.post("", source="CARRIER_PIGEON")
+
+        self.assertEqual(response.status_code, 400)
+
+    def test_management_command_reads_file(self):
+        path = Path(self.enterContext(tempfile.TemporaryDirectory())) / "leads.ndjson"
+        path.write_text('{"title": "Data", "company": "Initech"}\n{"title": ""}\n', encoding="utf-8")
+        stdout, stderr = io.StringIO(), io.StringIO()
+
+        call_command("ingest_leads", str(path), user="ingest", source="EMAIL", stdout=stdout, stderr=stderr)
+
+        self.assertIn("Created 1 leads; 1 rows failed.", stdout.getvalue())
+        self.assertIn("Row 2:", stderr.getvalue())
+        self.assertEqual(JobLead.objects.get(owner=self.user).source, JobLead.Source.EMAIL)
+
+
+RSS_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">
+  <channel>
+    <title>Remote Board</title>
+    {items}
+  </channel>
+</rss>
+"""
+
+RSS_ITEM = """<item>
+  <title>{title}</title>
+  <link>https://jobs.example/{guid}</link>
+  <guid>{guid}</guid>
+  <description>&lt;p&gt;Build &amp;amp; ship APIs.&lt;/p&gt;</description>
+</item>"""
+
+ATOM_FEED = """<?xml version="1.0" encoding="utf-8"?>
+<feed xmlns="http://www.w3.org/2005/Atom">
+  <title>Atom Jobs</title>
+  <entry>
+    <title>Initech: Platform Engineer</title>
+    <id>urn:uuid:1</id>
+    <link rel="alternate" href="https://atom.example/1"/>
+    <summary>Kubernetes things.</summary>
+  </entry>
+</feed>
+"""
+
+
+class FeedStandInHandler(BaseHTTPRequestHandler):
+    """Serves ``server.feeds[path]``, honouring If-None-Match."""
+
+    def do_GET(self):
+        feed = self.server.feeds.get(self.path)
+        self.server.requests.append((self.path, self.headers.get("If-None-Match")))
+        if feed is None:
+            self.send_response(404)
+            self.end_headers()
+            return
+        body = feed.encode("utf-8")
+        etag = '"%s"' % hashlib.md5(body).hexdigest()
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.end_headers()
+            return
+        if "gzip" in self.headers.get("Accept-Encoding", "") and self.path.endswith(".gz"):
+            body = gzip.compress(body)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/rss+xml")
+        self.send_header("ETag", etag)
+        if self.path.endswith(".partial"):
+            # A chunk that promises more bytes than arrive before the close.
+            self.send_header("Transfer-Encoding", "chunked")
+            self.end_headers()
+            self.wfile.write(b"%x\r\n" % (len(body) + 100) + body)
+            return
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class FeedPollerTests(BaseTestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), FeedStandInHandler)
+        cls.server.feeds = {}
+        cls.server.requests = []
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.addClassCleanup(cls.server.server_close)
+        cls.addClassCleanup(cls.server.shutdown)
+
+    def setUp(self):
+        self.user = self.create_user("feeds")
+        self.server.feeds.clear()
+        self.server.requests.clear()
+
+    def url(self, path):
+        return f"http://127.0.0.1:{self.server.server_port}{path}"
+
+    def subscribe(self, path):
+        return FeedSubscription.objects.create(owner=self.user, url=self.url(path))
+
+    def poll(self):
+        stdout = io.StringIO()
+        call_command("poll_feeds", stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def rss(self, *items):
+        return RSS_FEED.format(items="".join(RSS_ITEM.format(title=title, guid=guid) for guid, title in items))
+
+    def test_new_entries_become_leads_and_unchanged_feed_costs_304(self):
+        self.server.feeds["/jobs.rss"] = self.rss(("a1", "Backend Engineer at Acme"), ("a2", "Designer"))
+        subscription = self.subscribe("/jobs.rss")
+
+        self.assertIn("created 2 leads", self.poll())
+        leads = {lead.title: lead for lead in JobLead.objects.filter(owner=self.user)}
+        self.assertEqual(leads["Backend Engineer"].company, "Acme")
+        self.assertEqual(leads["Designer"].company, "Remote Board")
+        self.assertEqual(leads["Designer"].source, JobLead.Source.RSS)
+        self.assertEqual(leads["Designer"].jd_text, "Build & ship APIs.")
+        subscription.refresh_from_db()
+        self.assertEqual(subscription.title, "Remote Board")
+        self.assertTrue(subscription.etag)
+
+        output = self.poll()
+
+        self.assertIn("1 not modified", output)
+        self.assertEqual(self.server.requests[-1][1], subscription.etag)
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 2)
+
+    def test_seen_entries_are_skipped_when_feed_changes(self):
+        self.server.feeds["/jobs.rss"] = self.rss(("a1", "Backend Engineer at Acme"))
+        self.subscribe("/jobs.rss")
+        self.poll()
+
+        self.server.feeds["/jobs.rss"] = self.rss(("a2", "SRE at Globex"), ("a1", "Backend Engineer at Acme"))
+
+        self.assertIn("created 1 leads", self.poll())
+        self.assertEqual(
+            sorted(JobLead.objects.filter(owner=self.user).values_list("company", flat=True)),
+            ["Acme", "Globex"],
+        )
+
+    def test_polls_many_feeds_and_records_failures(self):
+        self.server.feeds["/atom.xml"] = ATOM_FEED
+        self.server.feeds["/jobs.rss.gz"] = self.rss(("g1", "Analyst at Umbrella"))
+        self.subscribe("/atom.xml")
+        self.subscribe("/jobs.rss.gz")
+        missing = self.subscribe("/missing.rss")
+
+        output = self.poll()
+
+        self.assertIn("Polled 3 feeds: 2 updated, 0 not modified, 1 failed", output)
+        atom_lead = JobLead.objects.get(owner=self.user, company="Initech")
+        self.assertEqual(atom_lead.title, "Platform Engineer")
+        self.assertEqual(atom_lead.job_url, "https://atom.example/1")
+        self.assertTrue(JobLead.objects.filter(owner=self.user, company="Umbrella").exists())
+        missing.refresh_from_db()
+        self.assertEqual(missing.last_status, 404)
+        self.assertEqual(missing.last_error, "HTTP 404")
+
+    def test_truncated_feed_and_failed_ingest_only_fail_their_subscription(self):
+        self.server.feeds["/jobs.rss.partial"] = self.rss(("t1", "Analyst at Umbrella"))
+        self.server.feeds["/boom.rss"] = self.rss(("b1", "Engineer at Boom"))
+        self.server.feeds["/jobs.rss"] = self.rss(("a1", "Backend Engineer at Acme"))
+        truncated = self.subscribe("/jobs.rss.partial")
+        broken = self.subscribe("/boom.rss")
+        self.subscribe("/jobs.rss")
+
+        def ingest(records, owner, **kwargs):
+            records = list(records)
+            if any(record["company"] == "Boom" for _, record in records):
+                raise DatabaseError("ingest failed")
+            return ingest_leads(records, owner, **kwargs)
+
+        with mock.patch("tracker.feeds.ingest_leads", side_effect=ingest):
+            output = self.poll()
+
+        self.assertIn("Polled 3 feeds: 1 updated, 0 not modified, 2 failed", output)
+        self.assertEqual(list(JobLead.objects.filter(owner=self.user).values_list("company", flat=True)), ["Acme"])
+        truncated.refresh_from_db()
+        self.assertIn("IncompleteRead", truncated.last_error)
+        broken.refresh_from_db()
+        self.assertEqual((broken.last_error, broken.etag), ("ingest failed", ""))
+        self.assertFalse(FeedEntry.objects.filter(subscription=broken).exists())
+
+
+LINKEDIN_ALERT_HTML = """<html><body>
+<p>Your job alert for backend</p>
+<a href="https://www.linkedin.com/comm/jobs/view/111/?trackingId=abc&amp;refId=x">Backend Engineer</a>
+<p>Acme · Berlin, Germany</p>
+<a href="https://www.linkedin.com/comm/jobs/view/222/?trackingId=def">Data Engineer</a>
+<p>Globex · Remote</p>
+<a href="https://www.linkedin.com/comm/jobs/view/111/?trackingId=zzz">Backend Engineer</a>
+<a href="https://www.linkedin.com/comm/settings">Unsubscribe</a>
+</body></html>"""
+
+
+def alert_message(message_id, sender, subject, html=None, text=None):
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = "me@example.com"
+    message["Subject"] = subject
+    if message_id:
+        message["Message-ID"] = message_id
+    message.set_content(text or "See the HTML version.")
+    if html:
+        message.add_alternative(html, subtype="html")
+    return message
+
+
+class EmailAlertTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("alerts")
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def ingest(self, path):
+        stdout = io.StringIO()
+        call_command("ingest_email_alerts", str(path), user="alerts", stdout=stdout, stderr=io.StringIO())
+        return stdout.getvalue()
+
+    def write_mbox(self, *messages):
+        path = Path(self.tempdir.name) / "alerts.mbox"
+        box = mailbox.mbox(path)
+        for message in messages:
+            box.add(message)
+        box.flush()
+        box.close()
+        return path
+
+    def test_mbox_alerts_become_leads_and_reruns_are_incremental(self):
+        linkedin = alert_message("<li-1@linkedin.com>", "LinkedIn Job Alerts <jobalerts-noreply@linkedin.com>",
+                                 "Backend jobs", html=LINKEDIN_ALERT_HTML)
+        indeed = alert_message(
+            "<in-1@indeed.com>",
+            "Indeed <alert@indeed.com>",
+            "New jobs",
+            text="SRE at Initech\nhttps://www.indeed.com/rc/clk?jk=9f3a&from=ja&utm_source=x\n",
+        )
+        newsletter = alert_message("<news-1@example.com>", "News <news@example.com>", "Weekly digest",
+                                   text="Nothing to see here.")
+        path = self.write_mbox(linkedin, indeed, newsletter)
+
+        output = self.ingest(path)
+
+        self.assertIn("Read 3 messages: 0 already processed, 3 new (1 without job links)", output)
+        self.assertIn("created 3 leads", output)
+        leads = {lead.title: lead for lead in JobLead.objects.filter(owner=self.user)}
+        self.assertEqual(leads["Backend Engineer"].company, "Acme")
+        self.assertEqual(leads["Backend Engineer"].location, "Berlin, Germany")
+        self.assertEqual(leads["Backend Engineer"].job_url, "https://www.linkedin.com/jobs/view/111/")
+        self.assertEqual(leads["Backend Engineer"].source, JobLead.Source.EMAIL)
+        self.assertEqual(leads["Data Engineer"].location, "Remote")
+        self.assertEqual(leads["SRE"].company, "Initech")
+        self.assertEqual(leads["SRE"].job_url, "https://www.indeed.com/viewjob?jk=9f3a")
+        self.assertEqual(ProcessedEmail.objects.filter(owner=self.user).count(), 3)
+
+        followup = alert_message("<li-2@linkedin.com>", "LinkedIn <jobs@linkedin.com>", "More jobs",
+                                 html='<a href="https://linkedin.com/jobs/view/333">QA Lead at Hooli</a>')
+        path = self.write_mbox(followup)
+
+        output = self.ingest(path)
+
+        self.assertIn("Read 4 messages: 3 already processed, 1 new", output)
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 4)
+        self.assertTrue(JobLead.objects.filter(owner=self.user, title="QA Lead", company="Hooli").exists())
+
+    def test_maildir_skips_processed_messages_without_reading_them(self):
+        box = mailbox.Maildir(Path(self.tempdir.name) / "Maildir")
+        box.add(alert_message(None, "Careers <jobs@acme.example>", "Opening",
+                              html='<a href="https://boards.greenhouse.io/acme/jobs/1">Staff Engineer</a>'))
+        box.add(alert_message("<dup@example.com>", "Acme <jobs@acme.example>", "Opening",
+                              html='<a href="https://acme.example/careers/2">Designer - Acme - Remote</a>'))
+        path = Path(self.tempdir.name) / "Maildir"
+
+        self.assertIn("created 2 leads", self.ingest(path))
+        self.assertTrue(JobLead.objects.filter(owner=self.user, title="Staff Engineer", company="Careers").exists())
+        self.assertTrue(JobLead.objects.filter(owner=self.user, title="Designer", location="Remote").exists())
+
+        with mock.patch("tracker.email_alerts._read_file") as read_file:
+            output = self.ingest(path)
+
+        read_file.assert_not_called()
+        self.assertIn("Read 2 messages: 2 already processed, 0 new", output)
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 2)
+
+    def test_unknown_charsets_do_not_abort_the_run(self):
+        path = Path(self.tempdir.name) / "charsets.mbox"
+        path.write_bytes(
+            b"From alerts@example.com Mon Oct 12 09:00:00 2026\n"
+            b"From: LinkedIn <jobalerts-noreply@linkedin.com>\n"
+            b"Message-ID: <odd-1@linkedin.com>\n"
+            b"Content-Type: text/html; charset=x-no-such-charset\n\n"
+            + LINKEDIN_ALERT_HTML.encode("utf-8")
+            + b"\n\nFrom alerts@example.com Mon Oct 12 09:05:00 2026\n"
+            b"From: Careers <jobs@initech.example>\n"
+            b"Message-ID: <broken-1@initech.example>\n"
+            b"Content-Type: text/plain\n\n"
+            b"Designer at Initech\nhttps://initech.example/careers/2\n"
+        )
+
+        real_extract = GenericExtractor.extract
+
+        def extract(extractor, message):
+            if "broken" in message["Message-ID"]:
+                raise LookupError("unknown encoding")
+            return real_extract(extractor, message)
+
+        with mock.patch.object(GenericExtractor, "extract", extract):
+            output = self.ingest(path)
+
+        self.assertIn("Read 2 messages: 0 already processed, 1 new (0 without job links), 1 unreadable", output)
+        self.assertEqual(
+            set(JobLead.objects.filter(owner=self.user).values_list("title", flat=True)),
+            {"Backend Engineer", "Data Engineer"},
+        )
+
+
+class LeadFingerprintTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("dedupe")
+        self.client.login(username="dedupe", password="password123")
+
+    def quick_add(self, **payload):
+        return self.client.post(
+            reverse("tracker:application_quick_add"),
+            data=json.dumps(payload),
+            content_type="application/json",
+        )
+
+    def test_canonical_url_ignores_tracking_and_cosmetic_differences(self):
+        self.assertEqual(
+            canonical_url("http://www.Jobs.example/role/42/?utm_source=rss&b=2&a=1#apply"),
+            canonical_url("https://jobs.example/role/42?a=1&b=2&trk=email"),
+        )
+        self.assertNotEqual(canonical_url("https://jobs.example/role/42"), canonical_url("https://jobs.example/role/43"))
+        self.assertEqual(
+            lead_fingerprint("", "Acme, Inc.", "Backend  Engineer", "Berlin"),
+            lead_fingerprint("", "acme", "backend engineer", "BERLIN"),
+        )
+
+    def test_quick_add_merges_into_lead_then_rejects_repeat(self):
+        lead = JobLead.objects.create(owner=self.user, company="Acme Inc", title="Engineer", source="RSS")
+
+        response = self.quick_add(company="ACME", title="engineer")
+
+        payload = response.json()
+        self.assertTrue(payload["merged"])
+        self.assertEqual(Application.objects.get(pk=payload["id"]).job, lead)
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 1)
+
+        response = self.quick_add(company="Acme", title="Engineer")
+
+        self.assertEqual(response.status_code, 409)
+        self.assertEqual(response.json()["id"], payload["id"])
+        self.assertEqual(Application.objects.filter(owner=self.user).count(), 1)
+
+    def test_duplicates_are_scoped_to_owner(self):
+        other = self.create_user("someone-else")
+        JobLead.objects.create(owner=other, company="Acme", title="Engineer")
+
+        payload = self.quick_add(company="Acme", title="Engineer").json()
+
+        self.assertFalse(payload["merged"])
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 1)
+
+    def test_create_form_reuses_lead_by_url_and_rejects_tracked_job(self):
+        lead = JobLead.objects.create(
+            owner=self.user, company="Globex", title="SRE", job_url="https://globex.example/jobs/7"
+        )
+        data = {
+            "company": "Globex Corporation",
+            "title": "Site Reliability Engineer",
+            "location": "Remote",
+            "work_mode": JobLead.WorkMode.REMOTE,
+            "source": JobLead.Source.MANUAL,
+            "job_url": "https://www.globex.example/jobs/7/?utm_campaign=x",
+            "status": Application.Status.APPLIED,
+        }
+
+        response = self.client.post(reverse("tracker:application_create"), data=data)
+
+        self.assertEqual(response.status_code, 302)
+        application = Application.objects.get(owner=self.user)
+        self.assertEqual(application.job, lead)
+        lead.refresh_from_db()
+        self.assertEqual(lead.location, "Remote")
+        self.assertEqual(lead.title, "SRE")
+
+        response = self.client.post(reverse("tracker:application_create"), data=data)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertContains(response, "already tracking this job")
+        self.assertEqual(Application.objects.filter(owner=self.user).count(), 1)
+
+    def test_ingest_skips_existing_and_repeated_rows(self):
+        JobLead.objects.create(owner=self.user, company="Acme", title="Engineer", job_url="https://acme.example/j/1")
+        body = "\n".join(
+            json.dumps(row)
+            for row in [
+                {"title": "Engineer", "company": "Acme", "job_url": "https://acme.example/j/1?ref=feed"},
+                {"title": "Designer", "company": "Acme", "job_url": "https://acme.example/j/2"},
+                {"title": "Designer (repost)", "company": "Acme", "job_url": "http://acme.example/j/2/"},
+            ]
+        )
+
+        payload = self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson").json()
+
+        self.assertEqual((payload["created"], payload["duplicates"]), (1, 2))
+        self.assertEqual(JobLead.objects.filter(owner=self.user).count(), 2)
+
+    def test_ingest_survives_urls_with_bad_ports(self):
+        body = "\n".join(
+            json.dumps(row)
+            for row in [
+                {"title": "Engineer", "company": "Acme", "job_url": "https://acme.example:99999/job"},
+                {"title": "Designer", "company": "Acme", "job_url": "http://acme.example:abc/"},
+                {"title": "Writer", "company": "Acme", "job_url": "https://acme.example/j/3"},
+            ]
+        )
+
+        response = self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson")
+
+        self.assertEqual(response.status_code, 200)
+        payload = response.json()
+        self.assertEqual(payload["created"], 2)
+        self.assertEqual([error["row"] for error in payload["errors"]], [2])
+        lead = JobLead.objects.get(owner=self.user, title="Engineer")
+        self.assertEqual(lead.fingerprint, lead_fingerprint("https://acme.example:99999/job"))
+
+    def test_editing_lead_fields_refreshes_fingerprint(self):
+        application = self.create_application(owner=self.user, company="Acme", title="Engineer")
+
+        self.client.post(
+            reverse("tracker:application_patch", args=[application.pk]),
+            data=json.dumps({"title": "Staff Engineer"}),
+            content_type="application/json",
+        )
+
+        application.job.refresh_from_db()
+        self.assertEqual(application.job.fingerprint, lead_fingerprint("", "Acme", "Staff Engineer", ""))
+
+
+JOB_DESCRIPTION = (
+    "We are looking for a backend engineer to design, build and operate the services behind our "
+    "payments platform. You will own APIs end to end, from data modelling in Postgres to deployment "
+    "on Kubernetes, and work closely with product and support to ship reliable features every week. "
+    "Experience with Python, Django, message queues and observability tooling is expected; exposure "
+    "to card networks, reconciliation or ledger systems is a strong plus. We offer a remote-first "
+    "team across Europe, a learning budget, and a calm on-call rotation with generous time off."
+)
+REPOSTED_DESCRIPTION = JOB_DESCRIPTION.replace("every week", "every sprint").replace(
+    "generous time off", "generous paid leave"
+)
+UNRELATED_DESCRIPTION = (
+    "Join our design studio as a senior illustrator creating editorial artwork for magazines, book "
+    "covers and brand campaigns. You will sketch concepts, present them to art directors, and deliver "
+    "final pieces in print and digital formats while mentoring two junior illustrators in the studio."
+)
+
+
+class NearDuplicateTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("reposts")
+        self.client.login(username="reposts", password="password123")
+
+    def ingest(self, *rows):
+        body = "\n".join(json.dumps(row) for row in rows)
+        return self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson")
+
+    def test_signature_similarity_tracks_text_overlap(self):
+        original = signature_for_text(JOB_DESCRIPTION)
+
+        self.assertEqual(similarity(original, signature_for_text(JOB_DESCRIPTION)), 1.0)
+        self.assertGreater(similarity(original, signature_for_text(REPOSTED_DESCRIPTION)), 0.7)
+        self.assertLess(similarity(original, signature_for_text(UNRELATED_DESCRIPTION)), 0.2)
+        self.assertEqual(signature_for_text("Too short to compare."), b"")
+
+    def test_reposted_lead_is_flagged_at_ingestion_and_in_inbox(self):
+        self.ingest({"title": "Backend Engineer", "company": "Acme", "jd_text": JOB_DESCRIPTION})
+        self.ingest(
+            {"title": "Backend Engineer (Payments)", "company": "Acme", "jd_text": REPOSTED_DESCRIPTION},
+            {"title": "Illustrator", "company": "Studio", "jd_text": UNRELATED_DESCRIPTION},
+        )
+
+        original = JobLead.objects.get(title="Backend Engineer")
+        repost = JobLead.objects.get(title="Backend Engineer (Payments)")
+        self.assertEqual(repost.near_duplicate_of, original)
+        self.assertGreater(repost.near_duplicate_score, 0.7)
+        self.assertIsNone(original.near_duplicate_of)
+        self.assertIsNone(JobLead.objects.get(title="Illustrator").near_duplicate_of)
+
+        response = self.client.get(reverse("tracker:lead_list"), {"duplicate": "1"})
+
+        self.assertEqual([lead.pk for lead in response.context["leads"]], [repost.pk])
+        self.assertContains(response, "Possible duplicate")
+        self.assertContains(response, "similar to Acme - Backend Engineer")
+
+    def test_editing_an_original_rechecks_its_copies(self):
+        self.ingest({"title": "Backend Engineer", "company": "Acme", "jd_text": JOB_DESCRIPTION})
+        self.ingest({"title": "Backend Engineer (Payments)", "company": "Acme", "jd_text": REPOSTED_DESCRIPTION})
+        original = JobLead.objects.get(title="Backend Engineer")
+        repost = JobLead.objects.get(title="Backend Engineer (Payments)")
+        self.assertEqual(repost.near_duplicate_of, original)
+
+        self.client.post(
+            reverse("tracker:lead_patch", args=[original.pk]),
+            data=json.dumps({"jd_text": UNRELATED_DESCRIPTION}),
+            content_type="application/json",
+        )
+
+        repost.refresh_from_db()
+        self.assertIsNone(repost.near_duplicate_of)
+        self.assertIsNone(repost.near_duplicate_score)
+        response = self.client.get(reverse("tracker:lead_list"), {"duplicate": "1"})
+        self.assertEqual(list(response.context["leads"]), [])
+
+    def test_backfill_indexes_existing_leads_in_parallel(self):
+        original = JobLead.objects.create(owner=self.user, company="Acme", title="Engineer", jd_text=JOB_DESCRIPTION)
+        repost = JobLead.objects.create(owner=self.user, company="Acme", title="SWE", jd_text=REPOSTED_DESCRIPTION)
+        other = self.create_user("other-owner")
+        JobLead.objects.create(owner=other, company="Acme", title="Engineer", jd_text=JOB_DESCRIPTION)
+        stdout = io.StringIO()
+
+        call_command("index_near_duplicates", workers=2, batch_size=1, stdout=stdout)
+
+        self.assertIn("Indexed 3 leads; flagged 1 possible duplicates.", stdout.getvalue())
+        repost.refresh_from_db()
+        self.assertEqual(repost.near_duplicate_of, original)
+
+        stdout = io.StringIO()
+        call_command("index_near_duplicates", workers=1, stdout=stdout)
+
+        self.assertIn("Indexed 0 leads", stdout.getvalue())
+
+
+RELATED_DESCRIPTION = (
+    "Globex is hiring a backend engineer for its payments team. You will build Python APIs backed by "
+    "Postgres, deploy services on Kubernetes and own them end to end alongside product and support."
+)
+
+
+class SimilarLeadTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("lookalikes")
+        self.client.login(username="lookalikes", password="password123")
+        body = "\n".join(
+            json.dumps(row)
+            for row in [
+                {"title": "Backend Engineer", "company": "Acme", "jd_text": JOB_DESCRIPTION},
+                {"title": "Payments Engineer", "company": "Globex", "jd_text": RELATED_DESCRIPTION},
+                {"title": "Illustrator", "company": "Studio", "jd_text": UNRELATED_DESCRIPTION},
+            ]
+        )
+        self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson")
+        self.backend = JobLead.objects.get(title="Backend Engineer")
+        self.illustrator = JobLead.objects.get(title="Illustrator")
+
+    def term_counts(self):
+        return dict(LeadTermCount.objects.filter(owner=self.user).values_list("term", "leads"))
+
+    def assert_counts_match_rebuild(self):
+        live = self.term_counts()
+        call_command("index_similar_leads", rebuild=True, stdout=io.StringIO())
+        self.assertEqual(self.term_counts(), live)
+
+    def test_quick_view_lists_similar_leads(self):
+        response = self.client.get(reverse("tracker:lead_quick", args=[self.backend.pk]))
+
+        similar = response.context["similar_leads"]
+        self.assertEqual([lead.title for lead in similar], ["Payments Engineer"])
+        self.assertGreater(similar[0].similarity, 0.1)
+        self.assertContains(response, "Similar leads")
+
+    def test_application_editor_shows_leads_similar_to_its_job(self):
+        self.client.post(reverse("tracker:lead_convert", args=[self.backend.pk]))
+        application = Application.objects.get(job=self.backend)
+
+        response = self.client.get(reverse("tracker:application_edit", args=[application.pk]))
+
+        self.assertEqual([lead.title for lead in response.context["similar_leads"]], ["Payments Engineer"])
+
+    def test_edits_and_deletes_update_the_index_incrementally(self):
+        self.client.post(
+            reverse("tracker:lead_patch", args=[self.illustrator.pk]),
+            data=json.dumps({"title": "Backend Engineer II", "jd_text": REPOSTED_DESCRIPTION}),
+            content_type="application/json",
+        )
+
+        response = self.client.get(reverse("tracker:lead_quick", args=[self.backend.pk]))
+        self.assertEqual(response.context["similar_leads"][0].title, "Backend Engineer II")
+        self.assert_counts_match_rebuild()
+
+        self.client.post(reverse("tracker:lead_convert", args=[self.illustrator.pk]))
+        self.client.post(
+            reverse("tracker:application_delete", args=[Application.objects.get(job=self.illustrator).pk])
+        )
+
+        self.assertFalse(JobLead.objects.filter(pk=self.illustrator.pk).exists())
+        self.assert_counts_match_rebuild()
+
+    def test_backfill_indexes_leads_created_outside_ingestion(self):
+        original = JobLead.objects.create(owner=self.user, company="Initech", title="SWE", jd_text=JOB_DESCRIPTION)
+        stdout = io.StringIO()
+
+        call_command("index_similar_leads", stdout=stdout)
+
+        self.assertIn("Indexed 1 leads", stdout.getvalue())
+        response = self.client.get(reverse("tracker:lead_quick", args=[original.pk]))
+        self.assertEqual(response.context["similar_leads"][0], self.backend)
+
+        stdout = io.StringIO()
+        call_command("index_similar_leads", stdout=stdout)
+
+        self.assertIn("Indexed 0 leads", stdout.getvalue())
+
+
+SCAM_DESCRIPTION = (
+    "Work from home as a payment processing agent! No experience needed, earn $1,500 per day. "
+    "Contact our recruiter on Telegram for an instant interview. A small registration fee "
+    "covers your starter kit and is paid in gift cards."
+)
+
+
+class ScamScoringTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("scams")
+        self.client.login(username="scams", password="password123")
+
+    def test_signals_cover_text_salary_url_and_company(self):
+        self.assertEqual(
+            lead_signals("Remote agent", "Confidential", "https://bit.ly/abc", SCAM_DESCRIPTION),
+            [
+                "upfront_payment",
+                "payment_channel",
+                "chat_only_contact",
+                "easy_money",
+                "salary_too_good",
+                "suspicious_domain",
+                "missing_company",
+            ],
+        )
+        self.assertEqual(
+            lead_signals("Backend Engineer", "Acme", "https://acme.example/jobs/1", JOB_DESCRIPTION + " $70 per hour."),
+            [],
+        )
+
+    def test_ingestion_flags_suspected_scams_with_reasons(self):
+        body = "\n".join(
+            json.dumps(row)
+            for row in [
+                {"title": "Payment agent", "company": "Hiring", "jd_text": SCAM_DESCRIPTION},
+                {"title": "Backend Engineer", "company": "Acme", "jd_text": JOB_DESCRIPTION},
+            ]
+        )
+
+        self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson")
+
+        scam = JobLead.objects.get(title="Payment agent")
+        self.assertTrue(scam.is_scam_suspected)
+        self.assertGreaterEqual(scam.scam_score, 3)
+        self.assertIn("gift cards", scam.scam_reasons)
+        self.assertIn("No real company name", scam.scam_reasons)
+        legit = JobLead.objects.get(title="Backend Engineer")
+        self.assertEqual((legit.is_scam_suspected, legit.scam_score, legit.scam_reasons), (False, 0, ""))
+
+    def test_backfill_respects_hand_review_and_threshold(self):
+        reviewed = JobLead.objects.create(owner=self.user, company="Acme", title="Agent", jd_text=SCAM_DESCRIPTION)
+        self.client.post(
+            reverse("tracker:lead_patch", args=[reviewed.pk]),
+            data=json.dumps({"is_scam_suspected": False}),
+            content_type="application/json",
+        )
+        pushy = JobLead.objects.create(
+            owner=self.user, company="Acme", title="Sales", jd_text="Urgently hiring, limited spots available."
+        )
+        stdout = io.StringIO()
+
+        call_command("score_scam_leads", stdout=stdout)
+
+        self.assertIn("Scored 1 leads (threshold 3): 0 suspected, 1 updated.", stdout.getvalue())
+        reviewed.refresh_from_db()
+        self.assertFalse(reviewed.is_scam_suspected)
+        self.assertTrue(reviewed.scam_reviewed)
+        pushy.refresh_from_db()
+        self.assertEqual((pushy.scam_score, pushy.is_scam_suspected), (1, False))
+
+        with override_settings(TRACKER_SCAM_THRESHOLD=1):
+            call_command("score_scam_leads", stdout=io.StringIO())
+
+        pushy.refresh_from_db()
+        self.assertTrue(pushy.is_scam_suspected)
+        self.assertIn("urgency", pushy.scam_reasons)
+
+    def test_single_lead_writes_are_scored(self):
+        self.client.post(
+            reverse("tracker:application_create"),
+            data={
+                "company": "Hiring",
+                "title": "Payment agent",
+                "work_mode": JobLead.WorkMode.REMOTE,
+                "source": JobLead.Source.MANUAL,
+                "jd_text": SCAM_DESCRIPTION,
+                "status": Application.Status.WISHLIST,
+            },
+        )
+        self.assertTrue(JobLead.objects.get(title="Payment agent").is_scam_suspected)
+
+        self.client.post(
+            reverse("tracker:application_quick_add"),
+            data=json.dumps({"company": "Confidential", "title": "Assistant"}),
+            content_type="application/json",
+        )
+        lead = JobLead.objects.get(title="Assistant")
+        self.assertEqual((lead.scam_score, lead.is_scam_suspected), (1, False))
+
+        self.client.post(
+            reverse("tracker:lead_patch", args=[lead.pk]),
+            data=json.dumps({"jd_text": SCAM_DESCRIPTION}),
+            content_type="application/json",
+        )
+        lead.refresh_from_db()
+        self.assertTrue(lead.is_scam_suspected)
+
+        self.client.post(
+            reverse("tracker:lead_patch", args=[lead.pk]),
+            data=json.dumps({"is_scam_suspected": False}),
+            content_type="application/json",
+        )
+        self.client.post(
+            reverse("tracker:lead_patch", args=[lead.pk]),
+            data=json.dumps({"jd_text": SCAM_DESCRIPTION + " Apply today."}),
+            content_type="application/json",
+        )
+        lead.refresh_from_db()
+        self.assertFalse(lead.is_scam_suspected)
+
+
+class LeadRelevanceTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("triage")
+        self.client.login(username="triage", password="password123")
+        self.profile = UserProfile.objects.get(user=self.user)
+        self.profile.target_roles = "Backend Engineer, Data Engineer"
+        self.profile.target_companies = "Globex"
+        self.profile.preferred_locations = "Berlin; Remote"
+        self.profile.remote_preference = UserProfile.RemotePreference.REMOTE
+        self.profile.salary_expectation_min = 90000
+        self.profile.save()
+
+    def test_targeting_weighs_role_company_location_mode_and_pay(self):
+        targeting = Targeting(self.profile)
+
+        self.assertEqual(
+            targeting.score("Senior Backend Engineer", "Globex Inc", "Berlin, Germany", "REMOTE", "Pay: $95,000 - $120k"),
+            100,
+        )
+        self.assertEqual(targeting.score("Backend Developer", "Acme", "Paris", "ONSITE", ""), 20)
+        self.assertEqual(Targeting(None).score("Backend Engineer", "Globex", "Berlin", "REMOTE", ""), 0)
+
+    def test_ingested_leads_sort_by_stored_relevance(self):
+        body = "\n".join(
+            json.dumps(row)
+            for row in [
+                {"title": "Office Manager", "company": "Acme", "location": "Paris"},
+                {"title": "Backend Engineer", "company": "Globex", "location": "Berlin", "work_mode": "REMOTE"},
+                {"title": "Data Analyst", "company": "Initech", "location": "Berlin"},
+            ]
+        )
+        self.client.post(reverse("tracker:lead_ingest"), data=body, content_type="application/x-ndjson")
+
+        response = self.client.get(reverse("tracker:lead_list"), {"sort": "relevance"})
+
+        titles = [lead.title for lead in response.context["leads"]]
+        self.assertEqual(titles, ["Backend Engineer", "Data Analyst", "Office Manager"])
+        self.assertContains(response, "90% match")
+
+    def test_lead_edits_and_targeting_changes_rescore(self):
+        lead = JobLead.objects.create(owner=self.user, company="Acme", title="Office Manager")
+        self.assertEqual(lead.relevance_score, 0)
+
+        self.client.post(
+            reverse("tracker:lead_patch", args=[lead.pk]),
+            data=json.dumps({"title": "Data Engineer"}),
+            content_type="application/json",
+        )
+        lead.refresh_from_db()
+        # Full role match plus a third of the work-mode weight for an unknown mode.
+        self.assertEqual(lead.relevance_score, 45)
+
+        profile = UserProfile.objects.get(user=self.user)
+        profile.target_companies = "Acme"
+        profile.save()
+
+        lead.refresh_from_db()
+        self.assertEqual(lead.relevance_score, 65)
+
+    def test_unrelated_profile_changes_do_not_rescore(self):
+        JobLead.objects.create(owner=self.user, company="Acme", title="Data Engineer")
+        profile = UserProfile.objects.get(user=self.user)
+        profile.full_name = "Jo Doe"
+
+        with self.assertNumQueries(1):
+            profile.save()
+
+    def test_partially_loaded_profiles_refresh_and_rescore(self):
+        lead = JobLead.objects.create(owner=self.user, company="Acme", title="Office Manager")
+        profile = UserProfile.objects.only("pk", "user").get(user=self.user)
+        profile.refresh_from_db(fields=["updated_at"])
+        self.assertEqual(profile.target_companies, "Globex")
+
+        profile.full_name = "Jo Doe"
+        with self.assertNumQueries(1):
+            profile.save(update_fields=["full_name"])
+
+        profile = UserProfile.objects.only("pk", "user").get(user=self.user)
+        profile.target_roles = "Office Manager"
+        profile.save(update_fields=["target_roles"])
+        lead.refresh_from_db()
+        self.assertEqual(lead.relevance_score, 45)
+
+
+class LeadBulkActionTests(BaseTestCase):
+    def setUp(self):
+        self.user = self.create_user("bulk_triage")
+        self.client.login(username="bulk_triage", password="password123")
+        self.other_lead = JobLead.objects.create(company="Elsewhere", title="Engineer", owner=self.create_user("bystander"))
+
+    def bulk(self, action, ids):
+        return self.client.post(
+            reverse("tracker:lead_bulk"),
+            data=json.dumps({"action": action, "ids": ids}),
+            content_type="application/json",
+        )
+
+    def test_archive_is_one_update_for_any_number_of_leads(self):
+        JobLead.objects.bulk_create(
+            JobLead(company=f"Stale {index}", title="Engineer", owner=self.user) for index in range(300)
+        )
+        ids = [*JobLead.objects.filter(owner=self.user).values_list("pk", flat=True), self.other_lead.pk]
+
+        # Session and user lookups, then one UPDATE inside a savepoint.
+        with self.assertNumQueries(5):
+            response = self.bulk("archive", ids)
+
+        self.assertEqual(response.json(), {"ok": True, "action": "archive", "updated": 300})
+        self.assertFalse(JobLead.objects.filter(owner=self.user, is_archived=False).exists())
+        self.assertFalse(JobLead.objects.filter(owner=self.user, archived_at__isnull=True).exists())
+        self.other_lead.refresh_from_db()
+        self.assertFalse(self.other_lead.is_archived)
+
+        self.assertEqual(self.bulk("archive", ids).json()["updated"], 0)
+        self.assertEqual(self.bulk("unarchive", ids[:10]).json()["updated"], 10)
+
+    def test_convert_creates_missing_applications_only(self):
+        converted = JobLead.objects.create(company="Acme", title="Engineer", owner=self.user)
+        fresh = JobLead.objects.create(company="Beta", title="Designer", owner=self.user, job_url="https://beta.example/1")
+        Application.objects.create(job=converted, owner=self.user)
+
+        response = self.bulk("convert", [converted.pk, fresh.pk, self.other_lead.pk])
+
+        self.assertEqual(response.json()["updated"], 1)
+        application = Application.objects.get(job=fresh)
+        self.assertEqual(application.owner, self.user)
+        self.assertEqual(application.job_url, "https://beta.example/1")
+        self.assertEqual(Application.objects.filter(job=converted).count(), 1)
+        self.assertFalse(Application.objects.filter(job=self.other_lead).exists())
+        self.assertEqual(counters_for_user(self.user)["total"], 2)
+
+        self.assertEqual(self.bulk("convert", [converted.pk, fresh.pk]).json()["updated"], 0)
+
+    def test_convert_reports_only_inserted_applications(self):
+        raced = JobLead.objects.create(company="Acme", title="Engineer", owner=self.user)
+        fresh = JobLead.objects.create(company="Beta", title="Designer", owner=self.user)
+        created = []
+
+        def concurrent_convert(execute, sql, params, many, context):
+            # Another writer converts ``raced`` right after the existence check.
+            result = execute(sql, params, many, context)
+            if not created and "EXISTS" in sql and 'FROM "tracker_joblead"' in sql:
+                created.append(Application.objects.create(job=raced, owner=self.user))
+            return result
+
+        with connection.execute_wrapper(concurrent_convert):
+            response = self.bulk("convert", [raced.pk, fresh.pk])
+
+        self.assertEqual(len(created), 1)
+        self.assertEqual(response.json()["updated"], 1)
+        self.assertEqual(Application.objects.filter(job__in=[raced, fresh]).count(), 2)
+
+    def test_scam_actions_mark_leads_reviewed(self):
+        lead = JobLead.objects.create(company="Acme", title="Engineer", owner=self.user)
+
+        self.assertEqual(self.bulk("flag_scam", [lead.pk]).json()["updated"], 1)
+        lead.refresh_from_db()
+        self.assertTrue(lead.is_scam_suspected)
+        self.assertTrue(lead.scam_reviewed)
+
+        self.assertEqual(self.bulk("clear_scam", [lead.pk]).json()["updated"], 1)
+        lead.refresh_from_db()
+        self.assertFalse(lead.is_scam_suspected)
+
+    def test_inbox_form_redirects_back_with_a_message(self):
+        lead = JobLead.objects.create(company="Acme", title="Engineer", owner=self.user)
+        kept = JobLead.objects.create(company="Beta", title="Designer", owner=self.user)
+        next_url = reverse("tracker:lead_list") + "?source=MANUAL"
+
+        response = self.client.post(
+            reverse("tracker:lead_bulk"), {"action": "archive", "ids": [lead.pk], "next": next_url}, follow=True
+        )
+
+        self.assertRedirects(response, next_url)
+        self.assertContains(response, "Archived 1 leads.")
+        self.assertContains(response, f'name="ids" value="{kept.pk}"')
+        self.assertNotContains(response, f'name="ids" value="{lead.pk}"')
+
+    def test_rejects_bad_requests(self):
+        self.assertEqual(self.bulk("delete", [1]).status_code, 400)
+        self.assertEqual(self.bulk("archive", []).status_code, 400)
+        self.assertEqual(self.bulk("archive", "1,2").status_code, 400)
+        self.assertEqual(self.bulk("archive", ["x"]).status_code, 400)
+
+
 class LeadFilterTests(BaseTestCase):
     def setUp(self):
         self.user = self.create_user("lead_filters")
@@ -292,6 +1985,50 @@ class LeadFilterTests(BaseTestCase):
 
         self.assertEqual(lead_ids, {self.lead_archived.pk})
 
+    def test_facet_counts_cover_the_current_search_and_archive_side(self):
+        response = self.client.get(reverse("tracker:lead_list"), {"scam": "1"})
+
+        self.assertEqual(
+            response.context["flag_counts"],
+            {"scam": {"1": 1, "0": 2}, "has_app": {"1": 1, "0": 2}, "archived": {"1": 1, "0": 3}},
+        )
+        self.assertIn(("MANUAL", "Manual", 3), response.context["source_choices"])
+        self.assertContains(response, "Converted (1)")
+
+        response = self.client.get(reverse("tracker:lead_list"), {"q": "Acme"})
+        self.assertEqual(response.context["flag_counts"]["archived"], {"1": 0, "0": 1})
+
+        JobLead.objects.create(company="Acme Labs", title="Engineer", owner=self.user, source=JobLead.Source.RSS)
+        response = self.client.get(reverse("tracker:lead_list"), {"q": "Acme"})
+        self.assertEqual(response.context["flag_counts"]["archived"], {"1": 0, "0": 2})
+        self.assertIn(("RSS", "RSS", 1), response.context["source_choices"])
+
+    def test_inbox_pages_with_a_cursor(self):
+        discovered = timezone.now()
+        for index in range(5):
+            # Ties on discovered_at fall back to updated_at and then id.
+            JobLead.objects.create(
+                company=f"Page {index}", title="Engineer", owner=self.user, discovered_at=discovered
+            )
+
+        seen = []
+        params = {"page_size": 3}
+        while True:
+            response = self.client.get(reverse("tracker:lead_list"), params)
+            seen.extend(lead.pk for lead in response.context["leads"])
+            if not response.context["next_page_query"]:
+                break
+            self.assertContains(response, 'rel="next"')
+            params = QueryDict(response.context["next_page_query"])
+
+        expected = list(
+            JobLead.objects.filter(owner=self.user, is_archived=False)
+            .order_by("-discovered_at", "-updated_at", "id")
+            .values_list("pk", flat=True)
+        )
+        self.assertEqual(seen, expected)
+        self.assertEqual(len(seen), 8)
+
 
 class LeadConversionTests(BaseTestCase):
     def test_convert_is_idempotent(self):
@@ -343,10 +2080,473 @@ class ExportTests(BaseTestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertIn("text/csv", response["Content-Type"])
-        content = response.content.decode("utf-8")
+        content = b"".join(response.streaming_content).decode("utf-8")
         self.assertIn("Acme Corp", content)
         self.assertNotIn("Other Corp", content)
 
+    def test_export_ignores_conditional_headers(self):
+        user = self.create_user("owner")
+        self.create_application(owner=user, company="Acme Corp")
+        self.client.login(username="owner", password="password123")
+        etag = self.client.get(reverse("tracker:application_list"))["ETag"]
+
+        with mock.patch("tracker.conditional.collection_state") as collection_state:
+            response = self.client.get(reverse("tracker:application_export"), HTTP_IF_NONE_MATCH=etag)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn("ETag", response)
+        self.assertIn("Acme Corp", b"".join(response.streaming_content).decode("utf-8"))
+        collection_state.assert_not_called()
+
+    def test_export_streams_rows_in_chunks(self):
+        user = self.create_user("owner")
+        for index in range(5):
+            self.create_application(owner=user, company=f"Company {index}", title="Engineer")
+        self.client.login(username="owner", password="password123")
+
+        with mock.patch("tracker.exports.CHUNK_SIZE", 2):
+            response = self.client.get(reverse("tracker:application_export"))
+            self.assertTrue(response.streaming)
+            chunks = [chunk.decode("utf-8") for chunk in response.streaming_content]
+
+        self.assertEqual(chunks[0], "Company,Title,Status,Follow up on,Next action,Updated at\r\n")
+        self.assertEqual([chunk.count("\r\n") for chunk in chunks[1:]], [2, 2, 1])
+        self.assertTrue(chunks[1].startswith("Company 4,Engineer,"))
+
+    def test_export_applies_list_filters_and_columns(self):
+        user = self.create_user("owner")
+        today = timezone.localdate()
+        later = self.create_application(
+            owner=user, company="Later Corp", status=Application.Status.APPLIED, follow_up_on=today + timedelta(days=3)
+        )
+        self.create_application(
+            owner=user, company="Sooner Corp", status=Application.Status.APPLIED, follow_up_on=today + timedelta(days=1)
+        )
+        self.create_application(owner=user, company="Wishlist Corp")
+        later.compensation_text = "$150k"
+        later.save()
+        FollowUp.objects.create(application=later, due_on=today + timedelta(days=2), note="Ping")
+        self.client.login(username="owner", password="password123")
+
+        response = self.client.get(
+            reverse("tracker:application_export"),
+            {"status": "APPLIED", "sort": "follow_up", "columns": "company,status,compensation,next_follow_up"},
+        )
+
+        lines = b"".join(response.streaming_content).decode("utf-8").splitlines()
+        self.assertEqual(lines[0], "Company,Status,Compensation,Next follow-up")
+        self.assertEqual(lines[1:], ["Sooner Corp,Applied,,", f"Later Corp,Applied,$150k,{today + timedelta(days=2)}"])
+
+    def test_export_ndjson_gzip(self):
+        user = self.create_user("owner")
+        application = self.create_application(owner=user, company="Acme Corp")
+        FollowUp.objects.create(application=application, due_on=timezone.localdate(), note="Ping")
+        self.client.login(username="owner", password="password123")
+
+        response = self.client.get(
+            reverse("tracker:application_export"),
+            {"format": "ndjson", "gzip": "1", "columns": ["company", "status,open_follow_ups,work_mode"]},
+        )
+
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        self.assertIn("applications.ndjson.gz", response["Content-Disposition"])
+        rows = [json.loads(line) for line in gzip.decompress(b"".join(response.streaming_content)).splitlines()]
+        self.assertEqual(
+            rows,
+            [{"company": "Acme Corp", "status": "WISHLIST", "open_follow_ups": 1, "work_mode": "UNKNOWN"}],
+        )
+
+    def test_export_rejects_unknown_columns_and_formats(self):
+        self.create_user("owner")
+        self.client.login(username="owner", password="password123")
+
+        response = self.client.get(reverse("tracker:application_export"), {"columns": "company,salary"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "Unknown export column: salary.")
+
+        response = self.client.get(reverse("tracker:application_export"), {"format": "xlsx"})
+        self.assertEqual(response.status_code, 400)
+
+
+class ExportJobTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        settings_override = override_settings(TRACKER_EXPORT_ROOT=export_root.name)
+        settings_override.enable()
+        self.addCleanup(settings_override.disable)
+
+    def test_job_exports_filtered_list_in_background(self):
+        user = self.create_user("owner")
+        for index in range(5):
+            self.create_application(owner=user, company=f"Applied {index}", status=Application.Status.APPLIED)
+        self.create_application(owner=user, company="Wishlist Corp")
+        self.client.login(username="owner", password="password123")
+
+        response = self.client.post(reverse("tracker:export_job_create"), {"status": "APPLIED", "page": "3"})
+
+        self.assertEqual(response.status_code, 202)
+        job = ExportJob.objects.get(pk=response.json()["id"])
+        self.assertEqual((job.status, job.query), (ExportJob.Status.PENDING, "status=APPLIED"))
+        self.assertEqual(response.json()["download_url"], "")
+
+        with mock.patch("tracker.exports.CHUNK_SIZE", 2):
+            call_command("run_export_jobs", stdout=io.StringIO())
+
+        status = self.client.get(reverse("tracker:export_job", args=[job.pk])).json()
+        self.assertEqual(status["status"], "DONE")
+        self.assertEqual((status["rows_total"], status["rows_written"]), (5, 5))
+        response = self.client.get(status["download_url"])
+        content = b"".join(response.streaming_content)
+        self.assertEqual(response["Accept-Ranges"], "bytes")
+        self.assertEqual(len(content), status["size_bytes"])
+        self.assertEqual(content.decode("utf-8").count("Applied "), 5)
+        self.assertNotIn(b"Wishlist Corp", content)
+
+    def test_download_resumes_with_range_and_if_range(self):
+        user = self.create_user("owner")
+        self.create_application(owner=user, company="Acme Corp")
+        self.client.login(username="owner", password="password123")
+        job_id = self.client.post(reverse("tracker:export_job_create"), {"format": "ndjson"}).json()["id"]
+        call_command("run_export_jobs", stdout=io.StringIO())
+        url = reverse("tracker:export_job_download", args=[job_id])
+        full = self.client.get(url)
+        content = b"".join(full.streaming_content)
+
+        partial = self.client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE=full["ETag"])
+        self.assertEqual(partial.status_code, 206)
+        self.assertEqual(partial["Content-Range"], f"bytes 10-{len(content) - 1}/{len(content)}")
+        self.assertEqual(b"".join(partial.streaming_content), content[10:])
+
+        suffix = self.client.get(url, HTTP_RANGE="bytes=-5")
+        self.assertEqual(b"".join(suffix.streaming_content), content[-5:])
+
+        stale = self.client.get(url, HTTP_RANGE="bytes=10-", HTTP_IF_RANGE='"export-0-0"')
+        self.assertEqual(stale.status_code, 200)
+        self.assertEqual(b"".join(stale.streaming_content), content)
+
+        beyond = self.client.get(url, HTTP_RANGE=f"bytes={len(content)}-")
+        self.assertEqual(beyond.status_code, 416)
+        self.assertEqual(beyond["Content-Range"], f"bytes */{len(content)}")
+
+        inverted = self.client.get(url, HTTP_RANGE="bytes=5-3")
+        self.assertEqual(inverted.status_code, 200)
+        self.assertEqual(b"".join(inverted.streaming_content), content)
+
+    def test_missing_export_file_is_gone_not_an_error(self):
+        user = self.create_user("owner")
+        self.create_application(owner=user, company="Acme Corp")
+        self.client.login(username="owner", password="password123")
+        job_id = self.client.post(reverse("tracker:export_job_create")).json()["id"]
+        call_command("run_export_jobs", stdout=io.StringIO())
+        Path(ExportJob.objects.get(pk=job_id).file_path).unlink()
+
+        response = self.client.get(reverse("tracker:export_job_download", args=[job_id]))
+
+        self.assertEqual(response.status_code, 410)
+        status = self.client.get(reverse("tracker:export_job", args=[job_id])).json()
+        self.assertEqual((status["status"], status["download_url"]), ("FAILED", ""))
+
+    def test_runner_fails_abandoned_jobs_and_prunes_expired_files(self):
+        user = self.create_user("owner")
+        self.create_application(owner=user, company="Acme Corp")
+        self.client.login(username="owner", password="password123")
+        expired_id = self.client.post(reverse("tracker:export_job_create")).json()["id"]
+        call_command("run_export_jobs", stdout=io.StringIO())
+        expired_path = Path(ExportJob.objects.get(pk=expired_id).file_path)
+        ExportJob.objects.filter(pk=expired_id).update(finished_at=timezone.now() - timedelta(days=8))
+        abandoned = ExportJob.objects.create(owner=user, status=ExportJob.Status.RUNNING)
+        ExportJob.objects.filter(pk=abandoned.pk).update(updated_at=timezone.now() - timedelta(hours=2))
+        running = ExportJob.objects.create(owner=user, status=ExportJob.Status.RUNNING)
+        stale_restore = RestoreJob.objects.create(owner=user, status=RestoreJob.Status.RUNNING)
+        RestoreJob.objects.filter(pk=stale_restore.pk).update(updated_at=timezone.now() - timedelta(hours=2))
+
+        output = io.StringIO()
+        call_command("run_export_jobs", stdout=output, stderr=io.StringIO())
+        call_command("run_restore_jobs", stdout=io.StringIO(), stderr=io.StringIO())
+
+        self.assertIn("removed 1 expired files", output.getvalue())
+        self.assertFalse(expired_path.exists())
+        status = self.client.get(reverse("tracker:export_job", args=[expired_id])).json()
+        self.assertEqual((status["status"], status["download_url"]), ("FAILED", ""))
+        self.assertEqual(ExportJob.objects.get(pk=abandoned.pk).status, ExportJob.Status.FAILED)
+        self.assertEqual(ExportJob.objects.get(pk=running.pk).status, ExportJob.Status.RUNNING)
+        self.assertEqual(RestoreJob.objects.get(pk=stale_restore.pk).status, RestoreJob.Status.FAILED)
+
+    def test_jobs_are_owner_scoped_and_pending_jobs_cannot_download(self):
+        owner = self.create_user("owner")
+        self.create_user("other")
+        job = ExportJob.objects.create(owner=owner)
+
+        self.client.login(username="other", password="password123")
+        self.assertEqual(self.client.get(reverse("tracker:export_job", args=[job.pk])).status_code, 404)
+
+        self.client.login(username="owner", password="password123")
+        response = self.client.get(reverse("tracker:export_job_download", args=[job.pk]))
+        self.assertEqual(response.status_code, 409)
+
+
+class AccountBackupTests(BaseTestCase):
+    def setUp(self):
+        super().setUp()
+        self.owner = self.create_user("owner")
+        self.owner.profile.headline = "Backend engineer"
+        self.owner.profile.target_roles = "Backend Engineer"
+        self.owner.profile.save()
+        self.application = self.create_application(owner=self.owner, company="Acme Corp", title="Backend Engineer")
+        self.application.job.jd_text = RELATED_DESCRIPTION
+        self.application.job.is_scam_suspected = True
+        self.application.job.save()
+        FollowUp.objects.create(application=self.application, due_on=timezone.localdate(), note="Ping recruiter")
+        JobLead.objects.create(owner=self.owner, title="Data Engineer", company="Globex", jd_text=RELATED_DESCRIPTION)
+        Application.objects.filter(pk=self.application.pk).update(updated_at=timezone.now() - timedelta(days=30))
+        JobLead.objects.filter(owner=self.owner).update(updated_at=timezone.now() - timedelta(days=20))
+
+    def _archive(self):
+        path = Path(tempfile.mkdtemp()) / "owner.ndjson.gz"
+        self.addCleanup(path.unlink, missing_ok=True)
+        call_command("export_account", str(path), user="owner", stdout=io.StringIO())
+        return path
+
+    def test_round_trip_remaps_ids_and_keeps_timestamps(self):
+        path = self._archive()
+
+        call_command("import_account", str(path), user="restored", create_user=True, stdout=io.StringIO())
+
+        restored = get_user_model().objects.get(username="restored")
+        self.assertEqual(restored.profile.headline, "Backend engineer")
+        application = Application.objects.select_related("job").get(owner=restored)
+        self.assertNotEqual(application.pk, self.application.pk)
+        self.assertEqual((application.job.company, application.job.owner_id), ("Acme Corp", restored.pk))
+        self.assertTrue(application.job.is_scam_suspected)
+        self.assertEqual(application.updated_at, Application.objects.get(pk=self.application.pk).updated_at)
+        self.assertEqual(list(application.followups.values_list("note", flat=True)), ["Ping recruiter"])
+        self.assertEqual(
+            sorted(JobLead.objects.filter(owner=restored).values_list("updated_at", flat=True)),
+            sorted(JobLead.objects.filter(owner=self.owner).values_list("updated_at", flat=True)),
+        )
+        self.assertEqual([lead.company for lead in similar_leads(application.job)], ["Globex"])
+        self.assertEqual(PipelineCounters.objects.get(owner=restored).total, 1)
+
+    def test_endpoints_stream_archive_and_refuse_to_overwrite(self):
+        self.client.login(username="owner", password="password123")
+        response = self.client.get(reverse("tracker:account_export"))
+        self.assertEqual(response["Content-Type"], "application/gzip")
+        archive = b"".join(response.streaming_content)
+
+        response = self.client.post(reverse("tracker:account_import"), data=archive, content_type="application/gzip")
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("replace", response.json()["error"])
+
+        url = f"{reverse('tracker:account_import')}?replace=1"
+        response = self.client.post(url, data=archive, content_type="application/gzip")
+        self.assertEqual(response.json(), {"ok": True, "restored": {"lead": 2, "application": 1, "followup": 1}})
+        self.assertEqual(JobLead.objects.filter(owner=self.owner).count(), 2)
+        self.assertEqual(FollowUp.objects.filter(application__owner=self.owner).count(), 1)
+
+    def test_truncated_or_foreign_archives_change_nothing(self):
+        archive = self._archive().read_bytes()
+        lines = gzip.decompress(archive).splitlines(keepends=True)
+        self.client.login(username="owner", password="password123")
+        url = f"{reverse('tracker:account_import')}?replace=1"
+
+        truncated = gzip.compress(b"".join(lines[:-1]))
+        response = self.client.post(url, data=truncated, content_type="application/gzip")
+        self.assertEqual(response.json()["error"], "The archive is truncated: it has no end marker.")
+
+        header = json.loads(lines[0])
+        header["version"] = 99
+        future = gzip.compress(json.dumps(header).encode() + b"\n" + b"".join(lines[1:]))
+        response = self.client.post(url, data=future, content_type="application/gzip")
+        self.assertEqual(response.status_code, 400)
+
+        response = self.client.post(url, data=b"not gzip", content_type="application/gzip")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(Application.objects.get(owner=self.owner).pk, self.application.pk)
+
+    def test_archives_that_break_choices_or_constraints_are_rejected(self):
+        lines = [json.loads(line) for line in gzip.decompress(self._archive().read_bytes()).splitlines()]
+        self.client.login(username="owner", password="password123")
+        url = f"{reverse('tracker:account_import')}?replace=1"
+
+        def post(records):
+            body = "".join(json.dumps(record) + "\n" for record in records).encode()
+            return self.client.post(url, data=gzip.compress(body), content_type="application/gzip")
+
+        application = next(record for record in lines if record.get("type") == "application")
+        unknown_status = [
+            {**record, "fields": {**record["fields"], "status": "HIRED"}} if record is application else record
+            for record in lines
+        ]
+        response = post(unknown_status)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("status", response.json()["error"])
+
+        # A second application for the same lead.
+        index, end = lines.index(application), lines[-1]
+        duplicate = [
+            *lines[: index + 1],
+            {**application, "id": application["id"] + 1000},
+            *lines[index + 1 : -1],
+            {**end, "counts": {**end["counts"], "application": end["counts"]["application"] + 1}},
+        ]
+        response = post(duplicate)
+        self.assertEqual(response.status_code, 400)
+        self.assertIn("does not fit", response.json()["error"])
+        self.assertEqual(Application.objects.get(owner=self.owner).pk, self.application.pk)
+
+    @override_settings(TRACKER_RESTORE_MAX_BYTES=100)
+    def test_oversized_archives_are_refused(self):
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        self.client.login(username="owner", password="password123")
+
+        with override_settings(TRACKER_EXPORT_ROOT=export_root.name):
+            response = self.client.post(
+                f"{reverse('tracker:account_import')}?background=1", data=b"x" * 101, content_type="application/gzip"
+            )
+            self.assertEqual(response.status_code, 413)
+            with self.assertRaises(ArchiveTooLarge):
+                queue_restore(io.BytesIO(b"x" * 101), self.owner)
+
+        self.assertFalse(RestoreJob.objects.exists())
+        self.assertEqual(list(Path(export_root.name).rglob("restore-*")), [])
+
+    def test_large_archives_are_restored_in_background(self):
+        archive = self._archive().read_bytes()
+        lines = gzip.decompress(archive).splitlines(keepends=True)
+        export_root = tempfile.TemporaryDirectory()
+        self.addCleanup(export_root.cleanup)
+        self.client.login(username="owner", password="password123")
+        url = f"{reverse('tracker:account_import')}?replace=1"
+
+        with override_settings(TRACKER_EXPORT_ROOT=export_root.name, TRACKER_RESTORE_INLINE_MAX_BYTES=len(archive) - 1):
+            response = self.client.post(url, data=archive, content_type="application/gzip")
+            truncated = self.client.post(
+                f"{url}&background=1", data=gzip.compress(b"".join(lines[:-1])), content_type="application/gzip"
+            )
+            self.assertEqual((response.status_code, response.json()["status"]), (202, "PENDING"))
+            self.assertEqual(Application.objects.get(owner=self.owner).pk, self.application.pk)
+            call_command("run_restore_jobs", max_jobs=1, stdout=io.StringIO())
+
+            status = self.client.get(response.json()["status_url"]).json()
+            self.assertEqual(status["status"], "DONE")
+            self.assertEqual(status["restored"], {"lead": 2, "application": 1, "followup": 1})
+            restored = Application.objects.get(owner=self.owner)
+            self.assertNotEqual(restored.pk, self.application.pk)
+
+            call_command("run_restore_jobs", stdout=io.StringIO(), stderr=io.StringIO())
+            status = self.client.get(truncated.json()["status_url"]).json()
+            self.assertEqual(status["status"], "FAILED")
+            self.assertIn("no end marker", status["error"])
+            self.assertEqual(Application.objects.get(owner=self.owner).pk, restored.pk)
+            self.assertEqual(list(Path(export_root.name).rglob("restore-*")), [])
+
+
+class CSVImportTests(BaseTestCase):
+    def _import(self, body, **params):
+        url = f"{reverse('tracker:csv_import')}?{urlencode(params, doseq=True)}"
+        return self.client.post(url, data=body, content_type="text/csv")
+
+    def test_export_imports_back_idempotently_after_dry_run(self):
+        source = self.create_user("source")
+        today = timezone.localdate()
+        self.create_application(owner=source, company="Acme Corp", status=Application.Status.INTERVIEW, follow_up_on=today)
+        self.create_application(owner=source, company="Globex", title="Designer")
+        self.client.login(username="source", password="password123")
+        exported = b"".join(self.client.get(reverse("tracker:application_export")).streaming_content)
+        user = self.create_user("owner")
+        self.client.login(username="owner", password="password123")
+
+        dry_run = self._import(exported, dry_run="1").json()
+        self.assertEqual((dry_run["created"], dry_run["applications"], dry_run["dry_run"]), (2, 2, True))
+        self.assertEqual(dry_run["ignored_columns"], ["Updated at"])
+        self.assertFalse(JobLead.objects.filter(owner=user).exists())
+
+        result = self._import(exported).json()
+        self.assertEqual((result["ok"], result["created"], result["applications"]), (True, 2, 2))
+        acme = Application.objects.select_related("job").get(owner=user, job__company="Acme Corp")
+        self.assertEqual((acme.status, acme.follow_up_on, acme.job.title), ("INTERVIEW", today, "Engineer"))
+        self.assertEqual(PipelineCounters.objects.get(owner=user).total, 2)
+
+        again = self._import(exported).json()
+        self.assertEqual((again["created"], again["applications"], again["duplicates"]), (0, 0, 2))
+        self.assertEqual(Application.objects.filter(owner=user).count(), 2)
+
+    def test_headers_are_detected_and_rows_validated(self):
+        user = self.create_user("owner")
+        self.client.login(username="owner", password="password123")
+        body = (
+            "Employer;Position;Stage;Follow-up date;Workplace;Pay\n"
+            "Acme Corp;Engineer;applied;2026-11-02;remote;$120k\n"
+            "Globex;Designer;Hired;2026-11-03;;\n"
+            "Initech;Analyst;Offer;next week;;\n"
+            "Acme Corp;Engineer;Applied;;;\n"
+        )
+
+        result = self._import(body.encode(), map="Pay=salary").json()
+
+        self.assertEqual(
+            result["columns"],
+            {
+                "Employer": "company",
+                "Position": "title",
+                "Stage": "status",
+                "Follow-up date": "follow_up_on",
+                "Workplace": "work_mode",
+                "Pay": "compensation_text",
+            },
+        )
+        self.assertEqual((result["created"], result["applications"], result["duplicates"]), (1, 1, 1))
+        self.assertEqual([error["row"] for error in result["errors"]], [3, 4])
+        self.assertIn("status", result["errors"][0]["errors"])
+        self.assertIn("follow_up_on", result["errors"][1]["errors"])
+        application = Application.objects.select_related("job").get(owner=user)
+        self.assertEqual(
+            (application.status, application.compensation_text, application.job.work_mode),
+            ("APPLIED", "$120k", "REMOTE"),
+        )
+
+        response = self._import(b"Employer,Notes\nAcme,hi\n")
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()["error"], "No column found for: title.")
+
+    def test_leads_import_and_applications_attach_to_existing_leads(self):
+        user = self.create_user("owner")
+        body = "company,title,location,url\nAcme Corp,Engineer,Berlin,https://jobs.example/1\n"
+        path = Path(tempfile.mkdtemp()) / "leads.csv"
+        path.write_text(body)
+        self.addCleanup(path.unlink)
+
+        output = io.StringIO()
+        call_command("import_csv", str(path), user="owner", kind="leads", dry_run=True, stdout=output)
+        self.assertIn("Dry run: would create 1 leads and 0 applications", output.getvalue())
+        self.assertFalse(JobLead.objects.filter(owner=user).exists())
+
+        call_command("import_csv", str(path), user="owner", kind="leads", stdout=io.StringIO())
+        lead = JobLead.objects.get(owner=user)
+        self.assertEqual((lead.location, lead.job_url), ("Berlin", "https://jobs.example/1"))
+
+        call_command("import_csv", str(path), user="owner", stdout=io.StringIO())
+        self.assertEqual(JobLead.objects.filter(owner=user).count(), 1)
+        self.assertEqual(Application.objects.get(owner=user).job_id, lead.pk)
+
+    @override_settings(TRACKER_FRAGMENT_CACHE=True)
+    def test_attaching_applications_to_existing_leads_invalidates_caches(self):
+        user = self.create_user("owner")
+        JobLead.objects.create(owner=user, company="Zeta", title="Engineer")
+        self.client.login(username="owner", password="password123")
+        self.assertNotContains(self.client.get(reverse("tracker:application_list")), "Zeta")
+        self.assertEqual(cached_counters_for_user(user)["total"], 0)
+
+        result = self._import(b"company,title\nZeta,Engineer\n").json()
+
+        self.assertEqual((result["created"], result["applications"]), (0, 1))
+        self.assertContains(self.client.get(reverse("tracker:application_list")), "Zeta")
+        self.assertEqual(cached_counters_for_user(user)["total"], 1)
+
+
 class QuickEditContentTests(BaseTestCase):
     def test_quick_popover_renders_autosave_fields(self):
         user = self.create_user("alice")
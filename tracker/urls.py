@@ -1,7 +1,12 @@
 from django.urls import path
 from django.views.generic import RedirectView
 from .views import (
+    AccountExportView,
+    AccountImportView,
     ApplicationListView,
+    ApplicationBoardColumnView,
+    ApplicationCountersView,
+    ApplicationViewPartialView,
     ApplicationCreateView,
     ApplicationUpdateView,
     ApplicationDeleteView,
@@ -11,14 +16,21 @@ from .views import (
     ApplicationEditView,
     ApplicationPatchView,
     ApplicationFollowUpCreateView,
+    CSVImportView,
+    ExportJobCreateView,
+    ExportJobDownloadView,
+    ExportJobStatusView,
     FollowUpUpdateView,
+    LeadBulkActionView,
     LeadConvertView,
     LeadEditView,
+    LeadIngestView,
     LeadListView,
     LeadPatchView,
     LeadQuickView,
     ProfileView,
     ProfileQuickUpdateView,
+    RestoreJobStatusView,
 )
 
 app_name = "tracker"
@@ -26,7 +38,22 @@ app_name = "tracker"
 urlpatterns = [
     path("", RedirectView.as_view(pattern_name="tracker:application_list", permanent=False)),
     path("applications/", ApplicationListView.as_view(), name="application_list"),
+    path(
+        "applications/views/<str:mode>/",
+        ApplicationViewPartialView.as_view(),
+        name="application_view_partial",
+    ),
+    path(
+        "applications/board/<str:status>/",
+        ApplicationBoardColumnView.as_view(),
+        name="application_board_column",
+    ),
+    path("applications/counters/", ApplicationCountersView.as_view(), name="application_counters"),
     path("applications/export.csv", ApplicationExportView.as_view(), name="application_export"),
+    path("applications/import/", CSVImportView.as_view(), name="csv_import"),
+    path("applications/exports/", ExportJobCreateView.as_view(), name="export_job_create"),
+    path("applications/exports/<int:pk>/", ExportJobStatusView.as_view(), name="export_job"),
+    path("applications/exports/<int:pk>/download/", ExportJobDownloadView.as_view(), name="export_job_download"),
     path("applications/new/", ApplicationCreateView.as_view(), name="application_create"),
     path("applications/quick-add/", ApplicationQuickAddView.as_view(), name="application_quick_add"),
     path("applications/<int:pk>/quick/", ApplicationQuickView.as_view(), name="application_quick"),
@@ -40,6 +67,8 @@ urlpatterns = [
         name="application_followup_create",
     ),
     path("leads/", LeadListView.as_view(), name="lead_list"),
+    path("leads/ingest/", LeadIngestView.as_view(), name="lead_ingest"),
+    path("leads/bulk/", LeadBulkActionView.as_view(), name="lead_bulk"),
     path("leads/<int:pk>/quick/", LeadQuickView.as_view(), name="lead_quick"),
     path("leads/<int:pk>/edit/", LeadEditView.as_view(), name="lead_edit"),
     path("leads/<int:pk>/", LeadPatchView.as_view(), name="lead_patch"),
@@ -49,4 +78,7 @@ urlpatterns = [
     path("board/", RedirectView.as_view(url="/applications/?view=board", permanent=False), name="board"),
     path("followups/", RedirectView.as_view(url="/applications/?view=followups", permanent=False), name="followups"),
     path("profile/", ProfileView.as_view(), name="profile"),
+    path("account/export/", AccountExportView.as_view(), name="account_export"),
+    path("account/import/", AccountImportView.as_view(), name="account_import"),
+    path("account/import/<int:pk>/", RestoreJobStatusView.as_view(), name="restore_job"),
 ]
@@ -1,17 +1,31 @@
 from datetime import timedelta
-import csv
 import json
+from pathlib import Path
 from urllib.parse import urlencode
 
+from django.conf import settings
 from django.contrib import messages
 
 from django.contrib.auth.mixins import LoginRequiredMixin
+from django.core.cache import cache
 from django.db import IntegrityError, transaction
-from django.db.models import Exists, F, OuterRef, Q
-from django.http import HttpResponse, HttpResponseRedirect, JsonResponse
+from django.db.models import Count, Exists, F, FloatField, OuterRef
+from django.http import (
+    FileResponse,
+    Http404,
+    HttpRequest,
+    HttpResponse,
+    HttpResponseRedirect,
+    JsonResponse,
+    QueryDict,
+    StreamingHttpResponse,
+)
 from django.shortcuts import get_object_or_404
-from django.urls import reverse_lazy
+from django.template.loader import get_template
+from django.urls import reverse, reverse_lazy
 from django.utils import timezone, dateparse
+from django.utils.http import http_date, url_has_allowed_host_and_scheme
+from django.utils.safestring import mark_safe
 from django.views import View
 from django.views.generic import DeleteView, DetailView, FormView, ListView, TemplateView, UpdateView
 
@@ -21,18 +35,130 @@ from .forms import (
     UserProfileIdentityForm,
     UserProfileSettingsForm,
 )
-from .models import Application, FollowUp, JobLead, UserProfile
-
-
-class ApplicationListView(LoginRequiredMixin, ListView):
+from .backups import ArchiveError, ArchiveTooLarge, queue_restore, restore_archive, restore_max_bytes, stream_archive
+from .board import BOARD_ORDERING, build_status_columns
+from .conditional import ConditionalListMixin
+from .counters import PIPELINE_FIELDS, cached_counters_for_user, counters_for_user, pipeline_write
+from .exports import (
+    CONTENT_TYPES as EXPORT_CONTENT_TYPES,
+    EXPIRED_ERROR as EXPORT_EXPIRED_ERROR,
+    FORMATS as EXPORT_FORMATS,
+    STREAMS as EXPORT_STREAMS,
+    file_range,
+    gzip_stream,
+    parse_byte_range,
+    parse_columns as parse_export_columns,
+)
+from .fingerprints import lead_fingerprint
+from .followups import SECTIONS as FOLLOWUP_SECTIONS, build_followup_inbox
+from .fragments import bulk_written, fragment_cache_key, fragment_cache_timeout
+from .imports import (
+    DEFAULT_BATCH_SIZE as DEFAULT_IMPORT_BATCH_SIZE,
+    CSVImportError,
+    import_csv,
+    parse_mapping as parse_import_mapping,
+)
+from .ingest import DEFAULT_BATCH_SIZE as DEFAULT_INGEST_BATCH_SIZE, ingest_leads, iter_lead_records
+from .models import Application, ExportJob, FollowUp, JobLead, RestoreJob, UserProfile
+from .near_duplicates import index_leads
+from .pagination import KeysetOrdering, paginate_keyset
+from .scam import SIGNAL_FIELDS as SCAM_SIGNAL_FIELDS, score_leads
+from .search import (
+    build_search_query,
+    search_applications,
+    search_enabled,
+    search_followups,
+    search_leads,
+)
+from .similar_leads import forget_leads, index_terms, similar_leads
+
+
+def serialize_application(application):
+    """JSON shape shared by the list API and the autosave endpoint."""
+
+    follow_up_display = application.follow_up_on.strftime("%b %d, %Y") if application.follow_up_on else "—"
+    job_url = application.job_url or application.job.job_url or ""
+    location_text = application.location_text or application.job.location or ""
+    return {
+        "id": application.pk,
+        "status": application.status,
+        "status_label": application.get_status_display(),
+        "next_action": application.next_action or "",
+        "follow_up_on": application.follow_up_on.isoformat() if application.follow_up_on else "",
+        "follow_up_display": follow_up_display,
+        "notes": application.notes or "",
+        "company": application.job.company,
+        "title": application.job.title,
+        "job_url": job_url,
+        "location_text": location_text,
+        "source": application.source or "",
+        "compensation_text": application.compensation_text or "",
+    }
+
+
+class ApplicationListView(LoginRequiredMixin, ConditionalListMixin, ListView):
     """List applications with list/board/follow-up views and filters."""
 
     model = Application
     template_name = "tracker/application_list.html"
     context_object_name = "applications"
+    paginate_by = 50
+    max_page_size = 200
+    view_modes = ("list", "board", "followups")
+    board_column_size = 25
+    fragment_cache_key = None
+
+    def _search_text(self):
+        search_query = self.request.GET.get("search", "").strip()
+        if not search_query:
+            search_query = self.request.GET.get("q", "").strip()
+        return search_query
+
+    def _ranks_by_relevance(self):
+        return (
+            self.request.GET.get("sort") == "relevance"
+            and search_enabled()
+            and build_search_query(self._search_text()) is not None
+        )
+
+    def get_keyset_ordering(self):
+        sort_option = self.request.GET.get("sort")
+        if sort_option == "follow_up":
+            keys = [("follow_up_on", False), ("updated_at", True), ("id", False)]
+        elif self._ranks_by_relevance():
+            keys = [("search_rank", True), ("updated_at", True), ("id", False)]
+            return KeysetOrdering(Application, keys, annotations={"search_rank": FloatField()})
+        else:
+            keys = [("updated_at", True), ("id", False)]
+        return KeysetOrdering(Application, keys)
+
+    def get_paginate_by(self, queryset):
+        if self.get_view_mode() != "list":
+            return None
+        try:
+            page_size = int(self.request.GET.get("page_size", self.paginate_by))
+        except ValueError:
+            page_size = self.paginate_by
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_keyset(
+            queryset,
+            self.get_keyset_ordering(),
+            self.request.GET.get("cursor", ""),
+            page_size,
+        )
+        return (None, page, page.object_list, page.has_next or page.has_previous)
+
+    def _wants_json(self):
+        if self.get_view_mode() != "list":
+            return False
+        if self.request.GET.get("format") == "json":
+            return True
+        return "application/json" in self.request.headers.get("accept", "")
 
     def _base_queryset(self):
-        queryset = Application.objects.select_related("job")
+        queryset = Application.objects.select_related("job").defer("search_vector", "job__search_vector")
         if self.request.user.is_superuser:
             return queryset
         return queryset.filter(owner=self.request.user)
@@ -40,17 +166,7 @@ class ApplicationListView(LoginRequiredMixin, ListView):
     def get_queryset(self):
         queryset = self._base_queryset()
 
-        search_query = self.request.GET.get("search", "").strip()
-        if not search_query:
-            search_query = self.request.GET.get("q", "").strip()
-        if search_query:
-            queryset = queryset.filter(
-                Q(job__company__icontains=search_query)
-                | Q(job__title__icontains=search_query)
-                | Q(job__location__icontains=search_query)
-                | Q(notes__icontains=search_query)
-                | Q(location_text__icontains=search_query)
-            )
+        queryset = search_applications(queryset, self._search_text())
 
         status_filter = self.request.GET.get("status")
         if status_filter:
@@ -72,175 +188,365 @@ class ApplicationListView(LoginRequiredMixin, ListView):
         elif due_filter == "none":
             queryset = queryset.filter(follow_up_on__isnull=True)
 
-        sort_option = self.request.GET.get("sort")
-        if sort_option == "follow_up":
-            queryset = queryset.order_by(F("follow_up_on").asc(nulls_last=True), "-updated_at")
-        else:
-            queryset = queryset.order_by("-updated_at")
-
-        return queryset
-
-    def _build_items(self, apps, followups):
-        items = []
-        for application in apps:
-            items.append(
-                {
-                    "type": "application",
-                    "due_on": application.follow_up_on,
-                    "application": application,
-                }
-            )
-        for followup in followups:
-            items.append(
-                {
-                    "type": "followup",
-                    "due_on": followup.due_on,
-                    "application": followup.application,
-                    "followup": followup,
-                }
-            )
-        return sorted(items, key=lambda item: (item["due_on"] or timezone.localdate()))
+        return queryset.order_by(*self.get_keyset_ordering().order_by())
 
-    def _followup_sections(self, search_query="", status_filter=""):
-        today = timezone.localdate()
-        week_end = today + timedelta(days=7)
+    @classmethod
+    def queryset_for(cls, user, params):
+        """The filtered, ordered list ``user`` sees for ``params``, outside a request."""
+
+        request = HttpRequest()
+        request.user = user
+        request.GET = params
+        view = cls()
+        view.setup(request)
+        return view.get_queryset()
+
+    def _followup_sections(self, search_query="", status_filter="", sections=FOLLOWUP_SECTIONS):
         terminal_statuses = [Application.Status.ACCEPTED, Application.Status.REJECTED]
 
         applications = self._base_queryset().exclude(status__in=terminal_statuses)
-        followups = FollowUp.objects.select_related("application__job").filter(is_completed=False)
+        followups = (
+            FollowUp.objects.select_related("application__job")
+            .defer("application__search_vector", "application__job__search_vector")
+            .filter(is_completed=False)
+        )
         if not self.request.user.is_superuser:
             followups = followups.filter(application__owner=self.request.user)
 
         if search_query:
-            applications = applications.filter(
-                Q(job__company__icontains=search_query)
-                | Q(job__title__icontains=search_query)
-                | Q(notes__icontains=search_query)
-                | Q(location_text__icontains=search_query)
-            )
-            followups = followups.filter(
-                Q(application__job__company__icontains=search_query)
-                | Q(application__job__title__icontains=search_query)
-                | Q(note__icontains=search_query)
+            applications = search_applications(
+                applications,
+                search_query,
+                fallback_fields=("job__company", "job__title", "notes", "location_text"),
             )
+            followups = search_followups(followups, search_query)
 
         if status_filter:
             applications = applications.filter(status=status_filter)
             followups = followups.filter(application__status=status_filter)
 
-        today_items = self._build_items(
-            applications.filter(follow_up_on=today),
-            followups.filter(due_on=today),
-        )
-        overdue_items = self._build_items(
-            applications.filter(follow_up_on__lt=today),
-            followups.filter(due_on__lt=today),
-        )
-        week_items = self._build_items(
-            applications.filter(follow_up_on__gt=today, follow_up_on__lte=week_end),
-            followups.filter(due_on__gt=today, due_on__lte=week_end),
+        return build_followup_inbox(applications, followups, sections=sections)
+
+    def get_view_mode(self):
+        view_mode = self.request.GET.get("view", "list")
+        if view_mode not in self.view_modes:
+            view_mode = "list"
+        return view_mode
+
+    def get_filter_params(self):
+        return {
+            "search": self._search_text(),
+            "status": self.request.GET.get("status", ""),
+            "due": self.request.GET.get("due", ""),
+            "sort": self.request.GET.get("sort", ""),
+        }
+
+    def get_list_context(self, context, filters):
+        list_context = {}
+        page = context.get("page_obj")
+        if page is not None and page.has_next:
+            page_params = {"view": "list", **filters}
+            if "page_size" in self.request.GET:
+                page_params["page_size"] = self.get_paginate_by(None)
+            page_params["cursor"] = page.next_cursor
+            list_context["next_page_query"] = urlencode(page_params)
+
+        # Shares the sidebar's badge counts instead of counting per badge.
+        counters = cached_counters_for_user(self.request.user)
+        list_context["badge_counts"] = counters
+        list_context["due_today_count"] = counters["due_today"]
+        list_context["overdue_count"] = counters["overdue"]
+        return list_context
+
+    def get_board_context(self, context, filters):
+        status_columns = build_status_columns(self.get_queryset(), per_column=self.board_column_size)
+        for column in status_columns:
+            column["load_more_query"] = ""
+            if column["next_cursor"]:
+                column["load_more_query"] = urlencode({**filters, "cursor": column["next_cursor"]})
+        return {
+            "status_columns": status_columns,
+            "board_has_applications": any(column["total"] for column in status_columns),
+        }
+
+    def get_followups_context(self, context, filters):
+        due_filter = filters.get("due", "")
+        sections = FOLLOWUP_SECTIONS
+        if due_filter == "today":
+            sections = ("today",)
+        elif due_filter == "overdue":
+            sections = ("overdue",)
+        elif due_filter in ("7", "week"):
+            sections = ("week",)
+
+        follow_today, follow_week_end, items = self._followup_sections(
+            search_query=filters.get("search", ""),
+            status_filter=filters.get("status", ""),
+            sections=sections,
         )
+        return {
+            "followup_today": follow_today,
+            "followup_week_end": follow_week_end,
+            "today_items": items["today"],
+            "overdue_items": items["overdue"],
+            "week_items": items["week"],
+        }
 
-        return today, week_end, today_items, overdue_items, week_items
+    def get_page_context(self):
+        """Context shared by every mode and by cached renders; no queries."""
+
+        view_mode = self.get_view_mode()
+        params = self.get_filter_params()
+        filters = {key: value for key, value in params.items() if value}
+
+        today = timezone.localdate()
+        return {
+            "view_mode": view_mode,
+            "status_filter": params["status"],
+            "due_filter": params["due"],
+            "search_query": params["search"],
+            "sort_option": params["sort"],
+            "filters_query": urlencode(filters),
+            "status_choices": Application.Status.choices,
+            "search_ranking_available": search_enabled(),
+            "today": today,
+            "week_end": today + timedelta(days=7),
+            "filters": filters,
+        }
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        view_mode = self.request.GET.get("view", "list")
-        if view_mode not in {"list", "board", "followups"}:
-            view_mode = "list"
+        context.update(self.get_page_context())
+
+        # Only the requested mode pays for its queries; the others are
+        # fetched on demand from ApplicationViewPartialView.
+        builders = {
+            "list": self.get_list_context,
+            "board": self.get_board_context,
+            "followups": self.get_followups_context,
+        }
+        context.update(builders[context["view_mode"]](context, context["filters"]))
+        return context
 
-        status_filter = self.request.GET.get("status", "")
-        due_filter = self.request.GET.get("due", "")
-        search_query = self.request.GET.get("search", "").strip()
-        if not search_query:
-            search_query = self.request.GET.get("q", "").strip()
-        sort_option = self.request.GET.get("sort", "")
+    def get_fragment_template_name(self):
+        return f"tracker/partials/applications_{self.get_view_mode()}.html"
+
+    def get_fragment_cache_key(self):
+        """Cache key for this request's rendered view-mode fragment, or ``None``.
+
+        Superusers see every owner's rows, which no single data version
+        covers, so their fragments are never cached.
+        """
+
+        if self.request.user.is_superuser or self._wants_json():
+            return None
+        # The template name already pins the mode; dropping ``view`` lets the
+        # page and ApplicationViewPartialView share one entry.
+        params = self.request.GET.copy()
+        params.pop("view", None)
+        return fragment_cache_key(
+            self.request.user.pk,
+            self.get_fragment_template_name(),
+            params,
+            today=timezone.localdate(),
+        )
 
-        filters = {}
-        for key, value in (
-            ("search", search_query),
-            ("status", status_filter),
-            ("due", due_filter),
-            ("sort", sort_option),
-        ):
-            if value:
-                filters[key] = value
+    def render_fragment(self, context):
+        # Rendered without context processors: the fragment needs none, and
+        # they would repeat the page's profile and badge lookups.
+        fragment = get_template(self.get_fragment_template_name()).render(
+            {**context, "request": self.request}
+        )
+        if self.fragment_cache_key:
+            cache.set(self.fragment_cache_key, fragment, fragment_cache_timeout())
+        return mark_safe(fragment)
+
+    def get(self, request, *args, **kwargs):
+        # The key (and so the data version) is read before any rows are, so a
+        # concurrent edit can only orphan this render, never go unnoticed.
+        self.fragment_cache_key = self.get_fragment_cache_key()
+        fragment = cache.get(self.fragment_cache_key) if self.fragment_cache_key else None
+        if fragment is None:
+            return super().get(request, *args, **kwargs)
+        self.object_list = self.model.objects.none()
+        context = self.get_page_context()
+        context["view_fragment"] = mark_safe(fragment)
+        return self.render_to_response(context)
 
-        context.update(
+    def render_to_response(self, context, **response_kwargs):
+        if not self._wants_json():
+            if "view_fragment" not in context and self.fragment_cache_key:
+                context["view_fragment"] = self.render_fragment(context)
+            return super().render_to_response(context, **response_kwargs)
+
+        page = context["page_obj"]
+        next_url = ""
+        if page.has_next:
+            next_url = f"{reverse('tracker:application_list')}?{context['next_page_query']}&format=json"
+        return JsonResponse(
             {
-                "view_mode": view_mode,
-                "status_filter": status_filter,
-                "due_filter": due_filter,
-                "search_query": search_query,
-                "sort_option": sort_option,
-                "filters_query": urlencode(filters),
-                "status_choices": Application.Status.choices,
+                "ok": True,
+                "applications": [serialize_application(application) for application in page],
+                "next_cursor": page.next_cursor,
+                "next_url": next_url,
             }
         )
 
-        today = timezone.localdate()
-        context["today"] = today
-        context["week_end"] = today + timedelta(days=7)
-        terminal_statuses = [Application.Status.ACCEPTED, Application.Status.REJECTED]
-        base_qs = self._base_queryset().exclude(status__in=terminal_statuses)
-        context["due_today_count"] = base_qs.filter(follow_up_on=today).count()
-        context["overdue_count"] = base_qs.filter(follow_up_on__lt=today).count()
-
-        board_source = self.get_queryset()
-        status_columns = []
-        for code, label in Application.Status.choices:
-            status_columns.append(
-                {
-                    "code": code,
-                    "label": label,
-                    "applications": board_source.filter(status=code).order_by("-updated_at"),
-                }
-            )
-        context["status_columns"] = status_columns
 
-        (
-            follow_today,
-            follow_week_end,
-            today_items,
-            overdue_items,
-            week_items,
-        ) = self._followup_sections(search_query=search_query, status_filter=status_filter)
-        context["followup_today"] = follow_today
-        context["followup_week_end"] = follow_week_end
-        context["today_items"] = today_items
-        context["overdue_items"] = overdue_items
-        context["week_items"] = week_items
+class ApplicationViewPartialView(ApplicationListView):
+    """Render one application view mode as an HTML fragment for in-page switching."""
 
-        if due_filter == "today":
-            context["overdue_items"] = []
-            context["week_items"] = []
-        elif due_filter == "overdue":
-            context["today_items"] = []
-            context["week_items"] = []
-        elif due_filter in ("7", "week"):
-            context["today_items"] = []
-            context["overdue_items"] = []
+    conditional_get = False
+
+    def get_view_mode(self):
+        view_mode = self.kwargs["mode"]
+        if view_mode not in self.view_modes:
+            raise Http404("Unknown view mode.")
+        return view_mode
+
+    def render_to_response(self, context, **response_kwargs):
+        fragment = context.get("view_fragment") or self.render_fragment(context)
+        response = HttpResponse(fragment)
+        response["Cache-Control"] = "no-store"
+        return response
 
-        return context
 
+class ApplicationBoardColumnView(ApplicationListView):
+    """Next batch of cards for one board column ("load more")."""
 
-class LeadListView(LoginRequiredMixin, ListView):
+    conditional_get = False
+
+    template_name = "tracker/partials/board_column_cards.html"
+
+    def get_view_mode(self):
+        return "board"
+
+    def get_fragment_cache_key(self):
+        return None
+
+    def get_queryset(self):
+        status = self.kwargs["status"]
+        if status not in Application.Status.values:
+            raise Http404("Unknown status.")
+        return super().get_queryset().filter(status=status)
+
+    def get_board_context(self, context, filters):
+        page = paginate_keyset(
+            self.object_list,
+            BOARD_ORDERING,
+            self.request.GET.get("cursor", ""),
+            self.board_column_size,
+        )
+        load_more_query = ""
+        if page.has_next:
+            load_more_query = urlencode({**filters, "cursor": page.next_cursor})
+        return {
+            "applications": page.object_list,
+            "column_code": self.kwargs["status"],
+            "load_more_query": load_more_query,
+        }
+
+    def render_to_response(self, context, **response_kwargs):
+        response = super().render_to_response(context, **response_kwargs)
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class ApplicationCountersView(LoginRequiredMixin, View):
+    """Badge counts (status totals, due/overdue, follow-up sections) as JSON."""
+
+    def get(self, request, *args, **kwargs):
+        response = JsonResponse({"ok": True, **counters_for_user(request.user)})
+        response["Cache-Control"] = "no-store"
+        return response
+
+
+class LeadListView(LoginRequiredMixin, ConditionalListMixin, ListView):
     """Inbox list for job leads with SSR filters."""
 
     model = JobLead
     template_name = "tracker/lead_list.html"
     context_object_name = "leads"
+    paginate_by = 50
+    max_page_size = 200
+    facet_fields = ("source", "work_mode", "is_scam_suspected", "has_app", "is_archived")
+
+    def get_keyset_ordering(self):
+        if self.request.GET.get("sort") == "relevance":
+            # Stored per lead and indexed, so nothing is ranked per request.
+            keys = [("relevance_score", True), ("discovered_at", True), ("updated_at", True), ("id", False)]
+        elif self._ranks_by_search:
+            keys = [("search_rank", True), ("discovered_at", True), ("updated_at", True), ("id", False)]
+            return KeysetOrdering(JobLead, keys, annotations={"search_rank": FloatField()})
+        else:
+            keys = [("discovered_at", True), ("updated_at", True), ("id", False)]
+        return KeysetOrdering(JobLead, keys)
+
+    def get_paginate_by(self, queryset):
+        try:
+            page_size = int(self.request.GET.get("page_size", self.paginate_by))
+        except ValueError:
+            page_size = self.paginate_by
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, page_size):
+        page = paginate_keyset(
+            queryset,
+            self.get_keyset_ordering(),
+            self.request.GET.get("cursor", ""),
+            page_size,
+        )
+        return (None, page, page.object_list, page.has_next or page.has_previous)
+
+    def _searched_queryset(self):
+        has_app_query = Application.objects.filter(job_id=OuterRef("pk"), owner=self.request.user)
+        queryset = JobLead.objects.filter(owner=self.request.user).annotate(has_app=Exists(has_app_query))
+        return search_leads(queryset, self.request.GET.get("q", "").strip())
+
+    def get_facet_counts(self, archived):
+        """Lead counts per filter value for the current search, from one GROUP BY.
+
+        The archive facet counts every lead; the others only count leads on
+        the archive side being viewed, so they match what the filters show.
+        Counts are cached under the owner's data version, so they are only
+        recomputed after a write.
+        """
+
+        params = QueryDict(mutable=True)
+        params["q"] = self.request.GET.get("q", "").strip()
+        params["archived"] = "1" if archived else "0"
+        key = fragment_cache_key(self.request.user.pk, "lead_facets", params)
+        facets = cache.get(key) if key else None
+        if facets is None:
+            facets = {field: {} for field in self.facet_fields}
+            rows = (
+                self._searched_queryset()
+                .order_by()
+                .values(*self.facet_fields)
+                .annotate(total=Count("pk"))
+                .values_list(*self.facet_fields, "total")
+            )
+            for *values, total in rows:
+                row = dict(zip(self.facet_fields, values))
+                for field, value in row.items():
+                    if field != "is_archived" and row["is_archived"] != archived:
+                        continue
+                    counts = facets[field]
+                    counts[value] = counts.get(value, 0) + total
+            if key:
+                cache.set(key, facets, fragment_cache_timeout())
+        return facets
 
     def get_queryset(self):
-        user = self.request.user
-        has_app_query = Application.objects.filter(job_id=OuterRef("pk"), owner=user)
-        queryset = JobLead.objects.filter(owner=user).annotate(has_app=Exists(has_app_query))
-
-        search_query = self.request.GET.get("q", "").strip()
-        if search_query:
-            queryset = queryset.filter(
-                Q(title__icontains=search_query) | Q(company__icontains=search_query)
+        queryset = (
+            self._searched_queryset()
+            .defer("search_vector", "jd_signature")
+            .annotate(
+                duplicate_of_title=F("near_duplicate_of__title"),
+                duplicate_of_company=F("near_duplicate_of__company"),
             )
+        )
+        self._ranks_by_search = "search_rank" in queryset.query.annotations
 
         source_filter = self.request.GET.get("source")
         if source_filter:
@@ -258,21 +564,27 @@ class LeadListView(LoginRequiredMixin, ListView):
         if has_app_filter in {"0", "1"}:
             queryset = queryset.filter(has_app=has_app_filter == "1")
 
+        duplicate_filter = self.request.GET.get("duplicate")
+        if duplicate_filter in {"0", "1"}:
+            queryset = queryset.filter(near_duplicate_of__isnull=duplicate_filter == "0")
+
         archived_filter = self.request.GET.get("archived")
         if archived_filter in {"0", "1"}:
             queryset = queryset.filter(is_archived=archived_filter == "1")
         else:
             queryset = queryset.filter(is_archived=False)
 
-        return queryset.order_by("-discovered_at", "-updated_at")
+        return queryset.order_by(*self.get_keyset_ordering().order_by())
 
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
         search_query = self.request.GET.get("q", "").strip()
+        sort = "relevance" if self.request.GET.get("sort") == "relevance" else ""
         source_filter = self.request.GET.get("source", "")
         work_mode_filter = self.request.GET.get("work_mode", "")
         scam_filter = self.request.GET.get("scam", "")
         has_app_filter = self.request.GET.get("has_app", "")
+        duplicate_filter = self.request.GET.get("duplicate", "")
         archived_filter = self.request.GET.get("archived", "")
         if archived_filter not in {"0", "1"}:
             archived_filter = "0"
@@ -284,12 +596,29 @@ class LeadListView(LoginRequiredMixin, ListView):
             ("work_mode", work_mode_filter),
             ("scam", scam_filter),
             ("has_app", has_app_filter),
+            ("duplicate", duplicate_filter),
+            ("sort", sort),
         ):
             if value:
                 filters[key] = value
         if archived_filter:
             filters["archived"] = archived_filter
 
+        next_page_query = ""
+        page = context.get("page_obj")
+        if page is not None and page.has_next:
+            page_params = dict(filters)
+            if "page_size" in self.request.GET:
+                page_params["page_size"] = self.get_paginate_by(None)
+            page_params["cursor"] = page.next_cursor
+            next_page_query = urlencode(page_params)
+
+        facets = self.get_facet_counts(archived=archived_filter == "1")
+        flag_counts = {
+            name: {"1": facets[field].get(True, 0), "0": facets[field].get(False, 0)}
+            for name, field in (("scam", "is_scam_suspected"), ("has_app", "has_app"), ("archived", "is_archived"))
+        }
+
         context.update(
             {
                 "search_query": search_query,
@@ -297,45 +626,144 @@ class LeadListView(LoginRequiredMixin, ListView):
                 "work_mode_filter": work_mode_filter,
                 "scam_filter": scam_filter,
                 "has_app_filter": has_app_filter,
+                "duplicate_filter": duplicate_filter,
                 "archived_filter": archived_filter,
+                "sort": sort,
                 "filters_query": urlencode(filters),
-                "source_choices": JobLead.Source.choices,
-                "work_mode_choices": JobLead.WorkMode.choices,
+                "next_page_query": next_page_query,
+                "source_choices": [
+                    (code, label, facets["source"].get(code, 0)) for code, label in JobLead.Source.choices
+                ],
+                "work_mode_choices": [
+                    (code, label, facets["work_mode"].get(code, 0)) for code, label in JobLead.WorkMode.choices
+                ],
+                "flag_counts": flag_counts,
             }
         )
         return context
 
 
-class ApplicationExportView(LoginRequiredMixin, View):
-    def get(self, request):
-        applications = Application.objects.select_related("job")
-        if not request.user.is_superuser:
-            applications = applications.filter(owner=request.user)
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = "attachment; filename=applications.csv"
-        writer = csv.writer(response)
-        writer.writerow(
-            [
-                "Company",
-                "Title",
-                "Status",
-                "Follow up on",
-                "Next action",
-                "Updated at",
-            ]
+class ApplicationExportView(ApplicationListView):
+    """Stream the list view's filtered applications as CSV or NDJSON, optionally gzipped."""
+
+    # A download is not revalidated; skip the 304 check and its state query.
+    conditional_get = False
+
+    def get(self, request, *args, **kwargs):
+        export_format = request.GET.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"ok": False, "error": "Select a valid export format."}, status=400)
+        try:
+            columns = parse_export_columns(request.GET.getlist("columns"))
+        except ValueError as exc:
+            return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+
+        chunks = EXPORT_STREAMS[export_format](self.get_queryset(), columns)
+        content_type = EXPORT_CONTENT_TYPES[export_format]
+        filename = f"applications.{export_format}"
+        if request.GET.get("gzip") in ("1", "true"):
+            chunks = gzip_stream(chunks)
+            content_type = "application/gzip"
+            filename += ".gz"
+
+        response = StreamingHttpResponse(chunks, content_type=content_type)
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
+
+
+def serialize_export_job(job):
+    data = {
+        "ok": True,
+        "id": job.pk,
+        "status": job.status,
+        "rows_total": job.rows_total,
+        "rows_written": job.rows_written,
+        "size_bytes": job.size_bytes,
+        "error": job.error,
+        "status_url": reverse("tracker:export_job", args=[job.pk]),
+        "download_url": "",
+    }
+    if job.status == ExportJob.Status.DONE:
+        data["download_url"] = reverse("tracker:export_job_download", args=[job.pk])
+    return data
+
+
+class ExportJobCreateView(LoginRequiredMixin, View):
+    """Queue a background export of the filtered list; takes the same parameters as the direct export."""
+
+    filter_params = ("search", "q", "status", "due", "sort")
+
+    def post(self, request):
+        params = request.POST or request.GET
+        export_format = params.get("format", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return JsonResponse({"ok": False, "error": "Select a valid export format."}, status=400)
+        try:
+            columns = parse_export_columns(params.getlist("columns"))
+        except ValueError as exc:
+            return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+
+        filters = {key: params[key] for key in self.filter_params if params.get(key)}
+        job = ExportJob.objects.create(
+            owner=request.user,
+            query=urlencode(filters),
+            export_format=export_format,
+            columns=columns,
+            compress=params.get("gzip") in ("1", "true"),
         )
-        for application in applications.order_by("-updated_at"):
-            writer.writerow(
-                [
-                    application.job.company,
-                    application.job.title,
-                    application.get_status_display(),
-                    application.follow_up_on.isoformat() if application.follow_up_on else "",
-                    application.next_action,
-                    application.updated_at.isoformat(),
-                ]
-            )
+        return JsonResponse(serialize_export_job(job), status=202)
+
+
+class ExportJobActionBaseView(LoginRequiredMixin, View):
+    def get_object(self, pk):
+        return get_object_or_404(ExportJob, pk=pk, owner=self.request.user)
+
+
+class ExportJobStatusView(ExportJobActionBaseView):
+    def get(self, request, pk):
+        return JsonResponse(serialize_export_job(self.get_object(pk)))
+
+
+class ExportJobDownloadView(ExportJobActionBaseView):
+    """Serve a finished export, honouring single ``Range`` requests and ``If-Range``."""
+
+    def get(self, request, pk):
+        job = self.get_object(pk)
+        if job.status != ExportJob.Status.DONE:
+            return JsonResponse({"ok": False, "error": "This export is not ready."}, status=409)
+        if not Path(job.file_path).is_file():
+            # Removed from TRACKER_EXPORT_ROOT since it was written; record
+            # that so the status stops offering a download.
+            job.status = ExportJob.Status.FAILED
+            job.error = EXPORT_EXPIRED_ERROR
+            job.save(update_fields=["status", "error", "updated_at"])
+            return JsonResponse({"ok": False, "error": job.error}, status=410)
+
+        size = job.size_bytes
+        etag = f'"export-{job.pk}-{size}"'
+        last_modified = http_date(job.finished_at.timestamp())
+        byte_range = None
+        if_range = request.headers.get("if-range")
+        if not if_range or if_range in (etag, last_modified):
+            try:
+                byte_range = parse_byte_range(request.headers.get("range"), size)
+            except ValueError:
+                response = HttpResponse(status=416)
+                response["Content-Range"] = f"bytes */{size}"
+                return response
+
+        if byte_range is None:
+            response = FileResponse(open(job.file_path, "rb"), as_attachment=True, filename=job.filename)
+        else:
+            start, end = byte_range
+            response = StreamingHttpResponse(file_range(job.file_path, start, end - start + 1), status=206)
+            response["Content-Range"] = f"bytes {start}-{end}/{size}"
+            response["Content-Length"] = str(end - start + 1)
+            response["Content-Disposition"] = f"attachment; filename={job.filename}"
+        response["Content-Type"] = "application/gzip" if job.compress else EXPORT_CONTENT_TYPES[job.export_format]
+        response["Accept-Ranges"] = "bytes"
+        response["ETag"] = etag
+        response["Last-Modified"] = last_modified
         return response
 
 
@@ -363,7 +791,8 @@ class ApplicationUpdateView(LoginRequiredMixin, UpdateView):
         ):
             form.add_error("status", "Status is locked in a terminal state.")
             return self.form_invalid(form)
-        response = super().form_valid(form)
+        with pipeline_write(self.object.owner_id):
+            response = super().form_valid(form)
         messages.success(self.request, "Application updated.")
         return response
 
@@ -381,7 +810,8 @@ class ApplicationCreateView(LoginRequiredMixin, FormView):
         return kwargs
 
     def form_valid(self, form):
-        application = form.save()
+        with pipeline_write(self.request.user.pk):
+            application = form.save()
         messages.success(
             self.request, f"Application for {application.job.company} saved."
         )
@@ -403,10 +833,12 @@ class ApplicationDeleteView(LoginRequiredMixin, DeleteView):
     def post(self, request, *args, **kwargs):
         self.object = self.get_object()
         job_id = self.object.job_id
-        self.object.delete()
+        with pipeline_write(self.object.owner_id):
+            self.object.delete()
 
-        if job_id and not Application.objects.filter(job_id=job_id).exists():
-            JobLead.objects.filter(pk=job_id).delete()
+            if job_id and not Application.objects.filter(job_id=job_id).exists():
+                forget_leads([self.object.job])
+                JobLead.objects.filter(pk=job_id).delete()
 
         messages.success(request, "Application deleted.")
         return HttpResponseRedirect(self.get_success_url())
@@ -441,19 +873,31 @@ class ApplicationQuickAddView(LoginRequiredMixin, View):
                 status=400,
             )
 
-        job = JobLead.objects.create(
-            company=company,
-            title=title,
-            location=location,
-            owner=request.user,
-        )
-        application = Application.objects.create(
-            job=job,
-            status=Application.Status.WISHLIST,
-            location_text=location,
-            owner=request.user,
-        )
-        return JsonResponse({"ok": True, "id": application.pk})
+        with pipeline_write(request.user.pk):
+            # The counters row lock serialises this owner's writes, so the
+            # duplicate check cannot race another quick add.
+            job = JobLead.find_duplicate(request.user, lead_fingerprint("", company, title, location))
+            if job is not None and job.owner_application_id:
+                return JsonResponse(
+                    {
+                        "ok": False,
+                        "error": "This job is already in your applications.",
+                        "id": job.owner_application_id,
+                    },
+                    status=409,
+                )
+            merged = job is not None
+            if not merged:
+                job = JobLead(company=company, title=title, location=location, owner=request.user)
+                score_leads([job])
+                job.save()
+            application = Application.objects.create(
+                job=job,
+                status=Application.Status.WISHLIST,
+                location_text=location,
+                owner=request.user,
+            )
+        return JsonResponse({"ok": True, "id": application.pk, "merged": merged})
 
 
 class ApplicationQuickView(LoginRequiredMixin, DetailView):
@@ -495,6 +939,7 @@ class ApplicationEditView(LoginRequiredMixin, DetailView):
         context["status_choices"] = Application.Status.choices
         context["followups"] = self.object.followups.order_by("due_on", "created_at")
         context["today"] = timezone.localdate()
+        context["similar_leads"] = similar_leads(self.object.job) if self.object.job_id else []
         return context
 
     def render_to_response(self, context, **response_kwargs):
@@ -614,45 +1059,149 @@ class ApplicationPatchView(ApplicationActionBaseView):
         if not updates and not job_updates:
             return self._response_error("No updates supplied.")
 
-        if job_updates:
-            for field, value in job_updates.items():
-                setattr(application.job, field, value)
-            application.job.save(update_fields=list(job_updates.keys()))
+        moves_badges = bool(PIPELINE_FIELDS.intersection(updates))
+        with pipeline_write(application.owner_id, refresh=moves_badges):
+            if job_updates:
+                job = application.job
+                indexed_text = (job.title, job.jd_text)
+                for field, value in job_updates.items():
+                    setattr(job, field, value)
+                job.save(update_fields=list(job_updates.keys()))
+                if job.title != indexed_text[0]:
+                    index_terms([job], previous={job.pk: indexed_text})
+
+            if updates:
+                for field, value in updates.items():
+                    setattr(application, field, value)
+                application.save()
+            elif job_updates:
+                application.save(update_fields=["updated_at"])
 
-        if updates:
-            for field, value in updates.items():
-                setattr(application, field, value)
-            application.save()
-        elif job_updates:
-            application.save(update_fields=["updated_at"])
-
-        follow_up_display = application.follow_up_on.strftime("%b %d, %Y") if application.follow_up_on else "—"
-        job_url = application.job_url or application.job.job_url or ""
-        location_text = application.location_text or application.job.location or ""
-        payload = {
-            "id": application.pk,
-            "status": application.status,
-            "status_label": application.get_status_display(),
-            "next_action": application.next_action or "",
-            "follow_up_on": application.follow_up_on.isoformat() if application.follow_up_on else "",
-            "follow_up_display": follow_up_display,
-            "notes": application.notes or "",
-            "company": application.job.company,
-            "title": application.job.title,
-            "job_url": job_url,
-            "location_text": location_text,
-            "source": application.source or "",
-            "compensation_text": application.compensation_text or "",
-        }
         return JsonResponse(
             {
                 "ok": True,
-                "application": payload,
+                "application": serialize_application(application),
                 "saved_at": timezone.now().isoformat(),
             }
         )
 
 
+class LeadIngestView(LoginRequiredMixin, View):
+    """Bulk-create leads from an NDJSON or JSON-array request body."""
+
+    http_method_names = ["post"]
+    max_batch_size = 2000
+
+    def post(self, request):
+        source = request.GET.get("source") or JobLead.Source.MANUAL
+        if source not in JobLead.Source.values:
+            return JsonResponse({"ok": False, "error": "Select a valid source."}, status=400)
+        try:
+            batch_size = int(request.GET.get("batch_size", DEFAULT_INGEST_BATCH_SIZE))
+        except ValueError:
+            return JsonResponse({"ok": False, "error": "batch_size must be a number."}, status=400)
+        batch_size = max(1, min(batch_size, self.max_batch_size))
+
+        # The request itself is the stream; the body is never read whole.
+        result = ingest_leads(
+            iter_lead_records(request),
+            request.user,
+            default_source=source,
+            batch_size=batch_size,
+        )
+        return JsonResponse({"ok": result.failed == 0, **result.as_dict()})
+
+
+class AccountExportView(LoginRequiredMixin, View):
+    """Stream the current user's account archive (see ``backups``)."""
+
+    def get(self, request):
+        response = StreamingHttpResponse(stream_archive(request.user), content_type="application/gzip")
+        filename = f"{request.user.get_username()}-{timezone.localdate().isoformat()}.ndjson.gz"
+        response["Content-Disposition"] = f"attachment; filename={filename}"
+        return response
+
+
+class AccountImportView(LoginRequiredMixin, View):
+    """Restore an account archive sent as the request body into the current user's account.
+
+    Archives over ``TRACKER_RESTORE_INLINE_MAX_BYTES`` (or of unknown size,
+    or with ``background=1``) are queued for ``run_restore_jobs`` and answered
+    with 202 and the job's status. Anything over ``TRACKER_RESTORE_MAX_BYTES``
+    is refused with 413.
+    """
+
+    http_method_names = ["post"]
+
+    def post(self, request):
+        replace = request.GET.get("replace") in ("1", "true")
+        try:
+            size = int(request.headers.get("content-length") or -1)
+        except ValueError:
+            size = -1
+        inline_max = getattr(settings, "TRACKER_RESTORE_INLINE_MAX_BYTES", 256 * 1024)
+        try:
+            if size > restore_max_bytes():
+                raise ArchiveTooLarge(f"The archive is larger than {restore_max_bytes()} bytes.")
+            if request.GET.get("background") in ("1", "true") or not 0 <= size <= inline_max:
+                job = queue_restore(request, request.user, replace=replace)
+                return JsonResponse(serialize_restore_job(job), status=202)
+            # The request itself is the stream; the body is never read whole.
+            counts = restore_archive(request, request.user, replace=replace)
+        except ArchiveTooLarge as exc:
+            return JsonResponse({"ok": False, "error": str(exc)}, status=413)
+        except ArchiveError as exc:
+            return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return JsonResponse({"ok": True, "restored": counts})
+
+
+def serialize_restore_job(job):
+    return {
+        "ok": True,
+        "id": job.pk,
+        "status": job.status,
+        "size_bytes": job.size_bytes,
+        "restored": job.restored,
+        "error": job.error,
+        "status_url": reverse("tracker:restore_job", args=[job.pk]),
+    }
+
+
+class RestoreJobStatusView(LoginRequiredMixin, View):
+    def get(self, request, pk):
+        return JsonResponse(serialize_restore_job(get_object_or_404(RestoreJob, pk=pk, owner=request.user)))
+
+
+class CSVImportView(LoginRequiredMixin, View):
+    """Import applications or leads from an uploaded CSV file or a raw CSV request body."""
+
+    http_method_names = ["post"]
+    max_batch_size = 2000
+
+    def post(self, request):
+        try:
+            batch_size = int(request.GET.get("batch_size", DEFAULT_IMPORT_BATCH_SIZE))
+        except ValueError:
+            return JsonResponse({"ok": False, "error": "batch_size must be a number."}, status=400)
+        batch_size = max(1, min(batch_size, self.max_batch_size))
+
+        # A multipart upload is spooled to disk by Django; a raw body is the
+        # request stream itself. Either way it is never read whole.
+        stream = request.FILES.get("file") or request
+        try:
+            result = import_csv(
+                stream,
+                request.user,
+                kind=request.GET.get("kind", "applications"),
+                mapping=parse_import_mapping(request.GET.getlist("map")),
+                dry_run=request.GET.get("dry_run") in ("1", "true"),
+                batch_size=batch_size,
+            )
+        except CSVImportError as exc:
+            return JsonResponse({"ok": False, "error": str(exc)}, status=400)
+        return JsonResponse({"ok": result.failed == 0, **result.as_dict()})
+
+
 class LeadActionBaseView(LoginRequiredMixin, View):
     def get_queryset(self):
         return JobLead.objects.filter(owner=self.request.user)
@@ -677,6 +1226,7 @@ class LeadQuickView(LoginRequiredMixin, DetailView):
         ).first()
         context["source_choices"] = JobLead.Source.choices
         context["work_mode_choices"] = JobLead.WorkMode.choices
+        context["similar_leads"] = similar_leads(self.object)
         return context
 
     def render_to_response(self, context, **response_kwargs):
@@ -799,6 +1349,10 @@ class LeadPatchView(LeadActionBaseView):
         if "scam_reasons" in payload:
             updates["scam_reasons"] = payload.get("scam_reasons") or ""
 
+        if "is_scam_suspected" in updates or "scam_reasons" in updates:
+            # A hand-set flag is final; the scoring engine leaves it alone.
+            updates["scam_reviewed"] = True
+
         if "is_archived" in payload:
             is_archived = self._parse_bool(payload.get("is_archived"))
             updates["is_archived"] = is_archived
@@ -810,9 +1364,22 @@ class LeadPatchView(LeadActionBaseView):
         if not updates:
             return self._response_error("No updates supplied.")
 
+        jd_changed = "jd_text" in updates and updates["jd_text"] != lead.jd_text
+        indexed_text = (lead.title, lead.jd_text)
+        signals_changed = any(
+            field in updates and updates[field] != getattr(lead, field) for field in SCAM_SIGNAL_FIELDS
+        )
         for field, value in updates.items():
             setattr(lead, field, value)
-        lead.save()
+        if signals_changed:
+            # Skips leads whose flag was set by hand, including in this edit.
+            score_leads([lead])
+        with transaction.atomic():
+            lead.save()
+            if jd_changed:
+                index_leads([lead])
+            if (lead.title, lead.jd_text) != indexed_text:
+                index_terms([lead], previous={lead.pk: indexed_text})
 
         payload = {
             "id": lead.pk,
@@ -840,39 +1407,158 @@ class LeadPatchView(LeadActionBaseView):
         )
 
 
-class LeadConvertView(LeadActionBaseView):
-    def _wants_json(self, request):
-        if request.headers.get("x-requested-with") == "XMLHttpRequest":
-            return True
-        if request.content_type and "application/json" in request.content_type:
-            return True
-        return "application/json" in request.headers.get("accept", "")
+def wants_json(request):
+    """Whether a lead action was sent by script and should answer with JSON."""
 
+    if request.headers.get("x-requested-with") == "XMLHttpRequest":
+        return True
+    if request.content_type and "application/json" in request.content_type:
+        return True
+    return "application/json" in request.headers.get("accept", "")
+
+
+class LeadConvertView(LeadActionBaseView):
     def post(self, request, pk):
         lead = self.get_object(pk)
-        with transaction.atomic():
+        with pipeline_write(request.user.pk):
             application = Application.objects.filter(job=lead, owner=request.user).first()
             if application is None:
                 try:
-                    application = Application.objects.create(
-                        job=lead,
-                        owner=request.user,
-                        status=Application.Status.WISHLIST,
-                        job_url=lead.job_url or "",
-                        location_text=lead.location or "",
-                        source=lead.source or "",
-                    )
+                    # Savepoint, so losing a race leaves the outer transaction usable.
+                    with transaction.atomic():
+                        application = Application.objects.create(
+                            job=lead,
+                            owner=request.user,
+                            status=Application.Status.WISHLIST,
+                            job_url=lead.job_url or "",
+                            location_text=lead.location or "",
+                            source=lead.source or "",
+                        )
                 except IntegrityError:
                     application = Application.objects.get(job=lead, owner=request.user)
 
         redirect_url = f"{reverse_lazy('tracker:application_list')}?selected={application.pk}"
-        if self._wants_json(request):
+        if wants_json(request):
             return JsonResponse({"application_id": application.pk, "redirect_url": redirect_url})
 
         messages.success(request, "Lead converted to an application.")
         return HttpResponseRedirect(redirect_url)
 
 
+class LeadBulkActionView(LoginRequiredMixin, View):
+    """Apply one triage action to many of the user's leads in one transaction.
+
+    Archive and scam actions are a single set-based ``UPDATE`` limited to
+    leads not already in the target state; convert bulk-inserts the missing
+    applications. Ids the user does not own are ignored.
+    """
+
+    http_method_names = ["post"]
+    max_leads = 1000
+    success_messages = {
+        "archive": "Archived {count} leads.",
+        "unarchive": "Restored {count} leads.",
+        "flag_scam": "Flagged {count} leads as scams.",
+        "clear_scam": "Cleared the scam flag on {count} leads.",
+        "convert": "Converted {count} leads to applications.",
+    }
+
+    def _get_payload(self, request):
+        if request.content_type and "application/json" in request.content_type:
+            try:
+                payload = json.loads(request.body.decode("utf-8") or "{}")
+            except json.JSONDecodeError:
+                return None
+            return payload if isinstance(payload, dict) else None
+        return {"action": request.POST.get("action"), "ids": request.POST.getlist("ids")}
+
+    def _parse_ids(self, raw_ids):
+        if not isinstance(raw_ids, list):
+            return None
+        try:
+            return {int(lead_id) for lead_id in raw_ids}
+        except (TypeError, ValueError):
+            return None
+
+    def _respond(self, request, status, error=None, result=None):
+        if wants_json(request):
+            if error:
+                return JsonResponse({"ok": False, "error": error}, status=status)
+            return JsonResponse({"ok": True, **result})
+        if error:
+            messages.error(request, error)
+        else:
+            messages.success(request, self.success_messages[result["action"]].format(count=result["updated"]))
+        redirect_url = request.POST.get("next", "")
+        if not url_has_allowed_host_and_scheme(redirect_url, allowed_hosts={request.get_host()}):
+            redirect_url = reverse("tracker:lead_list")
+        return HttpResponseRedirect(redirect_url)
+
+    def _update(self, leads, action, now):
+        if action == "archive":
+            return leads.filter(is_archived=False).update(is_archived=True, archived_at=now, updated_at=now)
+        if action == "unarchive":
+            return leads.filter(is_archived=True).update(is_archived=False, archived_at=None, updated_at=now)
+        # A hand-set flag is final; the scoring engine leaves it alone.
+        if action == "flag_scam":
+            return leads.exclude(is_scam_suspected=True, scam_reviewed=True).update(
+                is_scam_suspected=True, scam_reviewed=True, updated_at=now
+            )
+        return leads.exclude(is_scam_suspected=False, scam_reviewed=True, scam_reasons="").update(
+            is_scam_suspected=False, scam_reasons="", scam_reviewed=True, updated_at=now
+        )
+
+    def _convert(self, leads, user):
+        has_app = Application.objects.filter(job_id=OuterRef("pk"), owner=user)
+        rows = leads.exclude(Exists(has_app)).values_list("pk", "job_url", "location", "source")
+        applications = [
+            Application(
+                job_id=lead_id,
+                owner=user,
+                status=Application.Status.WISHLIST,
+                job_url=job_url or "",
+                location_text=location or "",
+                source=source or "",
+            )
+            for lead_id, job_url, location, source in rows
+        ]
+        if not applications:
+            return 0
+        # The counters lock serialises converts per owner, so the check above
+        # normally holds; ignore_conflicts only guards writers that skip the
+        # lock. Rows it drops are not reported, hence the counts either side.
+        converted = Application.objects.filter(owner=user, job_id__in=[app.job_id for app in applications])
+        before = converted.count()
+        Application.objects.bulk_create(applications, ignore_conflicts=True)
+        return converted.count() - before
+
+    def post(self, request):
+        payload = self._get_payload(request)
+        if payload is None:
+            return self._respond(request, 400, error="Invalid JSON payload.")
+        action = payload.get("action")
+        if action not in self.success_messages:
+            return self._respond(request, 400, error="Select a valid action.")
+        lead_ids = self._parse_ids(payload.get("ids"))
+        if lead_ids is None:
+            return self._respond(request, 400, error="ids must be a list of lead ids.")
+        if not lead_ids:
+            return self._respond(request, 400, error="Select at least one lead.")
+        if len(lead_ids) > self.max_leads:
+            return self._respond(request, 400, error=f"Select at most {self.max_leads} leads at a time.")
+
+        leads = JobLead.objects.filter(owner=request.user, pk__in=lead_ids)
+        with pipeline_write(request.user.pk, refresh=action == "convert"):
+            if action == "convert":
+                updated = self._convert(leads, request.user)
+            else:
+                updated = self._update(leads, action, timezone.now())
+            if updated:
+                bulk_written(request.user.pk)
+
+        return self._respond(request, 200, result={"action": action, "updated": updated})
+
+
 class ApplicationFollowUpCreateView(ApplicationActionBaseView):
     def post(self, request, pk):
         application = self.get_object(pk)
@@ -889,7 +1575,8 @@ class ApplicationFollowUpCreateView(ApplicationActionBaseView):
             return JsonResponse({"ok": False, "error": "Enter a valid due date."}, status=400)
 
         note = payload.get("note") or ""
-        followup = FollowUp.objects.create(application=application, due_on=due_on, note=note)
+        with pipeline_write(application.owner_id):
+            followup = FollowUp.objects.create(application=application, due_on=due_on, note=note)
         return JsonResponse(
             {
                 "ok": True,
@@ -943,9 +1630,11 @@ class FollowUpUpdateView(LoginRequiredMixin, View):
         if not updates:
             return JsonResponse({"ok": False, "error": "No updates supplied."}, status=400)
 
-        for field, value in updates.items():
-            setattr(followup, field, value)
-        followup.save()
+        moves_badges = bool({"due_on", "is_completed"}.intersection(updates))
+        with pipeline_write(followup.application.owner_id, refresh=moves_badges):
+            for field, value in updates.items():
+                setattr(followup, field, value)
+            followup.save()
 
         return JsonResponse(
             {
@@ -970,15 +1659,7 @@ class BoardView(LoginRequiredMixin, TemplateView):
         if not self.request.user.is_superuser:
             applications = applications.filter(owner=self.request.user)
 
-        status_columns = []
-        for code, label in Application.Status.choices:
-            status_columns.append(
-                {
-                    "code": code,
-                    "label": label,
-                    "applications": applications.filter(status=code).order_by("-updated_at"),
-                }
-            )
+        status_columns = build_status_columns(applications)
         context["status_columns"] = status_columns
         context["status_choices"] = Application.Status.choices
         return context
@@ -987,31 +1668,8 @@ class BoardView(LoginRequiredMixin, TemplateView):
 class FollowUpsListView(LoginRequiredMixin, TemplateView):
     template_name = "tracker/followups_list.html"
 
-    def _build_items(self, apps, followups):
-        items = []
-        for application in apps:
-            items.append(
-                {
-                    "type": "application",
-                    "due_on": application.follow_up_on,
-                    "application": application,
-                }
-            )
-        for followup in followups:
-            items.append(
-                {
-                    "type": "followup",
-                    "due_on": followup.due_on,
-                    "application": followup.application,
-                    "followup": followup,
-                }
-            )
-        return sorted(items, key=lambda item: (item["due_on"] or timezone.localdate()))
-
     def get_context_data(self, **kwargs):
         context = super().get_context_data(**kwargs)
-        today = timezone.localdate()
-        week_end = today + timedelta(days=7)
         terminal_statuses = [Application.Status.ACCEPTED, Application.Status.REJECTED]
 
         applications = Application.objects.select_related("job")
@@ -1021,27 +1679,15 @@ class FollowUpsListView(LoginRequiredMixin, TemplateView):
             followups = followups.filter(application__owner=self.request.user)
 
         applications = applications.exclude(status__in=terminal_statuses)
-
-        today_items = self._build_items(
-            applications.filter(follow_up_on=today),
-            followups.filter(due_on=today),
-        )
-        overdue_items = self._build_items(
-            applications.filter(follow_up_on__lt=today),
-            followups.filter(due_on__lt=today),
-        )
-        week_items = self._build_items(
-            applications.filter(follow_up_on__gt=today, follow_up_on__lte=week_end),
-            followups.filter(due_on__gt=today, due_on__lte=week_end),
-        )
+        today, week_end, items = build_followup_inbox(applications, followups)
 
         context.update(
             {
                 "today": today,
                 "week_end": week_end,
-                "today_items": today_items,
-                "overdue_items": overdue_items,
-                "week_items": week_items,
+                "today_items": items["today"],
+                "overdue_items": items["overdue"],
+                "week_items": items["week"],
             }
         )
         return context